@@ -0,0 +1,170 @@
+"""
+Index advisor: đọc MongoDB profiler (system.profile) sau khi chạy một workload
+và báo các dạng truy vấn chưa có index phù hợp cùng chi phí của chúng.
+
+    python -m app.db.advisor start     # bật profiler (ghi lại mọi truy vấn)
+    ...                                # chạy workload: dùng app, chạy script tải, ...
+    python -m app.db.advisor report    # phân tích các truy vấn đã ghi
+    python -m app.db.advisor stop      # tắt profiler
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.db.database import create_sync_database
+
+# Toán tử so sánh khoảng: trường dùng các toán tử này đứng sau trường sort trong index (quy tắc ESR)
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$in", "$regex", "$exists"}
+
+
+def start_profiling(db, slowms=0):
+    """
+    Bật profiler cho mọi truy vấn (level 2) và xóa dữ liệu profile cũ
+    """
+    db.command("profile", 0)
+    db.drop_collection("system.profile")
+    db.command("profile", 2, slowms=slowms)
+
+
+def stop_profiling(db):
+    db.command("profile", 0)
+
+
+def shape_of(value):
+    """
+    Bỏ giá trị cụ thể khỏi bộ lọc, chỉ giữ tên trường và toán tử
+    """
+    if isinstance(value, dict):
+        return {key: shape_of(item) for key, item in sorted(value.items())}
+    if isinstance(value, list):
+        return [shape_of(item) for item in value[:1]]
+    return 1
+
+
+def _filter_and_sort(entry):
+    """
+    Lấy (bộ lọc, sắp xếp) từ một bản ghi profiler của find / aggregate / count / update
+    """
+    command = entry.get("command", {})
+    if "pipeline" in command:
+        query, sort = {}, {}
+        for stage in command["pipeline"]:
+            if "$match" in stage and not query and not sort:
+                query = stage["$match"]
+            elif "$sort" in stage and not sort:
+                sort = stage["$sort"]
+            elif not ({"$match", "$sort"} & stage.keys()):
+                break
+        return query, sort
+    if "q" in command:
+        return command.get("q", {}), {}
+    return command.get("filter", command.get("query", {})) or {}, command.get("sort", {}) or {}
+
+
+def suggest_index(query, sort):
+    """
+    Gợi ý index theo quy tắc Equality - Sort - Range
+    """
+    equality, ranges = [], []
+    for field, condition in query.items():
+        if field.startswith("$"):
+            # $or/$and/$expr: không suy ra được index đơn giản
+            continue
+        if isinstance(condition, dict) and RANGE_OPERATORS & condition.keys():
+            ranges.append(field)
+        else:
+            equality.append(field)
+    keys = [(field, 1) for field in equality]
+    keys += [(field, direction) for field, direction in sort.items() if field not in equality]
+    keys += [(field, 1) for field in ranges if field not in sort]
+    return keys
+
+
+def analyze(db, min_examined_ratio=10):
+    """
+    Gom các bản ghi profiler theo (collection, dạng truy vấn)
+
+    Args:
+        min_examined_ratio (float): Truy vấn dùng index nhưng đọc nhiều hơn số tài liệu
+            trả về quá tỷ lệ này cũng được báo (index chưa khớp truy vấn)
+
+    Returns:
+        list: Các dạng truy vấn cần index, sắp xếp theo tổng thời gian giảm dần
+    """
+    shapes = {}
+    for entry in db["system.profile"].find({"op": {"$in": ["query", "command", "update", "remove"]}}):
+        namespace = entry.get("ns", "")
+        if namespace.endswith(".system.profile") or "planSummary" not in entry:
+            continue
+        query, sort = _filter_and_sort(entry)
+        key = (namespace, repr(shape_of(query)), repr(shape_of(sort)))
+        shape = shapes.setdefault(key, {
+            "namespace": namespace,
+            "query": shape_of(query),
+            "sort": shape_of(sort),
+            "plans": set(),
+            "in_memory_sort": False,
+            "count": 0,
+            "millis": 0,
+            "docs_examined": 0,
+            "keys_examined": 0,
+            "returned": 0,
+            "suggested_index": suggest_index(query, sort),
+        })
+        shape["plans"].add(entry["planSummary"])
+        shape["in_memory_sort"] = shape["in_memory_sort"] or bool(entry.get("hasSortStage"))
+        shape["count"] += 1
+        shape["millis"] += entry.get("millis", 0)
+        shape["docs_examined"] += entry.get("docsExamined", 0)
+        shape["keys_examined"] += entry.get("keysExamined", 0)
+        shape["returned"] += entry.get("nreturned", 0)
+
+    report = []
+    for shape in shapes.values():
+        collscan = any("COLLSCAN" in plan for plan in shape["plans"])
+        ratio = shape["docs_examined"] / max(shape["returned"], 1)
+        if collscan or shape["in_memory_sort"] or ratio > min_examined_ratio:
+            shape["plans"] = sorted(shape["plans"])
+            shape["examined_ratio"] = round(ratio, 1)
+            report.append(shape)
+    return sorted(report, key=lambda shape: shape["millis"], reverse=True)
+
+
+def print_report(report):
+    if not report:
+        print("✅ Không có truy vấn nào cần thêm index")
+        return
+    for shape in report:
+        collection_name = shape["namespace"].split(".", 1)[-1]
+        print(f"❌ {shape['namespace']}  filter={shape['query']}  sort={shape['sort']}")
+        print(f"   plan: {', '.join(shape['plans'])}{' + SORT trong bộ nhớ' if shape['in_memory_sort'] else ''}")
+        print(
+            f"   {shape['count']} lần, tổng {shape['millis']} ms, "
+            f"đọc {shape['docs_examined']} tài liệu / trả về {shape['returned']} "
+            f"(x{shape['examined_ratio']})"
+        )
+        if shape["suggested_index"]:
+            keys = ", ".join(f"({field!r}, {direction})" for field, direction in shape["suggested_index"])
+            print(f"   gợi ý: register_indexes({collection_name!r}, index({keys}))")
+
+
+if __name__ == "__main__":
+    sync_db = create_sync_database()
+    parser = argparse.ArgumentParser(description="Index advisor dựa trên MongoDB profiler")
+    parser.add_argument("action", choices=["start", "stop", "report"])
+    parser.add_argument("--slowms", type=int, default=0, help="Chỉ ghi truy vấn chậm hơn số ms này")
+    parser.add_argument("--min-ratio", type=float, default=10, help="Tỷ lệ tài liệu đọc / trả về tối đa chấp nhận được")
+    args = parser.parse_args()
+
+    if args.action == "start":
+        start_profiling(sync_db, args.slowms)
+        print("Profiler đã bật, hãy chạy workload rồi dùng lệnh report")
+    elif args.action == "stop":
+        stop_profiling(sync_db)
+        print("Profiler đã tắt")
+    else:
+        print_report(analyze(sync_db, args.min_ratio))
@@ -1,70 +1,228 @@
-import os
+import asyncio
+import time
+from contextlib import asynccontextmanager
 import motor.motor_asyncio
 from pymongo import MongoClient
 from pymongo.errors import ServerSelectionTimeoutError
 from dotenv import load_dotenv
+from .indexes import INDEXES, index, index_key, register_indexes
+# Đăng ký migration để init_db kiểm tra dữ liệu chưa được chuẩn hóa
+from .migrations import candidates as candidate_migrations  # noqa: F401
+from .migrations import interviews as interview_migrations  # noqa: F401
+from .migrations import jobs as job_migrations  # noqa: F401
+from .migrations.runner import count_pending
+from .monitoring import CommandStats, PoolStats
+from .settings import MongoSettings
 import pathlib
 
 # Load environment variables from .env.development
 env_path = pathlib.Path(__file__).parents[2] / '.env.development'
 load_dotenv(dotenv_path=env_path)
 
-# Get MongoDB URI from environment variable
-MONGODB_URI = os.getenv("MONGODB_URI")
-DATABASE_NAME = os.getenv("DATABASE_NAME")
+# Cấu hình kết nối MongoDB (MONGODB_URI, DATABASE_NAME, MONGODB_MAX_POOL_SIZE, ...)
+settings = MongoSettings()
+MONGODB_URI = settings.uri
+DATABASE_NAME = settings.database_name
+
+# Thống kê lệnh và pool kết nối, được /metrics báo cáo
+command_stats = CommandStats()
+pool_stats = PoolStats()
 
 # Async client for FastAPI
-async_client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
+async_client = motor.motor_asyncio.AsyncIOMotorClient(
+    MONGODB_URI,
+    event_listeners=[command_stats, pool_stats],
+    **settings.client_options(),
+)
 async_db = async_client[DATABASE_NAME]
 
-# Sync client for initialization and management tasks
-sync_client = MongoClient(MONGODB_URI)
-sync_db = sync_client[DATABASE_NAME]
+
+def create_sync_database():
+    """
+    Tạo database đồng bộ cho các script quản trị (advisor, migrations, ...).
+    Ứng dụng chỉ dùng client async nên worker không giữ kết nối đồng bộ nào.
+    """
+    options = settings.client_options()
+    options["minPoolSize"] = 0
+    return MongoClient(MONGODB_URI, **options)[DATABASE_NAME]
+
 
 # Collections
 users_collection = async_db["users"]
 candidates_collection = async_db["candidates"]
 jobs_collection = async_db["jobs"]
 interviews_collection = async_db["interviews"]
+email_outbox_collection = async_db["email_outbox"]
+
+# Transactions chỉ dùng được trên replica set / sharded cluster, được xác định trong init_db
+supports_transactions = False
+
+# Trạng thái khởi tạo database, được /health báo cáo
+db_status = {
+    "ready": False,
+    "error": None,
+    "attempts": 0,
+    "init_seconds": None,
+}
+
+
+# Index dùng chung cho mọi route; index theo truy vấn được khai báo trong từng module route.
+# Mọi route tra cứu tài liệu theo trường "id" của ứng dụng nên "id" luôn có unique index
+register_indexes("users", index("id", unique=True), index("username", unique=True), index("email", unique=True))
+register_indexes("candidates", index("id", unique=True), index("email", unique=True))
+register_indexes("jobs", index("id", unique=True))
+register_indexes("interviews", index("id", unique=True))
+register_indexes(
+    "email_outbox",
+    index("dedupe_key", unique=True),
+    index("status", "priority", "next_attempt_at"),
+    index("candidate_id", "status"),
+)
+
+
+async def check_indexes(db, indexes=INDEXES):
+    """
+    So sánh index thực tế trong database với các index đã đăng ký
+
+    Returns:
+        list: Các sai lệch tìm thấy (index thiếu, sai tùy chọn unique hoặc không được khai báo)
+    """
+    drift = []
+    for collection_name, specs in indexes.items():
+        index_information = await db[collection_name].index_information()
+        existing = {
+            tuple(info["key"]): info
+            for name, info in index_information.items()
+            if name != "_id_"
+        }
+        expected = set()
+        for keys, options in specs:
+            key = index_key(keys)
+            expected.add(key)
+            info = existing.get(key)
+            if info is None:
+                drift.append(f"{collection_name}: thiếu index {keys}")
+            elif bool(info.get("unique")) != bool(options.get("unique")):
+                drift.append(f"{collection_name}: index {keys} có unique={bool(info.get('unique'))}, cần unique={bool(options.get('unique'))}")
+        for key in existing.keys() - expected:
+            drift.append(f"{collection_name}: index {list(key)} không được khai báo trong registry")
+    return drift
+
+
+async def _create_index(collection_name, keys, options):
+    try:
+        await async_db[collection_name].create_index(keys, **options)
+    except Exception as e:
+        # Ví dụ: dữ liệu cũ bị trùng "id" nên không tạo được unique index
+        print(f"Error creating index {keys} on {collection_name}: {e}")
+
+
+async def warm_up_pool(connections=settings.warmup_connections):
+    """
+    Mở sẵn các kết nối trong pool bằng các lệnh ping chạy đồng thời
+    """
+    await asyncio.gather(*(async_client.admin.command("ping") for _ in range(connections)))
+
+
+async def ping_latency():
+    """
+    Đo thời gian round-trip tới MongoDB
+
+    Returns:
+        float: Độ trễ (ms), None nếu không kết nối được
+    """
+    started = time.perf_counter()
+    try:
+        await async_client.admin.command("ping")
+    except Exception:
+        return None
+    return round((time.perf_counter() - started) * 1000, 2)
 
 
 # Database initialization function
-def init_db():
+async def init_db():
+    """
+    Kết nối MongoDB, tạo index song song, kiểm tra sai lệch index và làm nóng pool kết nối
+
+    Returns:
+        bool: True nếu database đã sẵn sàng
+    """
+    global supports_transactions
+    started = time.perf_counter()
+    db_status["attempts"] += 1
     try:
         # Check connection
-        sync_client.admin.command('ping')
+        hello = await async_client.admin.command('hello')
+        supports_transactions = "setName" in hello or hello.get("msg") == "isdbgrid"
         print("Successfully connected to MongoDB")
 
-        # Create indexes for performance
-        # Users collection
-        sync_db.users.create_index("username", unique=True)
-        sync_db.users.create_index("email", unique=True)
-
-        # Candidates collection
-        sync_db.candidates.create_index("email", unique=True)
-        sync_db.candidates.create_index("name")
-        sync_db.candidates.create_index("status")
-        sync_db.candidates.create_index("department")
-
-        # Jobs collection
-        sync_db.jobs.create_index("title")
-        sync_db.jobs.create_index("status")
-        sync_db.jobs.create_index("department")
-
-        # Interviews collection
-        sync_db.interviews.create_index("candidate_id")
-        sync_db.interviews.create_index("job_id")
-        sync_db.interviews.create_index("interviewer_id")
-        sync_db.interviews.create_index("scheduled_date")
-        sync_db.interviews.create_index("status")
-
-        print("Database initialized successfully")
-    except ServerSelectionTimeoutError:
+        # Create indexes for performance (các lệnh create_index chạy đồng thời)
+        await asyncio.gather(*(
+            _create_index(collection_name, keys, options)
+            for collection_name, specs in INDEXES.items()
+            for keys, options in specs
+        ))
+
+        # Verify indexes and report drift
+        drift = await check_indexes(async_db)
+        for problem in drift:
+            print(f"⚠️ Index drift - {problem}")
+
+        # Dữ liệu cũ chưa được chuẩn hóa sẽ không hợp lệ với response model
+        for collection_name, count in (await count_pending(async_db)).items():
+            print(f"⚠️ {count} {collection_name} documents need migration - run python -m app.db.migrations")
+
+        await warm_up_pool()
+
+        db_status.update(ready=True, error=None, init_seconds=round(time.perf_counter() - started, 3))
+        print(f"Database initialized successfully in {db_status['init_seconds']}s")
+        return True
+    except ServerSelectionTimeoutError as e:
+        db_status.update(ready=False, error=str(e))
         print("Failed to connect to MongoDB server. Make sure it's running.")
     except Exception as e:
+        db_status.update(ready=False, error=str(e))
         print(f"Error initializing database: {e}")
+    return False
+
+
+async def init_db_until_ready(retry_interval=2, max_interval=30):
+    """
+    Thử init_db lại với backoff cho tới khi thành công (chạy nền khi MongoDB chưa sẵn sàng lúc khởi động)
+    """
+    while not await init_db():
+        await asyncio.sleep(retry_interval)
+        retry_interval = min(max_interval, retry_interval * 2)
+
+
+@asynccontextmanager
+async def transaction():
+    """
+    Mở một session kèm transaction nếu MongoDB hỗ trợ, ngược lại trả về None
+    để các lệnh ghi chạy tuần tự như bình thường
+    """
+    if not supports_transactions:
+        yield None
+        return
+    async with await async_client.start_session() as session:
+        async with session.start_transaction():
+            yield session
+
+
+def metrics():
+    """
+    Thống kê pool kết nối và độ trễ lệnh MongoDB của worker hiện tại
+    """
+    return {
+        "pool": {
+            **pool_stats.metrics(),
+            "max_pool_size": settings.max_pool_size,
+            "min_pool_size": settings.min_pool_size,
+        },
+        "commands": command_stats.metrics(),
+    }
 
 
 # Check if this is run directly (for initialization)
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    asyncio.run(init_db()) 
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Danh sách index của ứng dụng.
+
+Mỗi module route khai báo index cho đúng các truy vấn nó chạy (bộ lọc + sắp xếp)
+bằng ``register_indexes``; ``init_db`` tạo toàn bộ index đã khai báo và báo sai lệch.
+"""
+
+# collection -> danh sách (keys, options)
+INDEXES = {}
+
+
+def index(*keys, **options):
+    """
+    Khai báo một index
+
+    Args:
+        keys: Tên trường (tăng dần) hoặc cặp (trường, hướng), theo đúng thứ tự của index
+        options: Tùy chọn của ``create_index``, ví dụ ``unique=True``
+
+    Example:
+        index(("job_id", 1), ("status", 1))
+        index("id", unique=True)
+    """
+    normalized = [(key, 1) if isinstance(key, str) else tuple(key) for key in keys]
+    return normalized, options
+
+
+def _is_prefix(keys, other):
+    return len(keys) <= len(other) and other[:len(keys)] == keys
+
+
+def register_indexes(collection_name, *specs):
+    """
+    Đăng ký index cho một collection.
+
+    Index không unique là tiền tố của một index khác đã thừa (MongoDB dùng được tiền tố
+    của index ghép), nên chỉ index dài hơn được giữ lại.
+    """
+    registered = INDEXES.setdefault(collection_name, [])
+    for keys, options in specs:
+        for position, (existing_keys, existing_options) in enumerate(registered):
+            if existing_keys == keys:
+                # Hai module cùng cần một index: giữ tùy chọn chặt hơn (unique)
+                if options.get("unique") and not existing_options.get("unique"):
+                    registered[position] = (keys, options)
+                break
+            if not options and _is_prefix(keys, existing_keys):
+                break
+        else:
+            registered[:] = [
+                (existing_keys, existing_options)
+                for existing_keys, existing_options in registered
+                if existing_options or not _is_prefix(existing_keys, keys)
+            ]
+            registered.append((keys, options))
+
+
+def index_key(keys):
+    """
+    Khóa của index như ``index_information`` trả về: các trường của text index được
+    gộp thành ("_fts", "text"), ("_ftsx", 1)
+    """
+    key = []
+    for field, direction in keys:
+        if direction == "text":
+            if ("_fts", "text") not in key:
+                key += [("_fts", "text"), ("_ftsx", 1)]
+        else:
+            key.append((field, direction))
+    return tuple(key)
@@ -0,0 +1,83 @@
+"""
+Đọc theo lô (kiểu DataLoader) cho các route cần thông tin liên quan của nhiều tài liệu.
+
+``Loader.load(id)`` không đọc ngay: các id được yêu cầu trong cùng một vòng event loop
+được gom lại và đọc bằng một lệnh ``find({"id": {"$in": [...]}})``; kết quả (kể cả id
+không tồn tại) được nhớ tới hết request. Vì vậy vòng lặp ``await loader.load(...)`` sau
+``load_many`` hoặc nhiều coroutine chạy đồng thời chỉ tốn một lệnh cho mỗi collection.
+
+Mỗi request tạo ``Loaders`` riêng qua ``Depends(Loaders)`` nên dữ liệu không bị dùng lại
+giữa các request.
+"""
+
+import asyncio
+
+from .database import candidates_collection, jobs_collection, users_collection
+
+
+class Loader:
+    """
+    Gom các lần đọc theo ``key`` của một collection thành lệnh ``$in``
+    """
+
+    def __init__(self, collection, key="id", projection=None):
+        self.collection = collection
+        self.key = key
+        self.projection = {"_id": 0, **(projection or {})}
+        # id -> future của tài liệu (None nếu không tồn tại)
+        self.cache = {}
+        self.queue = []
+        self.queries = 0
+        # Event loop chỉ giữ tham chiếu yếu tới task: giữ tới khi đọc xong để task không bị thu hồi
+        self.tasks = set()
+
+    def load(self, value):
+        """
+        Returns:
+            Future: Tài liệu có ``key`` bằng ``value``, hoặc None
+        """
+        future = self.cache.get(value)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = self.cache[value] = loop.create_future()
+        if value is None:
+            future.set_result(None)
+            return future
+        self.queue.append(value)
+        if len(self.queue) == 1:
+            # Đọc sau khi các coroutine khác trong vòng này đã thêm id của chúng
+            loop.call_soon(self._schedule)
+        return future
+
+    def _schedule(self):
+        task = asyncio.get_running_loop().create_task(self._dispatch())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def load_many(self, values):
+        return asyncio.gather(*(self.load(value) for value in values))
+
+    async def _dispatch(self):
+        values, self.queue = self.queue, []
+        self.queries += 1
+        try:
+            cursor = self.collection.find({self.key: {"$in": values}}, self.projection)
+            documents = {document[self.key]: document async for document in cursor}
+        except Exception as error:
+            for value in values:
+                self.cache.pop(value).set_exception(error)
+            return
+        for value in values:
+            self.cache[value].set_result(documents.get(value))
+
+
+class Loaders:
+    """
+    Các loader của một request, dùng làm dependency: ``loaders: Loaders = Depends()``
+    """
+
+    def __init__(self):
+        self.candidates = Loader(candidates_collection)
+        self.jobs = Loader(jobs_collection)
+        self.users = Loader(users_collection, projection={"hashed_password": 0})
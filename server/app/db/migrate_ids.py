@@ -0,0 +1,197 @@
+"""
+Chuyển id dạng timestamp cũ (``str(datetime.now().timestamp())``) sang id sắp xếp được
+theo thời gian (app.models.ids.new_id) và cập nhật mọi khóa ngoại trỏ tới chúng.
+
+Id cũ được giữ trong trường ``legacy_id`` nên script chạy lại được (resumable):
+tài liệu đã chuyển được bỏ qua, bảng ánh xạ cũ -> mới được dựng lại từ ``legacy_id``.
+
+    python -m app.db.migrate_ids --dry-run
+    python -m app.db.migrate_ids
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from pymongo import UpdateMany, UpdateOne
+
+# Add parent directory to path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.db.database import create_sync_database
+from app.models.ids import is_new_id, new_id
+
+# Collection có trường "id" được chuyển đổi
+ID_COLLECTIONS = ["users", "jobs", "candidates", "interviews"]
+
+# (collection, trường khóa ngoại, các collection mà khóa ngoại có thể trỏ tới)
+FOREIGN_KEYS = [
+    ("jobs", "created_by", ["users"]),
+    ("jobs", "hiring_manager", ["users"]),
+    ("candidates", "job_id", ["jobs"]),
+    ("candidates", "assigned_recruiter", ["users"]),
+    ("interviews", "candidate_id", ["candidates"]),
+    ("interviews", "job_id", ["jobs"]),
+    # Một số dữ liệu cũ lưu người phỏng vấn trong collection candidates
+    ("interviews", "interviewer_id", ["users", "candidates"]),
+]
+
+# Id trong outbox email (ngoài candidate_id): (đường dẫn trong payload, collection được trỏ tới).
+# dedupe_key cũng chứa id nên được dựng lại cùng lượt, xem _outbox_dedupe_key
+OUTBOX_PAYLOAD_KEYS = [
+    ("id", ["interviews"]),
+    ("candidate_id", ["candidates"]),
+    ("job_id", ["jobs"]),
+    ("interviewer_id", ["users", "candidates"]),
+    ("job.id", ["jobs"]),
+]
+
+CHUNK_SIZE = 1000
+
+
+def _write(collection, requests, dry_run):
+    if not requests or dry_run:
+        return len(requests)
+    result = collection.bulk_write(requests, ordered=False)
+    return result.modified_count
+
+
+def _legacy_created_at(old_id):
+    # Id cũ chính là timestamp lúc tạo tài liệu
+    try:
+        return datetime.fromtimestamp(float(old_id))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def migrate_ids(db, collection_name, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Gán id mới cho các tài liệu còn id cũ
+
+    Returns:
+        dict: Ánh xạ id cũ -> id mới của collection (kể cả các lần chạy trước)
+    """
+    collection = db[collection_name]
+    mapping = {
+        document["legacy_id"]: document["id"]
+        for document in collection.find({"legacy_id": {"$exists": True}}, {"id": 1, "legacy_id": 1})
+    }
+
+    requests = []
+    converted = 0
+    for document in collection.find({"legacy_id": {"$exists": False}}, {"id": 1, "created_at": 1}):
+        old_id = document.get("id")
+        if is_new_id(old_id):
+            continue
+        # Id mới mang thời điểm tạo của tài liệu để thứ tự id khớp với dữ liệu cũ
+        new = new_id(document.get("created_at") or _legacy_created_at(old_id))
+        if old_id is not None:
+            mapping[old_id] = new
+        requests.append(UpdateOne(
+            {"_id": document["_id"]},
+            {"$set": {"id": new, "legacy_id": old_id}},
+        ))
+        if len(requests) >= chunk_size:
+            converted += _write(collection, requests, dry_run)
+            requests = []
+    converted += _write(collection, requests, dry_run)
+
+    print(f"{collection_name}: {converted} id {'sẽ được' if dry_run else 'đã được'} chuyển")
+    return mapping
+
+
+def migrate_foreign_keys(db, mappings, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Cập nhật các khóa ngoại còn trỏ tới id cũ
+    """
+    for collection_name, field, targets in FOREIGN_KEYS:
+        mapping = _combined(mappings, targets)
+
+        collection = db[collection_name]
+        requests = []
+        updated = 0
+        for old_id in collection.distinct(field):
+            if old_id not in mapping:
+                continue
+            requests.append(UpdateMany({field: old_id}, {"$set": {field: mapping[old_id]}}))
+            if len(requests) >= chunk_size:
+                updated += _write(collection, requests, dry_run)
+                requests = []
+        updated += _write(collection, requests, dry_run)
+        print(f"{collection_name}.{field}: {updated} {'giá trị sẽ được' if dry_run else 'tài liệu đã được'} cập nhật")
+
+
+def _combined(mappings, targets):
+    mapping = {}
+    for target in reversed(targets):
+        mapping.update(mappings.get(target, {}))
+    return mapping
+
+
+def _outbox_dedupe_key(key, mappings):
+    """
+    Dựng lại khóa chống trùng ``<candidate_id>:<sự kiện>`` với id mới; sự kiện là
+    ``interview:<interview_id>:<fingerprint>``, ``hired:<job_id>`` hoặc ``rejected:<job_id>``
+    """
+    parts = key.split(":")
+    parts[0] = mappings["candidates"].get(parts[0], parts[0])
+    if len(parts) > 2:
+        targets = {"interview": "interviews", "hired": "jobs", "rejected": "jobs"}.get(parts[1])
+        if targets:
+            parts[2] = mappings[targets].get(parts[2], parts[2])
+    return ":".join(parts)
+
+
+def migrate_outbox(db, mappings, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Cập nhật id trong outbox email: candidate_id, các id trong payload và dedupe_key.
+
+    Phải đổi cùng lượt: ``cancel_pending_emails`` tìm thư mời theo ``payload.id`` và
+    chống gửi trùng theo ``dedupe_key``, nên để id cũ thì email chưa gửi không hủy được
+    và cùng sự kiện sẽ được gửi lại.
+    """
+    mappings = {name: mappings.get(name, {}) for name in ID_COLLECTIONS}
+    payload_mappings = [
+        (f"payload.{path}", path.split("."), _combined(mappings, targets))
+        for path, targets in OUTBOX_PAYLOAD_KEYS
+    ]
+
+    collection = db.email_outbox
+    requests = []
+    updated = 0
+    projection = {"dedupe_key": 1, "candidate_id": 1, **{field: 1 for field, _, _ in payload_mappings}}
+    for document in collection.find({}, projection):
+        changes = {}
+        candidate_id = document.get("candidate_id")
+        if candidate_id in mappings["candidates"]:
+            changes["candidate_id"] = mappings["candidates"][candidate_id]
+        for field, path, mapping in payload_mappings:
+            value = document.get("payload")
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if isinstance(value, str) and value in mapping:
+                changes[field] = mapping[value]
+        key = document.get("dedupe_key")
+        if key and _outbox_dedupe_key(key, mappings) != key:
+            changes["dedupe_key"] = _outbox_dedupe_key(key, mappings)
+        if changes:
+            requests.append(UpdateOne({"_id": document["_id"]}, {"$set": changes}))
+        if len(requests) >= chunk_size:
+            updated += _write(collection, requests, dry_run)
+            requests = []
+    updated += _write(collection, requests, dry_run)
+    print(f"email_outbox: {updated} email {'sẽ được' if dry_run else 'đã được'} cập nhật id")
+
+
+def run(db, dry_run=False):
+    mappings = {name: migrate_ids(db, name, dry_run) for name in ID_COLLECTIONS}
+    migrate_foreign_keys(db, mappings, dry_run)
+    migrate_outbox(db, mappings, dry_run)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chuyển id cũ sang id sắp xếp được theo thời gian")
+    parser.add_argument("--dry-run", action="store_true", help="Chỉ đếm, không ghi thay đổi")
+    args = parser.parse_args()
+    run(create_sync_database(), args.dry_run)
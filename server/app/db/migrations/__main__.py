@@ -0,0 +1,25 @@
+"""
+Chuẩn hóa dữ liệu đã lưu lên phiên bản schema mới nhất.
+
+    python -m app.db.migrations --dry-run
+    python -m app.db.migrations [--collection candidates]
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path so we can import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+
+from app.db.database import create_sync_database
+from app.db.migrations import candidates, interviews, jobs  # noqa: F401 - đăng ký migration
+from app.db.migrations.runner import run_migrations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chạy các migration chuẩn hóa dữ liệu")
+    parser.add_argument("--dry-run", action="store_true", help="Chỉ đếm, không ghi thay đổi")
+    parser.add_argument("--collection", action="append", help="Chỉ chạy cho collection này")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Số tài liệu trong một lệnh bulk_write")
+    args = parser.parse_args()
+    run_migrations(create_sync_database(), args.collection, args.dry_run, args.chunk_size)
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+from ...models.ids import id_created_at, is_new_id, new_id
+from ...search.skills import SKILLS_FIELD, skill_tokens
+from ...search.terms import CANDIDATE_SEARCH_FIELDS, TERMS_FIELD, search_terms
+from .runner import migration
+
+# Giá trị mặc định của các trường mà dữ liệu cũ có thể thiếu (khớp với CandidateBase)
+CANDIDATE_DEFAULTS = {
+    "phone": "Not provided",
+    "department": "Not specified",
+    "experience": 0,
+    "sex": None,
+}
+
+TIMESTAMP_FIELDS = ("created_at", "updated_at", "applied_date")
+
+
+def _inserted_at(document):
+    """
+    Thời điểm tài liệu được tạo: lấy từ _id hoặc id, không dùng giờ hiện tại
+    """
+    if isinstance(document.get("_id"), ObjectId):
+        return document["_id"].generation_time.astimezone().replace(tzinfo=None)
+    if is_new_id(document.get("id")):
+        return id_created_at(document["id"]).astimezone().replace(tzinfo=None)
+    return datetime.now()
+
+
+@migration("candidates", 1, "chuẩn hóa status, điền giá trị mặc định và timestamp")
+def normalize_candidates(document):
+    changes = {}
+
+    if "id" not in document:
+        # Cùng định dạng id với tài liệu mới, giữ thời điểm tạo của tài liệu
+        changes["id"] = new_id(_inserted_at(document))
+
+    status = document.get("status")
+    if isinstance(status, str) and status != status.strip().lower():
+        changes["status"] = status.strip().lower()
+
+    for field, default in CANDIDATE_DEFAULTS.items():
+        if field not in document:
+            changes[field] = default
+
+    inserted_at = None
+    for field in TIMESTAMP_FIELDS:
+        if document.get(field) is None:
+            if inserted_at is None:
+                inserted_at = document.get("created_at") or _inserted_at(document)
+            changes[field] = inserted_at
+
+    # Link CV cũ chỉ có resume_url
+    if document.get("resume_url"):
+        for field in ("resume_drive_url", "resume_download_url"):
+            if field not in document:
+                changes[field] = document["resume_url"]
+
+    return changes, []
+
+
+@migration("candidates", 2, "tạo search_terms cho tìm kiếm theo tiền tố")
+def add_search_terms(document):
+    return {TERMS_FIELD: search_terms(document, CANDIDATE_SEARCH_FIELDS)}, []
+
+
+@migration("candidates", 3, "tạo skill_tokens cho bộ lọc kỹ năng")
+def add_skill_tokens(document):
+    return {SKILLS_FIELD: skill_tokens(document.get("skills"))}, []
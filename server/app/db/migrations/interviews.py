@@ -0,0 +1,9 @@
+from .runner import migration
+
+
+@migration("interviews", 1, "chuẩn hóa status về chữ thường")
+def normalize_status(document):
+    status = document.get("status")
+    if isinstance(status, str) and status != status.strip().lower():
+        return {"status": status.strip().lower()}, []
+    return {}, []
@@ -0,0 +1,15 @@
+from ...search.terms import JOB_SEARCH_FIELDS, TERMS_FIELD, search_terms
+from .runner import migration
+
+
+@migration("jobs", 1, "chuẩn hóa status về chữ thường")
+def normalize_status(document):
+    status = document.get("status")
+    if isinstance(status, str) and status != status.strip().lower():
+        return {"status": status.strip().lower()}, []
+    return {}, []
+
+
+@migration("jobs", 2, "tạo search_terms cho tìm kiếm theo tiền tố")
+def add_search_terms(document):
+    return {TERMS_FIELD: search_terms(document, JOB_SEARCH_FIELDS)}, []
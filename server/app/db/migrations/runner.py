@@ -0,0 +1,101 @@
+"""
+Chạy các migration chuẩn hóa dữ liệu theo ``schema_version`` của từng tài liệu.
+
+Mỗi migration là một hàm nhận một tài liệu và trả về các trường cần ``$set`` /
+``$unset`` để đưa tài liệu lên phiên bản của migration. Tài liệu được ghi theo lô
+bằng ``bulk_write`` và được đóng dấu ``schema_version`` ngay trong cùng lệnh ghi, nên
+khi bị dừng giữa chừng chỉ cần chạy lại: tài liệu đã lên phiên bản sẽ được bỏ qua.
+"""
+
+from pymongo import UpdateOne
+
+# collection -> danh sách (version, mô tả, hàm chuyển đổi), sắp xếp theo version
+MIGRATIONS = {}
+
+CHUNK_SIZE = 1000
+
+
+def migration(collection_name, version, description):
+    """
+    Đăng ký một migration cho collection
+
+    Hàm được đăng ký nhận tài liệu và trả về ``(set_fields, unset_fields)``.
+    """
+    def register(transform):
+        migrations = MIGRATIONS.setdefault(collection_name, [])
+        if any(existing_version == version for existing_version, _, _ in migrations):
+            raise ValueError(f"Duplicate migration {collection_name} v{version}")
+        migrations.append((version, description, transform))
+        migrations.sort(key=lambda item: item[0])
+        return transform
+    return register
+
+
+def latest_version(collection_name):
+    migrations = MIGRATIONS.get(collection_name)
+    return migrations[-1][0] if migrations else 0
+
+
+def _behind(version):
+    # Khớp cả tài liệu chưa có schema_version
+    return {"schema_version": {"$not": {"$gte": version}}}
+
+
+async def count_pending(db):
+    """
+    Số tài liệu chưa lên phiên bản mới nhất của từng collection (dùng với client async)
+    """
+    pending = {}
+    for collection_name in MIGRATIONS:
+        count = await db[collection_name].count_documents(_behind(latest_version(collection_name)))
+        if count:
+            pending[collection_name] = count
+    return pending
+
+
+def run_migration(collection, version, transform, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Đưa các tài liệu có phiên bản thấp hơn ``version`` lên ``version``
+
+    Returns:
+        tuple: (số tài liệu được xử lý, số tài liệu có dữ liệu thay đổi)
+    """
+    processed = changed = 0
+    requests = []
+    for document in collection.find(_behind(version)):
+        set_fields, unset_fields = transform(document)
+        processed += 1
+        changed += int(bool(set_fields or unset_fields))
+        update = {"$set": {**set_fields, "schema_version": version}}
+        if unset_fields:
+            update["$unset"] = {field: "" for field in unset_fields}
+        # Điều kiện theo schema_version cũ: tài liệu đã được tiến trình khác cập nhật thì bỏ qua
+        requests.append(UpdateOne(
+            {"_id": document["_id"], "schema_version": document.get("schema_version")},
+            update,
+        ))
+        if len(requests) >= chunk_size:
+            if not dry_run:
+                collection.bulk_write(requests, ordered=False)
+            requests = []
+    if requests and not dry_run:
+        collection.bulk_write(requests, ordered=False)
+    return processed, changed
+
+
+def run_migrations(db, collections=None, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Chạy mọi migration còn thiếu theo thứ tự version
+
+    Args:
+        db: Database pymongo (đồng bộ)
+        collections (list): Chỉ chạy cho các collection này, mặc định là tất cả
+        dry_run (bool): Chỉ đếm tài liệu sẽ thay đổi, không ghi
+    """
+    for collection_name, migrations in MIGRATIONS.items():
+        if collections and collection_name not in collections:
+            continue
+        for version, description, transform in migrations:
+            processed, changed = run_migration(db[collection_name], version, transform, dry_run, chunk_size)
+            action = "sẽ được" if dry_run else "đã được"
+            print(f"{collection_name} v{version} ({description}): {processed} tài liệu {action} xử lý, {changed} có thay đổi")
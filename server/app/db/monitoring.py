@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import deque
+
+from pymongo import monitoring
+
+
+def latency_summary(samples):
+    """
+    Tóm tắt độ trễ (ms) từ các mẫu tính bằng giây; dùng cho metric MongoDB và hàng đợi email
+    """
+    samples = sorted(samples)
+
+    def percentile(p):
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(round(p * (len(samples) - 1))))
+        return round(samples[index] * 1000, 2)
+
+    return {
+        "samples": len(samples),
+        "avg": round(sum(samples) / len(samples) * 1000, 2) if samples else 0.0,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(samples[-1] * 1000, 2) if samples else 0.0,
+    }
+
+
+class CommandStats(monitoring.CommandListener):
+    """
+    Đếm số lệnh, số lỗi và độ trễ theo từng loại lệnh MongoDB (find, aggregate, insert, ...)
+
+    Listener được pymongo gọi từ thread pool của motor nên mọi cập nhật đều đi qua lock.
+    """
+
+    # Lệnh nội bộ của driver, không tính vào thống kê
+    IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "saslStart", "saslContinue", "endSessions"}
+
+    def __init__(self, latency_window=1000):
+        self._lock = threading.Lock()
+        self._latency_window = latency_window
+        self._commands = {}
+
+    def _record(self, event, failed):
+        if event.command_name in self.IGNORED_COMMANDS:
+            return
+        with self._lock:
+            stats = self._commands.get(event.command_name)
+            if stats is None:
+                stats = self._commands[event.command_name] = {
+                    "count": 0,
+                    "failed": 0,
+                    "latencies": deque(maxlen=self._latency_window),
+                }
+            stats["count"] += 1
+            stats["failed"] += int(failed)
+            stats["latencies"].append(event.duration_micros / 1_000_000)
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, failed=False)
+
+    def failed(self, event):
+        self._record(event, failed=True)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                name: {
+                    "count": stats["count"],
+                    "failed": stats["failed"],
+                    "latency_ms": latency_summary(stats["latencies"]),
+                }
+                for name, stats in sorted(self._commands.items())
+            }
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Số kết nối đang mở / đang được dùng và thời gian chờ lấy kết nối từ pool.
+
+    Việc lấy kết nối (check out) bắt đầu và kết thúc trên cùng một thread nên thời
+    điểm bắt đầu được lưu trong thread-local để tính thời gian chờ.
+    """
+
+    def __init__(self, latency_window=1000):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.open_connections = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.pools_cleared = 0
+        self._wait_times = deque(maxlen=latency_window)
+
+    def _finish_wait(self):
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return None if started is None else time.perf_counter() - started
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._finish_wait()
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        waited = self._finish_wait()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            if waited is not None:
+                self._wait_times.append(waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "pools_cleared": self.pools_cleared,
+                "wait_queue_ms": latency_summary(self._wait_times),
+            }
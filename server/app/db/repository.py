@@ -0,0 +1,99 @@
+"""
+Lớp truy cập dữ liệu cho các route ghi ứng viên, công việc và phỏng vấn.
+
+Mỗi thao tác ghi là một lệnh MongoDB: cập nhật và xóa bằng ``find_one_and_update`` /
+``find_one_and_delete`` (trả về tài liệu, không có tài liệu nghĩa là 404), thêm mới bằng
+``insert_one`` rồi trả về chính tài liệu đã gửi thay vì đọc lại. Giá trị trùng của
+trường có unique index (email ứng viên, id) do MongoDB từ chối bằng
+``DuplicateKeyError`` và được trả về 400, không cần đọc kiểm tra trước.
+"""
+
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from .database import candidates_collection, interviews_collection, jobs_collection
+
+
+def duplicate_key_error(label, error):
+    """
+    HTTPException 400 cho lỗi trùng khóa, ví dụ "Candidate with email a@b.c already exists"
+    """
+    key = (error.details or {}).get("keyValue") or {}
+    described = ", ".join(f"{field} {value}" for field, value in key.items())
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"{label} with {described} already exists" if described else f"{label} already exists",
+    )
+
+
+class Repository:
+    """
+    Các thao tác theo trường ``id`` trên một collection
+    """
+
+    def __init__(self, collection, label):
+        self.collection = collection
+        self.label = label
+
+    def not_found(self, document_id):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{self.label} with ID {document_id} not found",
+        )
+
+    async def get(self, document_id, projection=None, session=None):
+        document = await self.collection.find_one({"id": document_id}, projection, session=session)
+        if document is None:
+            raise self.not_found(document_id)
+        return document
+
+    async def insert(self, document, session=None):
+        """
+        Thêm tài liệu và trả về chính nó (``insert_one`` gán ``_id`` vào dict)
+        """
+        try:
+            await self.collection.insert_one(document, session=session)
+        except DuplicateKeyError as error:
+            raise duplicate_key_error(self.label, error) from error
+        return document
+
+    async def update(self, document_id, update, session=None, return_document=ReturnDocument.AFTER):
+        """
+        Cập nhật bằng toán tử (``{"$set": ...}``) hoặc pipeline và trả về tài liệu
+        sau khi cập nhật (hoặc trước, với ``ReturnDocument.BEFORE``)
+        """
+        try:
+            document = await self.collection.find_one_and_update(
+                {"id": document_id}, update, return_document=return_document, session=session
+            )
+        except DuplicateKeyError as error:
+            raise duplicate_key_error(self.label, error) from error
+        if document is None:
+            raise self.not_found(document_id)
+        return document
+
+    async def set(self, document_id, changes, session=None):
+        """
+        ``$set`` các trường trong ``changes`` cho route cần cả tài liệu cũ (để cập nhật
+        index trong bộ nhớ); tài liệu mới được ghép từ tài liệu cũ nên vẫn chỉ một lệnh
+
+        Returns:
+            tuple: (tài liệu trước, tài liệu sau khi cập nhật)
+        """
+        before = await self.update(document_id, {"$set": changes}, session, ReturnDocument.BEFORE)
+        return before, {**before, **changes}
+
+    async def delete(self, document_id, session=None):
+        """
+        Xóa và trả về tài liệu đã xóa
+        """
+        document = await self.collection.find_one_and_delete({"id": document_id}, session=session)
+        if document is None:
+            raise self.not_found(document_id)
+        return document
+
+
+candidates_repository = Repository(candidates_collection, "Candidate")
+jobs_repository = Repository(jobs_collection, "Job")
+interviews_repository = Repository(interviews_collection, "Interview")
@@ -20,6 +20,11 @@ from app.models.user import UserRole
 from app.models.job import JobStatus, EmploymentType
 from app.models.candidate import CandidateStatus
 from app.models.interview import InterviewStatus, InterviewType
+from app.models.ids import new_id
+from app.db.migrations import candidates, interviews, jobs  # noqa: F401 - đăng ký migration
+from app.db.migrations.runner import latest_version
+from app.search.skills import SKILLS_FIELD, skill_tokens
+from app.search.terms import CANDIDATE_SEARCH_FIELDS, JOB_SEARCH_FIELDS, TERMS_FIELD, search_terms
 
 # Load environment variables from .env.development
 env_path = pathlib.Path(__file__).parents[2] / '.env.development'
@@ -48,7 +53,7 @@ def now_utc7():
 # Sample data - Users
 sample_users = [
     {
-        "id": str(now_utc7().timestamp()),
+        "id": new_id(),
         "username": "admin",
         "email": "admin@example.com",
         "fullname": "Admin User",
@@ -62,7 +67,7 @@ sample_users = [
         "hashed_password": "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW"  # password: secret
     },
     {
-        "id": str(now_utc7().timestamp() + 1),
+        "id": new_id(),
         "username": "hr_manager",
         "email": "hr@example.com",
         "fullname": "HR Manager",
@@ -76,7 +81,7 @@ sample_users = [
         "hashed_password": "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW"
     },
     {
-        "id": str(now_utc7().timestamp() + 2),
+        "id": new_id(),
         "username": "interviewer1",
         "email": "interviewer1@example.com",
         "fullname": "Technical Interviewer",
@@ -90,7 +95,7 @@ sample_users = [
         "hashed_password": "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW"
     },
     {
-        "id": str(now_utc7().timestamp() + 3),
+        "id": new_id(),
         "username": "user",
         "email": "user@example.com",
         "fullname": "Regular User",
@@ -153,7 +158,7 @@ job_id_by_title = {}
 
 for i, dept in enumerate(departments):
     for j, title in enumerate(job_titles[dept]):
-        job_id = str(now_utc7().timestamp() + i * 100 + j)
+        job_id = new_id()
         job_id_by_title[title] = job_id
         
         posting_date = generate_date()
@@ -324,7 +329,7 @@ def calculate_problem_solving(candidate, job):
     return max(1, min(5, round(base_score + experience_score)))
 
 for i in range(30):
-    candidate_id = str(now_utc7().timestamp() + i)
+    candidate_id = new_id()
     candidate_ids.append(candidate_id)
     
     dept = random.choice(departments)
@@ -381,7 +386,7 @@ for i in range(50):
             
             # Generate past interview
             interview_date = generate_date()
-            interview_id = str(now_utc7().timestamp() + i)
+            interview_id = new_id()
             
             # Only create result for completed interviews
             interview_status = random.choice([s.value for s in InterviewStatus])
@@ -436,7 +441,7 @@ for i in range(50):
             future_interview_date = generate_future_date()
             
             sample_interviews.append({
-                "id": str(now_utc7().timestamp() + i + 1000),  # Different ID for future interview
+                "id": new_id(),  # Different ID for future interview
                 "candidate_id": candidate_id,
                 "job_id": job_id,
                 "interviewer_id": interviewer_id,
@@ -486,7 +491,20 @@ async def seed_database():
         job_id = job["id"]
         job["applicants"] = job_applicants_count.get(job_id, 0)
         job["interviews"] = job_interviews_count.get(job_id, 0)
+        job[TERMS_FIELD] = search_terms(job, JOB_SEARCH_FIELDS)
     
+    # Từ khóa cho tìm kiếm theo tiền tố và kỹ năng chuẩn hóa
+    for candidate in sample_candidates:
+        candidate[TERMS_FIELD] = search_terms(candidate, CANDIDATE_SEARCH_FIELDS)
+        candidate[SKILLS_FIELD] = skill_tokens(candidate.get("skills"))
+    
+    # Dữ liệu mẫu đã ở dạng mới nhất, migration không cần xử lý lại
+    for collection_name, documents in (
+        ("jobs", sample_jobs), ("candidates", sample_candidates), ("interviews", sample_interviews)
+    ):
+        for document in documents:
+            document["schema_version"] = latest_version(collection_name)
+
     jobs_collection.insert_many(sample_jobs)
     candidates_collection.insert_many(sample_candidates)
     interviews_collection.insert_many(sample_interviews)
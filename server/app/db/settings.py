@@ -0,0 +1,71 @@
+import importlib.util
+from typing import Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Thư viện Python cần có cho từng thuật toán nén của wire protocol (zlib có sẵn)
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+class MongoSettings(BaseSettings):
+    """
+    Cấu hình kết nối MongoDB, đọc từ biến môi trường ``MONGODB_*``
+
+    Pool mặc định của mỗi worker uvicorn: tối đa ``max_pool_size`` kết nối, giữ sẵn
+    ``min_pool_size`` kết nối; tổng số kết nối tới server là số worker x max_pool_size.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="MONGODB_", extra="ignore")
+
+    uri: Optional[str] = None
+    database_name: Optional[str] = Field(None, validation_alias="DATABASE_NAME")
+
+    max_pool_size: int = 100
+    min_pool_size: int = 10
+    max_idle_time_ms: Optional[int] = 300000
+    wait_queue_timeout_ms: Optional[int] = None
+    # Danh sách thuật toán nén theo thứ tự ưu tiên, ví dụ "zstd,snappy,zlib"
+    compressors: str = ""
+    zlib_compression_level: Optional[int] = None
+    server_selection_timeout_ms: int = 5000
+    connect_timeout_ms: int = 10000
+    socket_timeout_ms: Optional[int] = None
+
+    # Số kết nối được mở sẵn khi khởi động để các request đầu tiên không phải chờ bắt tay kết nối
+    warmup_connections: int = 10
+
+    def available_compressors(self):
+        """
+        Các thuật toán nén được cấu hình và có thư viện tương ứng đã cài
+        """
+        available = []
+        for name in (item.strip().lower() for item in self.compressors.split(",")):
+            if not name:
+                continue
+            module = COMPRESSOR_MODULES.get(name)
+            if module and importlib.util.find_spec(module) is not None:
+                available.append(name)
+            else:
+                print(f"⚠️ MongoDB compressor {name} is not available, skipping")
+        return available
+
+    def client_options(self):
+        """
+        Tham số cho ``AsyncIOMotorClient`` / ``MongoClient``
+        """
+        options = {
+            "maxPoolSize": self.max_pool_size,
+            "minPoolSize": self.min_pool_size,
+            "maxIdleTimeMS": self.max_idle_time_ms,
+            "waitQueueTimeoutMS": self.wait_queue_timeout_ms,
+            "serverSelectionTimeoutMS": self.server_selection_timeout_ms,
+            "connectTimeoutMS": self.connect_timeout_ms,
+            "socketTimeoutMS": self.socket_timeout_ms,
+        }
+        compressors = self.available_compressors()
+        if compressors:
+            options["compressors"] = compressors
+            if "zlib" in compressors and self.zlib_compression_level is not None:
+                options["zlibCompressionLevel"] = self.zlib_compression_level
+        return {name: value for name, value in options.items() if value is not None}
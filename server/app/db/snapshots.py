@@ -0,0 +1,150 @@
+"""
+Bản sao các trường hiển thị trên tài liệu phỏng vấn: tên và email ứng viên, tiêu đề công
+việc, tên người phỏng vấn.
+
+Các route đọc phỏng vấn lấy thẳng các trường này thay vì ``$lookup`` sang candidates,
+jobs và users. Bản sao được ghi khi tạo/cập nhật phỏng vấn, được lan truyền khi ứng viên
+đổi tên/email hoặc công việc đổi tiêu đề, và được đối soát (kể cả điền cho phỏng vấn cũ)
+bằng:
+
+    python -m app.db.snapshots --dry-run
+    python -m app.db.snapshots
+
+``candidate_email`` có thể được đặt riêng khi tạo phỏng vấn nên chỉ được điền khi còn
+trống, và khi lan truyền chỉ thay các phỏng vấn còn dùng email cũ của ứng viên.
+"""
+
+import argparse
+
+from pymongo import UpdateOne
+
+from .database import create_sync_database, interviews_collection, users_collection
+
+# trường trên phỏng vấn -> trường của tài liệu nguồn
+CANDIDATE_SNAPSHOT = {"candidate_name": "name", "candidate_email": "email"}
+JOB_SNAPSHOT = {"job_title": "title"}
+INTERVIEWER_SNAPSHOT = {"interviewer_name": "fullname"}
+
+# (collection nguồn, trường id của nguồn trên phỏng vấn, các trường bản sao)
+SNAPSHOTS = (
+    ("candidates", "candidate_id", CANDIDATE_SNAPSHOT),
+    ("jobs", "job_id", JOB_SNAPSHOT),
+    ("users", "interviewer_id", INTERVIEWER_SNAPSHOT),
+)
+
+# Bản sao có thể được đặt khác giá trị của nguồn
+OVERRIDABLE = {"candidate_email"}
+
+CHUNK_SIZE = 1000
+
+
+def source_projection(fields):
+    return {"_id": 0, "id": 1, **{source_field: 1 for source_field in fields.values()}}
+
+
+def snapshot(fields, source):
+    """
+    Các trường bản sao lấy từ tài liệu nguồn (None nếu nguồn không tồn tại)
+    """
+    source = source or {}
+    return {field: source.get(source_field) for field, source_field in fields.items()}
+
+
+async def interviewer_snapshot(interviewer_id, session=None):
+    user = await users_collection.find_one(
+        {"id": interviewer_id}, source_projection(INTERVIEWER_SNAPSHOT), session=session
+    )
+    return snapshot(INTERVIEWER_SNAPSHOT, user)
+
+
+async def propagate(collection_name, before, after, session=None):
+    """
+    Cập nhật bản sao trên các phỏng vấn sau khi tài liệu nguồn đổi từ ``before`` sang ``after``
+    """
+    for source_name, key, fields in SNAPSHOTS:
+        if source_name != collection_name:
+            continue
+        changed = {
+            field: source_field for field, source_field in fields.items()
+            if before.get(source_field) != after.get(source_field)
+        }
+        updates = {field: after.get(source_field) for field, source_field in changed.items() if field not in OVERRIDABLE}
+        if updates:
+            await interviews_collection.update_many({key: after["id"]}, {"$set": updates}, session=session)
+        for field in OVERRIDABLE.intersection(changed):
+            source_field = changed[field]
+            await interviews_collection.update_many(
+                {key: after["id"], field: before.get(source_field)},
+                {"$set": {field: after.get(source_field)}},
+                session=session,
+            )
+
+
+def _differences(interview, fields, source):
+    expected = snapshot(fields, source)
+    return {
+        field: value for field, value in expected.items()
+        if interview.get(field) != value and not (field in OVERRIDABLE and interview.get(field))
+    }
+
+
+def _reconcile_chunk(db, interviews):
+    requests = []
+    sources = {}
+    for source_name, key, fields in SNAPSHOTS:
+        ids = list({interview[key] for interview in interviews if interview.get(key)})
+        sources[source_name] = {
+            document["id"]: document
+            for document in db[source_name].find({"id": {"$in": ids}}, source_projection(fields))
+        }
+    for interview in interviews:
+        changes = {}
+        for source_name, key, fields in SNAPSHOTS:
+            changes.update(_differences(interview, fields, sources[source_name].get(interview.get(key))))
+        if changes:
+            requests.append(UpdateOne({"_id": interview["_id"]}, {"$set": changes}))
+    return requests
+
+
+def reconcile(db, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Đưa bản sao trên mọi phỏng vấn về giá trị hiện tại của nguồn; mỗi lô phỏng vấn đọc
+    nguồn bằng một lệnh ``$in`` cho mỗi collection
+
+    Args:
+        db: Database pymongo (đồng bộ)
+
+    Returns:
+        tuple: (số phỏng vấn được kiểm tra, số phỏng vấn có bản sao sai)
+    """
+    projection = {"_id": 1}
+    for _, key, fields in SNAPSHOTS:
+        projection.update({key: 1, **{field: 1 for field in fields}})
+
+    checked = stale = 0
+    chunk = []
+    for interview in db.interviews.find({}, projection):
+        chunk.append(interview)
+        if len(chunk) < chunk_size:
+            continue
+        requests = _reconcile_chunk(db, chunk)
+        checked, stale, chunk = checked + len(chunk), stale + len(requests), []
+        if requests and not dry_run:
+            db.interviews.bulk_write(requests, ordered=False)
+    if chunk:
+        requests = _reconcile_chunk(db, chunk)
+        checked, stale = checked + len(chunk), stale + len(requests)
+        if requests and not dry_run:
+            db.interviews.bulk_write(requests, ordered=False)
+    return checked, stale
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Đối soát bản sao tên/tiêu đề trên phỏng vấn")
+    parser.add_argument("--dry-run", action="store_true", help="Chỉ đếm, không ghi thay đổi")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Số phỏng vấn mỗi lô")
+    args = parser.parse_args()
+
+    checked, stale = reconcile(create_sync_database(), args.dry_run, args.chunk_size)
+    action = "sẽ được" if args.dry_run else "đã được"
+    print(f"{checked} phỏng vấn được kiểm tra, {stale} phỏng vấn {action} cập nhật bản sao")
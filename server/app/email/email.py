@@ -1,18 +1,142 @@
+import hashlib
 import os
+from datetime import datetime, timezone
+from enum import Enum
 from dotenv import load_dotenv
-from .sendemail import GmailClient
+from .sendemail import GmailClient, SEND_QUOTA_UNITS, DEFAULT_QUOTA_UNITS_PER_SECOND
+from .ratelimit import SharedTokenBucket
+from .token_cache import TokenCache
+from .transports import create_transport
+from .queue import EmailQueue
+from .outbox import OutboxDispatcher, add_to_outbox, supersede_pending
+from ..db.database import email_outbox_collection
 
 load_dotenv()
-gmail = GmailClient(
+
+# Độ ưu tiên gửi theo loại email: thư mời phỏng vấn được gửi trước thông báo kết quả
+PRIORITIES = {"interview": 0, "acceptance": 1, "rejection": 2}
+
+# Email kết quả tuyển dụng, bị hủy nếu trạng thái ứng viên thay đổi trước khi gửi
+RESULT_KINDS = ("acceptance", "rejection")
+
+# Các trường của thư mời phỏng vấn; thay đổi một trong số này thì gửi lại thư mời
+INVITE_FIELDS = ("scheduled_date", "duration_minutes", "location", "type", "description", "meeting_link")
+
+# Số giây gom sự kiện của cùng một ứng viên trước khi gửi, chỉ trạng thái cuối cùng được gửi
+COALESCE_WINDOW = float(os.getenv("EMAIL_COALESCE_SECONDS", "60"))
+
+def _create_gmail_client():
+    return GmailClient(
         access_token = os.getenv("GMAIL_ACCESS_TOKEN"),
         refresh_token = os.getenv("GMAIL_REFRESH_TOKEN"),
         client_id = os.getenv("GMAIL_CLIENT_ID"),
         client_secret = os.getenv("GMAIL_CLIENT_SECRET"),
-        token_uri = os.getenv("GMAIL_TOKEN_URI") or "https://oauth2.googleapis.com/token"
+        token_uri = os.getenv("GMAIL_TOKEN_URI") or "https://oauth2.googleapis.com/token",
+        token_cache = TokenCache(os.getenv("GMAIL_TOKEN_CACHE")),
+        # Quota Gmail tính theo tài khoản: mọi worker dùng chung một bucket qua file
+        rate_limiter = SharedTokenBucket(
+            float(os.getenv("GMAIL_QUOTA_UNITS_PER_SECOND", DEFAULT_QUOTA_UNITS_PER_SECOND)),
+            capacity = SEND_QUOTA_UNITS * int(os.getenv("EMAIL_BATCH_SIZE", "50")),
+            path = os.getenv("GMAIL_QUOTA_STATE"),
+        ),
     )
-def send_interview_email(interview_data):
-    gmail.send_interview_email(interview_data)
-def send_rejection_email(data):
-    gmail.send_rejection_email(data)
-def send_acceptance_email(data):
-    gmail.send_acceptance_email(data)
\ No newline at end of file
+
+
+# Backend gửi email được chọn qua EMAIL_TRANSPORT (gmail, smtp, spool)
+transport = create_transport(gmail_factory=_create_gmail_client)
+
+
+def _deliver(kind, payload):
+    """
+    Gửi email đồng bộ, được gọi từ thread pool của hàng đợi
+    """
+    return transport.send(kind, payload)
+
+
+def _deliver_bulk(messages):
+    """
+    Gửi một lô email, được gọi từ thread pool của hàng đợi
+    """
+    return transport.send_bulk(messages, batch_size=email_queue.batch_size)
+
+
+email_queue = EmailQueue(
+    _deliver,
+    maxsize=int(os.getenv("EMAIL_QUEUE_MAXSIZE", "1000")),
+    workers=int(os.getenv("EMAIL_WORKERS", "4")),
+    bulk_sender=_deliver_bulk,
+    batch_size=int(os.getenv("EMAIL_BATCH_SIZE", "50")),
+    priorities=PRIORITIES,
+)
+
+email_dispatcher = OutboxDispatcher(
+    email_outbox_collection,
+    email_queue.submit,
+    batch_size=int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50")),
+    max_attempts=int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5")),
+)
+
+
+async def _add(kind, candidate_id, event, payload, session):
+    added = await add_to_outbox(
+        email_outbox_collection, kind, candidate_id, event, payload,
+        priority=PRIORITIES.get(kind, 0), delay=COALESCE_WINDOW, session=session
+    )
+    if added:
+        email_dispatcher.notify()
+    return added
+
+
+def _fingerprint_value(value):
+    """
+    Giá trị như sau khi đi qua MongoDB: enum thành chuỗi, thời gian là UTC và chỉ giữ tới mili giây
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        # BSON lưu datetime không có múi giờ như giờ UTC
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(timespec="milliseconds")
+    return value
+
+
+def _invite_fingerprint(payload):
+    """
+    Mã ngắn của nội dung thư mời: đổi lịch/địa điểm tạo ra thư mời mới, gửi lại y hệt thì bị chống trùng.
+    Giá trị vừa nhận từ request và giá trị đọc lại từ database cho cùng một mã.
+    """
+    content = repr([_fingerprint_value(payload.get(field)) for field in INVITE_FIELDS])
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+
+
+async def cancel_pending_emails(candidate_id, kinds=None, interview_id=None, session=None):
+    """
+    Hủy các email chưa gửi của ứng viên (đã bị thay thế bởi trạng thái mới hơn)
+    """
+    match = {}
+    if kinds:
+        match["kind"] = {"$in": list(kinds)}
+    if interview_id:
+        match["payload.id"] = interview_id
+    return await supersede_pending(email_outbox_collection, candidate_id, match, session=session)
+
+
+# Các hàm dưới đây chỉ ghi email vào outbox; dispatcher sẽ gửi ở chế độ nền.
+# Truyền session để ghi outbox trong cùng transaction với dữ liệu nghiệp vụ.
+# Email chỉ đến hạn sau COALESCE_WINDOW giây, trong khoảng đó sự kiện mới hơn sẽ thay thế nó.
+async def send_interview_email(interview_data, session=None):
+    payload = {k: v for k, v in interview_data.items() if k != "_id"}
+    # Thư mời mới (ví dụ khi đổi lịch) thay thế thư mời chưa gửi của cùng cuộc phỏng vấn
+    await cancel_pending_emails(payload["candidate_id"], ["interview"], payload["id"], session=session)
+    event = f"interview:{payload['id']}:{_invite_fingerprint(payload)}"
+    return await _add("interview", payload["candidate_id"], event, payload, session)
+async def send_rejection_email(candidate_id, data, session=None):
+    # Kết quả cuối cùng thay thế mọi email chưa gửi của ứng viên
+    await cancel_pending_emails(candidate_id, session=session)
+    event = f"rejected:{data.get('job', {}).get('id')}"
+    return await _add("rejection", candidate_id, event, data, session)
+async def send_acceptance_email(candidate_id, data, session=None):
+    await cancel_pending_emails(candidate_id, session=session)
+    event = f"hired:{data.get('job', {}).get('id')}"
+    return await _add("acceptance", candidate_id, event, data, session)
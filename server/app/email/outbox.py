@@ -0,0 +1,263 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+# Trạng thái của một email trong outbox
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+DEAD = "dead"
+SUPERSEDED = "superseded"
+
+
+def dedupe_key(candidate_id, event):
+    """
+    Khóa chống gửi trùng cho một sự kiện của một ứng viên
+    """
+    return f"{candidate_id}:{event}"
+
+
+async def add_to_outbox(collection, kind, candidate_id, event, payload, priority=0, delay=0, session=None):
+    """
+    Ghi một email cần gửi vào outbox, cùng transaction với thao tác ghi dữ liệu.
+
+    Email chỉ đến hạn gửi sau ``delay`` giây; trong khoảng đó một sự kiện mới hơn
+    của cùng ứng viên có thể thay thế nó (xem ``supersede_pending``).
+
+    Args:
+        collection: Collection ``email_outbox``
+        kind (str): Loại email (interview, acceptance, rejection)
+        candidate_id (str): ID ứng viên nhận email
+        event (str): Sự kiện gây ra email, cùng với candidate_id tạo thành khóa chống trùng
+        payload (dict): Dữ liệu để dựng nội dung email
+        priority (int): Độ ưu tiên gửi, số nhỏ hơn được gửi trước
+        delay (float): Số giây chờ trước khi email đến hạn gửi
+        session: Session MongoDB của transaction hiện tại (nếu có)
+
+    Returns:
+        bool: False nếu email cho sự kiện này đã có trong outbox
+    """
+    now = datetime.now()
+    due_at = now + timedelta(seconds=delay)
+    document = {
+        "dedupe_key": dedupe_key(candidate_id, event),
+        "kind": kind,
+        "candidate_id": candidate_id,
+        "payload": payload,
+        "priority": priority,
+        "status": PENDING,
+        "attempts": 0,
+        "next_attempt_at": due_at,
+        "locked_until": None,
+        "last_error": None,
+        "created_at": now,
+        "updated_at": now,
+        "sent_at": None,
+    }
+    # Một lệnh upsert: thêm email mới, hoặc kích hoạt lại email của sự kiện đã từng bị thay
+    # thế rồi lại xảy ra (ví dụ hired -> rejected -> hired); email đang chờ hoặc đã gửi giữ
+    # nguyên. Không insert rồi bắt DuplicateKeyError vì lỗi ghi trong transaction làm
+    # MongoDB hủy cả transaction (kể cả thao tác ghi dữ liệu đi kèm).
+    replace = {"$eq": [{"$ifNull": ["$status", SUPERSEDED]}, SUPERSEDED]}
+    fields = {
+        field: {"$cond": [replace, {"$literal": value}, f"${field}"]}
+        for field, value in document.items()
+        if field not in ("dedupe_key", "created_at")
+    }
+    fields["created_at"] = {"$ifNull": ["$created_at", {"$literal": now}]}
+    previous = await collection.find_one_and_update(
+        {"dedupe_key": document["dedupe_key"]},
+        [{"$set": fields}],
+        projection={"status": 1},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE,
+        session=session,
+    )
+    return previous is None or previous.get("status") == SUPERSEDED
+
+
+async def supersede_pending(collection, candidate_id, match=None, session=None):
+    """
+    Đánh dấu các email chưa gửi của ứng viên là đã bị thay thế để chúng không được gửi nữa
+
+    Args:
+        collection: Collection ``email_outbox``
+        candidate_id (str): ID ứng viên
+        match (dict): Điều kiện lọc thêm, ví dụ ``{"kind": "interview"}``
+        session: Session MongoDB của transaction hiện tại (nếu có)
+
+    Returns:
+        int: Số email bị thay thế
+    """
+    result = await collection.update_many(
+        {"candidate_id": candidate_id, "status": PENDING, **(match or {})},
+        {"$set": {"status": SUPERSEDED, "updated_at": datetime.now()}},
+        session=session,
+    )
+    return result.modified_count
+
+
+class OutboxDispatcher:
+    """
+    Lấy email từ outbox theo lô và gửi qua transport.
+
+    Mỗi email được "nhận" bằng một lệnh ``find_one_and_update`` nguyên tử nên nhiều
+    worker uvicorn có thể chạy dispatcher cùng lúc mà không gửi trùng. Email gửi lỗi
+    được thử lại với exponential backoff; quá ``max_attempts`` lần thì chuyển sang
+    trạng thái ``dead``.
+    """
+
+    def __init__(
+        self,
+        collection,
+        transport,
+        batch_size=50,
+        max_attempts=5,
+        base_delay=30,
+        max_delay=3600,
+        poll_interval=5,
+        lease_seconds=300,
+    ):
+        """
+        Args:
+            collection: Collection ``email_outbox``
+            transport (callable): Hàm async ``transport(kind, payload) -> bool``
+            batch_size (int): Số email tối đa nhận trong một lần quét
+            max_attempts (int): Số lần gửi tối đa trước khi chuyển sang ``dead``
+            base_delay (float): Thời gian chờ (giây) trước lần thử lại đầu tiên
+            max_delay (float): Thời gian chờ tối đa (giây) giữa hai lần thử
+            poll_interval (float): Chu kỳ quét outbox (giây) khi không có email mới
+            lease_seconds (float): Thời gian giữ email ở trạng thái ``sending``;
+                hết hạn thì email được nhận lại (ví dụ khi worker bị crash)
+        """
+        self.collection = collection
+        self.transport = transport
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+        # Metrics
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+
+    def notify(self):
+        """
+        Báo cho dispatcher có email mới để không phải chờ hết chu kỳ quét
+        """
+        self._wakeup.set()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="email-outbox-dispatcher")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception as error:
+                print(f"❌ Lỗi khi xử lý outbox email: {error}")
+                processed = 0
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _claim(self, now):
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": PENDING, "next_attempt_at": {"$lte": now}},
+                    {"status": SENDING, "locked_until": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": SENDING,
+                    "locked_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", 1), ("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def run_once(self):
+        """
+        Nhận và gửi một lô email đến hạn
+
+        Returns:
+            int: Số email đã xử lý trong lô
+        """
+        now = datetime.now()
+        batch = []
+        while len(batch) < self.batch_size:
+            document = await self._claim(now)
+            if document is None:
+                break
+            batch.append(document)
+
+        if batch:
+            await asyncio.gather(*(self._dispatch(document) for document in batch))
+        return len(batch)
+
+    def _backoff(self, attempts):
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _dispatch(self, document):
+        error = None
+        try:
+            ok = await self.transport(document["kind"], document["payload"])
+            if not ok:
+                error = "Transport reported failure"
+        except Exception as exc:
+            error = str(exc) or exc.__class__.__name__
+
+        now = datetime.now()
+        if error is None:
+            update = {"status": SENT, "sent_at": now, "locked_until": None, "last_error": None}
+            self.sent += 1
+        elif document["attempts"] >= self.max_attempts:
+            update = {"status": DEAD, "locked_until": None, "last_error": error}
+            self.dead += 1
+            print(f"❌ Email {document['dedupe_key']} bị bỏ sau {document['attempts']} lần gửi lỗi: {error}")
+        else:
+            update = {
+                "status": PENDING,
+                "locked_until": None,
+                "last_error": error,
+                "next_attempt_at": now + timedelta(seconds=self._backoff(document["attempts"])),
+            }
+            self.retried += 1
+        update["updated_at"] = now
+
+        await self.collection.update_one(
+            {"_id": document["_id"], "status": SENDING, "attempts": document["attempts"]},
+            {"$set": update},
+        )
+
+    def metrics(self):
+        return {
+            "running": self._task is not None,
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+        }
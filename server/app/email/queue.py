@@ -0,0 +1,177 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ..db.monitoring import latency_summary
+
+
+class EmailQueue:
+    """
+    Hàng đợi gửi email chạy nền.
+
+    Request handler chỉ đưa email vào hàng đợi rồi trả về ngay; một nhóm worker
+    asyncio lấy email ra và chạy hàm gửi (blocking) trong thread pool để không
+    chặn event loop của uvicorn.
+
+    Email được lấy ra theo độ ưu tiên của loại email (số nhỏ hơn được gửi trước).
+    Khi có ``bulk_sender``, mỗi worker gom các email đang chờ thành một lô để gửi
+    trong một lần gọi.
+    """
+
+    def __init__(
+        self,
+        sender,
+        maxsize=1000,
+        workers=4,
+        latency_window=1000,
+        bulk_sender=None,
+        batch_size=50,
+        priorities=None,
+    ):
+        """
+        Args:
+            sender (callable): Hàm gửi đồng bộ ``sender(kind, payload) -> bool``
+            maxsize (int): Số email tối đa được chờ trong hàng đợi
+            workers (int): Số worker (và số thread) gửi email song song
+            latency_window (int): Số mẫu thời gian gửi giữ lại để tính metric
+            bulk_sender (callable): Hàm gửi theo lô ``bulk_sender([(kind, payload)]) -> [bool]``
+            batch_size (int): Số email tối đa trong một lô
+            priorities (dict): Độ ưu tiên theo loại email, mặc định là 0
+        """
+        self.sender = sender
+        self.bulk_sender = bulk_sender
+        self.batch_size = batch_size
+        self.priorities = priorities or {}
+        self.maxsize = maxsize
+        self.workers = workers
+        self._queue = asyncio.PriorityQueue(maxsize=maxsize)
+        self._sequence = itertools.count()
+        self._tasks = []
+        self._executor = None
+
+        # Metrics
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._latencies = deque(maxlen=latency_window)
+
+    @property
+    def running(self):
+        return bool(self._tasks)
+
+    async def start(self):
+        """
+        Khởi động các worker gửi email
+        """
+        if self.running:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="email-sender"
+        )
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"email-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self, timeout=10):
+        """
+        Dừng các worker, chờ tối đa ``timeout`` giây để gửi nốt email còn trong hàng đợi
+        """
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Dừng hàng đợi email khi còn {self._queue.qsize()} email chưa gửi")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._executor.shutdown(wait=False)
+        self._executor = None
+
+    def enqueue(self, kind, payload):
+        """
+        Đưa một email vào hàng đợi mà không chờ gửi
+
+        Returns:
+            bool: False nếu hàng đợi đã đầy và email bị bỏ qua
+        """
+        try:
+            self._queue.put_nowait(self._item(kind, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"❌ Hàng đợi email đã đầy ({self.maxsize}), bỏ qua email {kind}")
+            return False
+        self.enqueued += 1
+        return True
+
+    async def submit(self, kind, payload):
+        """
+        Đưa một email vào hàng đợi (chờ nếu hàng đợi đầy) và chờ kết quả gửi
+
+        Returns:
+            bool: True nếu email được gửi thành công
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(self._item(kind, payload, future))
+        self.enqueued += 1
+        return await future
+
+    def _item(self, kind, payload, future=None):
+        # Số thứ tự giữ email cùng độ ưu tiên theo thứ tự FIFO
+        return (self.priorities.get(kind, 0), next(self._sequence), kind, payload, future)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            if self.bulk_sender is not None:
+                while len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+
+            started = time.perf_counter()
+            try:
+                if len(items) > 1:
+                    messages = [(kind, payload) for _, _, kind, payload, _ in items]
+                    results = await loop.run_in_executor(self._executor, self.bulk_sender, messages)
+                else:
+                    _, _, kind, payload, _ = items[0]
+                    results = [await loop.run_in_executor(self._executor, self.sender, kind, payload)]
+            except Exception as error:
+                print(f"❌ Lỗi khi gửi {len(items)} email: {error}")
+                results = [False] * len(items)
+            elapsed = time.perf_counter() - started
+            results = list(results) + [False] * (len(items) - len(results))
+
+            for (_, _, kind, payload, future), ok in zip(items, results):
+                self._latencies.append(elapsed)
+                self._queue.task_done()
+                if ok:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+                if future is not None and not future.done():
+                    future.set_result(bool(ok))
+
+    def metrics(self):
+        """
+        Độ sâu hàng đợi, bộ đếm và độ trễ gửi (ms) của các email gần nhất
+        """
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_maxsize": self.maxsize,
+            "workers": self.workers,
+            "running": self.running,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "send_latency_ms": latency_summary(self._latencies),
+        }
@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+
+from .token_cache import DEFAULT_TOKEN_DIR, locked, read_json, write_json
+
+DEFAULT_QUOTA_STATE = os.path.join(DEFAULT_TOKEN_DIR, "gmail-quota.json")
+
+
+class TokenBucket:
+    """
+    Token bucket dùng chung giữa các thread gửi email của một process.
+
+    ``acquire`` cho phép "nợ" token: lệnh gọi trừ ngay số token cần dùng rồi ngủ
+    cho tới khi bucket được nạp lại đủ, nhờ đó một batch lớn hơn dung lượng bucket
+    vẫn được gửi nhưng tốc độ trung bình luôn bám theo ``rate``.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): Số token được nạp mỗi giây
+            capacity (float): Số token tối đa tích lũy khi rảnh (mặc định bằng ``rate``)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens=1):
+        """
+        Lấy ``tokens`` token, chặn thread hiện tại nếu vượt quá tốc độ cho phép
+
+        Returns:
+            float: Số giây đã phải chờ
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket dùng chung giữa các process (các worker uvicorn cùng gửi bằng một tài khoản
+    Gmail, mà quota Gmail tính theo tài khoản).
+
+    Số token và thời điểm nạp được lưu trong file ``path``, đọc và ghi dưới file lock nên
+    tổng tốc độ của mọi worker bám theo ``rate``. Thời gian là đồng hồ hệ thống vì
+    ``time.monotonic`` không so sánh được giữa các process.
+    """
+
+    def __init__(self, rate, capacity=None, path=None):
+        super().__init__(rate, capacity)
+        self.path = path or DEFAULT_QUOTA_STATE
+
+    def acquire(self, tokens=1):
+        with self._lock, locked(self.path):
+            now = time.time()
+            state = read_json(self.path) or {}
+            try:
+                self._tokens, self._updated = float(state["tokens"]), float(state["updated"])
+            except (KeyError, TypeError, ValueError):
+                self._tokens, self._updated = self.capacity, now
+            # Đồng hồ bị chỉnh lùi: không nạp thêm token cho khoảng thời gian âm
+            self._refill(max(now, self._updated))
+            self._tokens -= tokens
+            write_json(self.path, {"tokens": self._tokens, "updated": self._updated})
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            time.sleep(wait)
+        return wait
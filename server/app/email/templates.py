@@ -0,0 +1,358 @@
+import base64
+import html
+import os
+from string import Template
+
+DEFAULT_SENDER = os.getenv("EMAIL_SENDER") or "tinle210303@gmail.com"
+DEFAULT_LOCALE = os.getenv("EMAIL_LOCALE") or "vi"
+
+
+# Nội dung email theo loại và ngôn ngữ. Biến dạng $name được thay bằng dữ liệu của
+# từng ứng viên (đã escape HTML); các khối tùy chọn nằm trong "partials".
+TEMPLATES = {
+    "interview": {
+        "vi": {
+            "subject": "Thư mời phỏng vấn - $date",
+            "body": """<html>
+<body>
+    <p>Kính gửi ứng viên,</p>
+
+    <p>Chúng tôi vui mừng thông báo rằng hồ sơ của bạn đã được xem xét và mời bạn tham gia buổi phỏng vấn.</p>
+
+    <p><strong>Thông tin chi tiết:</strong></p>
+    <ul>
+        <li>Ngày: $date</li>
+        <li>Thời gian: $time</li>
+        <li>Thời lượng: $duration phút</li>
+        <li>Địa điểm: $location</li>
+        <li>Hình thức: $type</li>
+    </ul>
+
+    $description_block
+
+    <p>Vui lòng xác nhận sự tham dự của bạn bằng cách trả lời email này.</p>
+
+    <p>Trân trọng,<br>
+    Phòng Nhân sự</p>
+</body>
+</html>
+""",
+            "partials": {
+                "description_block": "<p><strong>Mô tả thêm:</strong> $description</p>",
+            },
+        },
+        "en": {
+            "subject": "Interview invitation - $date",
+            "body": """<html>
+<body>
+    <p>Dear candidate,</p>
+
+    <p>We are pleased to let you know that your application has been reviewed and we would like to invite you to an interview.</p>
+
+    <p><strong>Details:</strong></p>
+    <ul>
+        <li>Date: $date</li>
+        <li>Time: $time</li>
+        <li>Duration: $duration minutes</li>
+        <li>Location: $location</li>
+        <li>Format: $type</li>
+    </ul>
+
+    $description_block
+
+    <p>Please confirm your attendance by replying to this email.</p>
+
+    <p>Best regards,<br>
+    Human Resources</p>
+</body>
+</html>
+""",
+            "partials": {
+                "description_block": "<p><strong>Additional information:</strong> $description</p>",
+            },
+        },
+    },
+    "acceptance": {
+        "vi": {
+            "subject": "Thông báo kết quả phỏng vấn - Chúc mừng bạn đã được nhận vào vị trí $position",
+            "body": """<html>
+<body>
+    <p>Kính gửi ứng viên,</p>
+
+    <p>Chúng tôi vui mừng thông báo rằng bạn đã <strong>trúng tuyển</strong> vào vị trí $position tại công ty chúng tôi.</p>
+
+    <p>Trong thời gian tới, chúng tôi sẽ liên hệ với bạn để thông báo chi tiết về:</p>
+    <ul>
+        <li>Ngày bắt đầu làm việc</li>
+        <li>Thông tin về lương và phúc lợi</li>
+        <li>Các thủ tục và giấy tờ cần chuẩn bị</li>
+    </ul>
+
+    <p>Vui lòng xác nhận việc nhận công việc bằng cách trả lời email này trong vòng 3 ngày làm việc.</p>
+
+    <p>Chúng tôi rất mong được làm việc cùng bạn!</p>
+
+    <p>Trân trọng,<br>
+    Phòng Nhân sự</p>
+</body>
+</html>
+""",
+            "defaults": {"position": "vị trí ứng tuyển"},
+        },
+        "en": {
+            "subject": "Interview result - Congratulations on your offer for the $position position",
+            "body": """<html>
+<body>
+    <p>Dear candidate,</p>
+
+    <p>We are delighted to inform you that you have been <strong>selected</strong> for the $position position at our company.</p>
+
+    <p>We will contact you shortly with details about:</p>
+    <ul>
+        <li>Your start date</li>
+        <li>Salary and benefits</li>
+        <li>Onboarding paperwork to prepare</li>
+    </ul>
+
+    <p>Please confirm your acceptance by replying to this email within 3 business days.</p>
+
+    <p>We look forward to working with you!</p>
+
+    <p>Best regards,<br>
+    Human Resources</p>
+</body>
+</html>
+""",
+            "defaults": {"position": "applied-for"},
+        },
+    },
+    "rejection": {
+        "vi": {
+            "subject": "Thông báo kết quả phỏng vấn - Vị trí $position",
+            "body": """<html>
+<body>
+    <p>Kính gửi ứng viên,</p>
+
+    <p>Cảm ơn bạn đã tham gia buổi phỏng vấn cho vị trí $position tại công ty chúng tôi.</p>
+
+    <p>Sau khi cân nhắc kỹ lưỡng, chúng tôi rất tiếc phải thông báo rằng chúng tôi đã quyết định tiếp tục với các ứng viên khác phù hợp hơn với yêu cầu hiện tại của vị trí này.</p>
+
+    <p>Mặc dù vậy, chúng tôi đánh giá cao kinh nghiệm và kỹ năng của bạn. Chúng tôi khuyến khích bạn tiếp tục theo dõi các cơ hội tuyển dụng trong tương lai tại công ty chúng tôi có thể phù hợp hơn với hồ sơ của bạn.</p>
+
+    <p>Chúng tôi đánh giá cao thời gian và nỗ lực của bạn trong quá trình ứng tuyển và chúc bạn thành công trong sự nghiệp của mình.</p>
+
+    <p>Trân trọng,<br>
+    Phòng Nhân sự</p>
+</body>
+</html>
+""",
+            "defaults": {"position": "vị trí ứng tuyển"},
+        },
+        "en": {
+            "subject": "Interview result - $position position",
+            "body": """<html>
+<body>
+    <p>Dear candidate,</p>
+
+    <p>Thank you for interviewing for the $position position at our company.</p>
+
+    <p>After careful consideration, we regret to inform you that we have decided to move forward with other candidates whose profiles more closely match the current requirements of this role.</p>
+
+    <p>We nevertheless value your experience and skills, and we encourage you to keep an eye on future openings at our company that may be a better fit for your profile.</p>
+
+    <p>We appreciate the time and effort you invested in the application process and wish you every success in your career.</p>
+
+    <p>Best regards,<br>
+    Human Resources</p>
+</body>
+</html>
+""",
+            "defaults": {"position": "applied-for"},
+        },
+    },
+}
+
+
+def _compile(text):
+    """
+    Tách template thành danh sách xen kẽ [chuỗi cố định, tên biến, chuỗi cố định, ...]
+    để lúc render chỉ cần nối chuỗi
+    """
+    parts = []
+    position = 0
+    for match in Template.pattern.finditer(text):
+        name = match.group("named") or match.group("braced")
+        if name is None:
+            # "$$" hoặc "$" không hợp lệ được giữ nguyên như chuỗi cố định
+            continue
+        parts.append(text[position:match.start()].replace("$$", "$"))
+        parts.append(name)
+        position = match.end()
+    parts.append(text[position:].replace("$$", "$"))
+    return parts
+
+
+def _substitute(parts, fields):
+    chunks = list(parts)
+    for index in range(1, len(chunks), 2):
+        chunks[index] = fields.get(chunks[index], "")
+    return "".join(chunks)
+
+
+def _encode_header(value):
+    """
+    Mã hóa header theo RFC 2047, chia thành nhiều encoded-word ngắn khi có ký tự Unicode.
+
+    CR/LF được thay bằng khoảng trắng: header được ghép thành chuỗi nên một xuống dòng
+    trong dữ liệu (ví dụ tiêu đề công việc) sẽ tạo thêm header mới.
+    """
+    value = " ".join(value.splitlines())
+    if value.isascii():
+        return value
+    words = []
+    current = b""
+    for char in value:
+        encoded = char.encode("utf-8")
+        if len(current) + len(encoded) > 45:
+            words.append(current)
+            current = b""
+        current += encoded
+    words.append(current)
+    return "\r\n ".join(f"=?utf-8?b?{base64.b64encode(word).decode()}?=" for word in words)
+
+
+class EmailTemplate:
+    """
+    Một template email đã được biên dịch sẵn cho một loại email và một ngôn ngữ.
+
+    Phần header cố định của thư MIME được dựng một lần; mỗi lần render chỉ còn
+    thay biến vào subject/body, mã hóa body và ghép vào skeleton.
+    """
+
+    def __init__(self, subject, body, sender, partials=None, defaults=None):
+        self._subject = _compile(subject)
+        self._body = _compile(body)
+        self._partials = {name: _compile(text) for name, text in (partials or {}).items()}
+        self._defaults = {name: html.escape(str(value)) for name, value in (defaults or {}).items()}
+        self._skeleton = (
+            f"From: {_encode_header(sender)}\r\n"
+            "MIME-Version: 1.0\r\n"
+            'Content-Type: text/html; charset="utf-8"\r\n'
+            "Content-Transfer-Encoding: base64\r\n"
+        ).encode()
+
+    def render(self, fields):
+        """
+        Render subject và nội dung HTML
+
+        Args:
+            fields (dict): Giá trị của các biến; giá trị None hoặc rỗng dùng giá trị mặc định
+        """
+        values = dict(self._defaults)
+        for name, value in fields.items():
+            if value is not None and value != "":
+                values[name] = html.escape(str(value))
+        for name, parts in self._partials.items():
+            # Khối tùy chọn chỉ hiển thị khi biến cùng tên (bỏ hậu tố _block) có giá trị
+            values[name] = _substitute(parts, values) if values.get(name[:-len("_block")]) else ""
+        return html.unescape(_substitute(self._subject, values)), _substitute(self._body, values)
+
+    def to_bytes(self, to, fields):
+        """
+        Render thư thành dạng RFC 2822 (dòng kết thúc bằng CRLF)
+        """
+        if to and any(char in to for char in "\r\n"):
+            raise ValueError(f"Invalid recipient address: {to!r}")
+        subject, body = self.render(fields)
+        headers = f"To: {_encode_header(to or '')}\r\nSubject: {_encode_header(subject)}\r\n\r\n".encode()
+        return self._skeleton + headers + base64.encodebytes(body.encode("utf-8")).replace(b"\n", b"\r\n")
+
+
+def _interview_fields(interview_data):
+    scheduled_date = interview_data.get("scheduled_date")
+    interview_type = interview_data.get("type")
+    try:
+        # scheduled_date đã là đối tượng datetime
+        formatted_date = scheduled_date.strftime("%d/%m/%Y")
+        formatted_time = scheduled_date.strftime("%H:%M")
+    except Exception:
+        formatted_date = str(scheduled_date)
+        formatted_time = ""
+    return interview_data.get("candidate_email"), {
+        "date": formatted_date,
+        "time": formatted_time,
+        "duration": interview_data.get("duration_minutes"),
+        "location": interview_data.get("location"),
+        "type": str(getattr(interview_type, "value", interview_type) or "").capitalize(),
+        "description": interview_data.get("description"),
+    }
+
+
+def _result_fields(output):
+    return output.get("candidate", {}).get("email"), {
+        "position": output.get("job", {}).get("title"),
+    }
+
+
+# Hàm trích xuất (người nhận, biến template) từ payload của từng loại email
+FIELD_EXTRACTORS = {
+    "interview": _interview_fields,
+    "acceptance": _result_fields,
+    "rejection": _result_fields,
+}
+
+
+class TemplateRegistry:
+    """
+    Tập các template đã biên dịch, tạo một lần khi khởi động ứng dụng
+    """
+
+    def __init__(self, templates=TEMPLATES, sender=DEFAULT_SENDER, default_locale=DEFAULT_LOCALE):
+        self.sender = sender
+        self.default_locale = default_locale
+        self._templates = {
+            (kind, locale): EmailTemplate(sender=sender, **spec)
+            for kind, locales in templates.items()
+            for locale, spec in locales.items()
+        }
+
+    def get(self, kind, locale=None):
+        template = self._templates.get((kind, locale or self.default_locale))
+        if template is None:
+            template = self._templates.get((kind, self.default_locale))
+        if template is None:
+            raise ValueError(f"Unknown email kind: {kind}")
+        return template
+
+    def render(self, kind, payload):
+        """
+        Tạo email dạng RFC 2822 từ payload
+
+        Returns:
+            tuple: (email người nhận, nội dung thư dạng bytes)
+        """
+        to, fields = FIELD_EXTRACTORS[kind](payload)
+        template = self.get(kind, payload.get("locale"))
+        return to, template.to_bytes(to, fields)
+
+    def build(self, kind, payload):
+        """
+        Tạo email từ payload cho Gmail API
+
+        Returns:
+            tuple: (email người nhận, body cho Gmail API)
+        """
+        to, message = self.render(kind, payload)
+        return to, {"raw": base64.urlsafe_b64encode(message).decode()}
+
+    def build_batch(self, kind, payloads):
+        """
+        Tạo nhiều email cùng loại
+
+        Returns:
+            list: Danh sách (email người nhận, body cho Gmail API)
+        """
+        return [self.build(kind, payload) for payload in payloads]
+
+
+templates = TemplateRegistry()
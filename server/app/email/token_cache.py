@@ -0,0 +1,119 @@
+import json
+import os
+import secrets
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows: không có file lock, mỗi process tự refresh token và tự giới hạn tốc độ
+    fcntl = None
+
+# Thư mục riêng của ứng dụng (quyền 0700), không dùng thư mục tạm chung của hệ thống: file
+# chứa access token và có tên cố định nên user khác không được đọc hay tạo trước được
+DEFAULT_TOKEN_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "recruitment"
+)
+DEFAULT_TOKEN_CACHE = os.path.join(DEFAULT_TOKEN_DIR, "gmail-token.json")
+
+# Không đi theo symlink khi mở file cache, lock và file tạm (không có trên Windows)
+O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+# Làm mới token sớm hơn thời điểm hết hạn một chút để tránh gửi với token sắp hết hạn
+EXPIRY_MARGIN = timedelta(seconds=60)
+
+
+def _ensure_directory(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if directory != DEFAULT_TOKEN_DIR or not hasattr(os, "getuid"):
+        return
+    # Thư mục mặc định phải là thư mục thật của user hiện tại, không ai khác truy cập được
+    info = os.lstat(directory)
+    if not os.path.isdir(directory) or os.path.islink(directory) or info.st_uid != os.getuid():
+        raise PermissionError(f"Token cache directory {directory} is not owned by the current user")
+    if info.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+
+
+@contextmanager
+def locked(path):
+    """
+    Khóa độc quyền (flock) giữa các process trên file ``<path>.lock``
+    """
+    _ensure_directory(path)
+    descriptor = os.open(path + ".lock", os.O_RDWR | os.O_CREAT | O_NOFOLLOW, 0o600)
+    with os.fdopen(descriptor, "r+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_json(path):
+    """
+    Nội dung file JSON, None nếu file chưa có, hỏng hoặc là symlink
+    """
+    try:
+        with os.fdopen(os.open(path, os.O_RDONLY | O_NOFOLLOW)) as json_file:
+            return json.load(json_file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    # File tạm mới (O_EXCL, quyền 0600) với tên không đoán trước được; os.replace thay chính
+    # đường dẫn, kể cả khi đó là symlink, chứ không ghi vào file mà symlink trỏ tới
+    tmp_path = f"{path}.{os.getpid()}.{secrets.token_hex(8)}.tmp"
+    descriptor = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | O_NOFOLLOW, 0o600)
+    try:
+        with os.fdopen(descriptor, "w") as json_file:
+            json.dump(data, json_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class TokenCache:
+    """
+    Cache OAuth access token trong một file dùng chung giữa các worker uvicorn.
+
+    File được khóa (flock) trong lúc đọc/làm mới nên khi token hết hạn chỉ có một
+    worker gọi tới Google để refresh, các worker còn lại đọc token mới từ file.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or DEFAULT_TOKEN_CACHE
+
+    def _read(self):
+        data = read_json(self.path)
+        try:
+            return data["token"], datetime.fromisoformat(data["expiry"])
+        except (ValueError, KeyError, TypeError):
+            return None, None
+
+    def _write(self, token, expiry):
+        write_json(self.path, {"token": token, "expiry": expiry.isoformat()})
+
+    def ensure_fresh(self, credentials, refresh):
+        """
+        Đảm bảo ``credentials`` có access token còn hạn
+
+        Args:
+            credentials: ``google.oauth2.credentials.Credentials`` cần cập nhật
+            refresh (callable): Hàm refresh token, chỉ được gọi khi cache cũng đã hết hạn
+        """
+        with locked(self.path):
+            token, expiry = self._read()
+            if token and expiry and expiry - EXPIRY_MARGIN > datetime.utcnow():
+                credentials.token = token
+                credentials.expiry = expiry
+                return
+            refresh(credentials)
+            if credentials.token and credentials.expiry:
+                self._write(credentials.token, credentials.expiry)
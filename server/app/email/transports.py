@@ -0,0 +1,215 @@
+import os
+import queue
+import smtplib
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from .templates import templates as default_templates
+
+
+class EmailTransport(ABC):
+    """
+    Giao diện chung của các backend gửi email.
+
+    ``send`` và ``send_bulk`` là hàm đồng bộ, được hàng đợi email gọi từ thread pool.
+    """
+
+    name = "base"
+
+    def __init__(self, templates=None):
+        self.templates = templates or default_templates
+
+    @abstractmethod
+    def send(self, kind, payload):
+        """
+        Gửi một email
+
+        Returns:
+            bool: True nếu gửi thành công
+        """
+
+    def send_bulk(self, messages, batch_size=50):
+        """
+        Gửi nhiều email (kind, payload), mặc định gửi lần lượt từng email
+
+        Returns:
+            list: Kết quả gửi (bool) theo đúng thứ tự của ``messages``
+        """
+        return [self.send(kind, payload) for kind, payload in messages]
+
+    def close(self):
+        pass
+
+
+class GmailTransport(EmailTransport):
+    """
+    Gửi email qua Gmail API, GmailClient chỉ được tạo ở lần gửi đầu tiên
+    """
+
+    name = "gmail"
+
+    def __init__(self, client_factory, templates=None):
+        super().__init__(templates)
+        self._client_factory = client_factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._client_factory()
+        return self._client
+
+    def send(self, kind, payload):
+        return self.client.send(kind, payload)
+
+    def send_bulk(self, messages, batch_size=50):
+        return self.client.send_bulk(messages, batch_size=batch_size)
+
+
+class SmtpTransport(EmailTransport):
+    """
+    Gửi email qua SMTP với một pool kết nối được giữ mở giữa các lần gửi.
+
+    Dùng được với server SMTP thật hoặc một server giả lập cục bộ như ``aiosmtpd``
+    (``python -m aiosmtpd -n -l localhost:8025``).
+    """
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        host,
+        port=25,
+        username=None,
+        password=None,
+        starttls=False,
+        pool_size=4,
+        timeout=30,
+        templates=None,
+    ):
+        super().__init__(templates)
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+        # Metrics
+        self.connections_opened = 0
+
+    def _connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password)
+        except Exception:
+            connection.close()
+            raise
+        self.connections_opened += 1
+        return connection
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            self._quit(connection)
+
+    @staticmethod
+    def _quit(connection):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    def _send_message(self, to, message):
+        connection = self._acquire()
+        try:
+            try:
+                connection.sendmail(self.templates.sender, [to], message)
+            except smtplib.SMTPServerDisconnected:
+                # Kết nối trong pool đã bị server đóng: mở kết nối mới và gửi lại một lần
+                connection.close()
+                connection = self._connect()
+                connection.sendmail(self.templates.sender, [to], message)
+        except Exception:
+            # Kể cả kết nối mới khi lần gửi lại thất bại
+            self._quit(connection)
+            raise
+        self._release(connection)
+
+    def send(self, kind, payload):
+        to = None
+        try:
+            to, message = self.templates.render(kind, payload)
+            self._send_message(to, message)
+            return True
+        except Exception as error:
+            print(f"❌ Lỗi khi gửi email {kind} đến {to} qua SMTP: {error}")
+            return False
+
+    def close(self):
+        while True:
+            try:
+                self._quit(self._pool.get_nowait())
+            except queue.Empty:
+                break
+
+
+class SpoolTransport(EmailTransport):
+    """
+    Ghi mỗi email thành một file ``.eml`` trong thư mục spool thay vì gửi đi
+    """
+
+    name = "spool"
+
+    def __init__(self, directory, templates=None):
+        super().__init__(templates)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, kind, payload):
+        try:
+            _, message = self.templates.render(kind, payload)
+            filename = f"{datetime.now():%Y%m%d%H%M%S%f}-{kind}-{uuid.uuid4().hex[:8]}.eml"
+            with open(os.path.join(self.directory, filename), "wb") as eml_file:
+                eml_file.write(message)
+            return True
+        except Exception as error:
+            print(f"❌ Lỗi khi ghi email {kind} vào spool: {error}")
+            return False
+
+
+def create_transport(name=None, gmail_factory=None):
+    """
+    Tạo backend gửi email theo biến môi trường ``EMAIL_TRANSPORT`` (gmail, smtp, spool)
+    """
+    name = (name or os.getenv("EMAIL_TRANSPORT") or "gmail").lower()
+    if name == "gmail":
+        return GmailTransport(gmail_factory)
+    if name == "smtp":
+        return SmtpTransport(
+            host=os.getenv("SMTP_HOST", "localhost"),
+            port=int(os.getenv("SMTP_PORT", "25")),
+            username=os.getenv("SMTP_USERNAME"),
+            password=os.getenv("SMTP_PASSWORD"),
+            starttls=os.getenv("SMTP_STARTTLS", "false").lower() == "true",
+            pool_size=int(os.getenv("SMTP_POOL_SIZE", "4")),
+        )
+    if name == "spool":
+        return SpoolTransport(os.getenv("EMAIL_SPOOL_DIR", "email_spool"))
+    raise ValueError(f"Unknown email transport: {name}")
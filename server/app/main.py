@@ -1,16 +1,41 @@
+import asyncio
 import os
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
-from .db.database import init_db
-from .routes import analysis, candidates, jobs, interviews, dashboard
+from .db.database import async_db, init_db_until_ready, db_status, ping_latency, metrics as db_metrics
+from .search import ngram
+from .search.facets import candidate_facet_cache
+from .search.skills import skill_dictionary
+from .search.suggest import suggestions
+from .email.email import email_queue, email_dispatcher, transport as email_transport
+from .routes import analysis, candidates, jobs, interviews, dashboard, suggest
+
+# Thời điểm process bắt đầu nạp ứng dụng, dùng để đo thời gian cold start
+STARTED_AT = time.perf_counter()
+
+# Số giây startup chờ database trước khi nhận request; quá thời gian thì tiếp tục khởi tạo ở nền
+DB_STARTUP_TIMEOUT = float(os.getenv("DB_STARTUP_TIMEOUT", "10"))
+
+# Chu kỳ (giây) dựng lại index tìm kiếm/gợi ý trong bộ nhớ để thấy dữ liệu do worker khác
+# ghi; 0 để chỉ nạp một lần khi khởi động
+SEARCH_INDEX_REFRESH_SECONDS = float(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300"))
+
+# Thời gian cold start (giây) tới khi hoàn tất startup và tới request thành công đầu tiên
+cold_start = {"startup_seconds": None, "first_request_seconds": None}
+db_init_task = None
+search_index_task = None
 
 # Create FastAPI app
 app = FastAPI(
     title="Recruitment Management API",
     description="API for managing recruitment processes",
     version="1.0.0",
-    redirect_slashes=False
+    redirect_slashes=False,
+    # Mã hóa response bằng orjson thay cho json của thư viện chuẩn
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -30,6 +55,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -38,17 +64,94 @@ app.include_router(candidates.router, prefix="/api/v1")
 app.include_router(jobs.router, prefix="/api/v1")
 app.include_router(interviews.router, prefix="/api/v1")
 app.include_router(dashboard.router, prefix="/api/v1")
+app.include_router(suggest.router, prefix="/api/v1")
+
+
+@app.middleware("http")
+async def measure_first_request(request: Request, call_next):
+    response = await call_next(request)
+    if cold_start["first_request_seconds"] is None and response.status_code < 400:
+        cold_start["first_request_seconds"] = round(time.perf_counter() - STARTED_AT, 3)
+        print(f"First successful request {cold_start['first_request_seconds']}s after start")
+    return response
+
+
+async def load_search_indexes():
+    await db_init_task
+    while True:
+        # Mỗi index được dựng mới rồi thay một lần nên route vẫn dùng index cũ trong lúc nạp lại
+        try:
+            await ngram.load_ngram_indexes(async_db)
+            await suggestions.load(async_db)
+            await skill_dictionary.load(async_db.candidates)
+        except Exception as e:
+            print(f"Error loading search indexes: {e}")
+        if SEARCH_INDEX_REFRESH_SECONDS <= 0:
+            return
+        await asyncio.sleep(SEARCH_INDEX_REFRESH_SECONDS)
+
 
 # Startup event
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    global db_init_task, search_index_task
+    # Khởi tạo database không chặn startup quá DB_STARTUP_TIMEOUT: nếu MongoDB chưa sẵn sàng,
+    # task tiếp tục thử lại ở nền và /health báo "starting" cho tới khi xong
+    db_init_task = asyncio.create_task(init_db_until_ready(), name="init-db")
+    await asyncio.wait({db_init_task}, timeout=DB_STARTUP_TIMEOUT)
+    # Index tìm kiếm và gợi ý trong bộ nhớ được nạp ở nền rồi dựng lại định kỳ; trong lần nạp
+    # đầu search_mode=fuzzy dùng regex và /suggest trả về 503
+    search_index_task = asyncio.create_task(load_search_indexes(), name="load-search-indexes")
+    await email_queue.start()
+    await email_dispatcher.start()
+    cold_start["startup_seconds"] = round(time.perf_counter() - STARTED_AT, 3)
+
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in (db_init_task, search_index_task):
+        if task is not None and not task.done():
+            task.cancel()
+    await email_dispatcher.stop()
+    await email_queue.stop()
+    email_transport.close()
 
 
 # Health check endpoint
 @app.get("/health", tags=["health"])
 async def health_check():
-    return {"status": "ok", "message": "API is running"}
+    latency = await ping_latency() if db_status["ready"] else None
+    ready = db_status["ready"] and latency is not None
+    if ready:
+        state, message = "ok", "API is running"
+    elif db_status["ready"]:
+        state, message = "degraded", "Database is unreachable"
+    else:
+        state, message = "starting", "Database is not ready"
+    body = {
+        "status": state,
+        "message": message,
+        "database": {**db_status, "latency_ms": latency},
+        "cold_start": cold_start,
+    }
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+
+# Metrics endpoint
+@app.get("/metrics", tags=["health"])
+async def metrics():
+    return {
+        "cold_start": cold_start,
+        "mongodb": db_metrics(),
+        "search_index": ngram.metrics(),
+        "suggest": suggestions.metrics(),
+        "facet_cache": candidate_facet_cache.metrics(),
+        "skills": skill_dictionary.metrics(),
+        "email_transport": email_transport.name,
+        "email": email_queue.metrics(),
+        "email_outbox": email_dispatcher.metrics(),
+    }
 
 
 # Root endpoint 
@@ -1,9 +1,13 @@
 from pydantic import BaseModel, EmailStr, Field, HttpUrl
 from typing import Optional, List
 from datetime import datetime
-from enum import Enum
 
-class CandidateStatus(str, Enum):
+from .enums import CaseInsensitiveEnum
+from .ids import new_id
+from ..db.migrations import candidates as _migrations  # noqa: F401 - đăng ký migration
+from ..db.migrations.runner import latest_version
+
+class CandidateStatus(CaseInsensitiveEnum):
     NEW = "new"
     SCREENING = "screening"
     INTERVIEW = "interview"
@@ -87,11 +91,13 @@ class CandidateUpdate(BaseModel):
 
 
 class CandidateInDB(CandidateBase):
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     applied_date: datetime = Field(default_factory=datetime.now)
     assigned_recruiter: Optional[str] = None  # Foreign key to User model
+    # Phiên bản schema của tài liệu: phiên bản của migration mới nhất trong app/db/migrations/candidates.py
+    schema_version: int = Field(default_factory=lambda: latest_version("candidates"))
 
 
 class Candidate(CandidateBase):
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class CaseInsensitiveEnum(str, Enum):
+    """
+    Enum chuỗi nhận giá trị không phân biệt hoa thường ("New", "NEW" -> "new"),
+    nên dữ liệu luôn được ghi xuống database ở dạng chữ thường
+    """
+
+    @classmethod
+    def _missing_(cls, value):
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            for member in cls:
+                if member.value == lowered:
+                    return member
+        return None
@@ -0,0 +1,52 @@
+import base64
+import struct
+from datetime import datetime, timezone
+
+from bson import ObjectId
+
+# Độ dài của một id: 12 byte ObjectId mã hóa base32hex (bỏ padding)
+ID_LENGTH = 20
+
+
+def _encode(raw):
+    # base32hex giữ nguyên thứ tự byte nên id so sánh chuỗi theo đúng thứ tự thời gian tạo
+    return base64.b32hexencode(raw).decode("ascii").rstrip("=").lower()
+
+
+def new_id(created_at=None):
+    """
+    Tạo id mới cho tài liệu, sắp xếp được theo thời gian tạo.
+
+    Dựa trên ObjectId (4 byte thời gian, 5 byte ngẫu nhiên theo process, 3 byte bộ đếm)
+    nên không trùng giữa các worker và tăng dần trong cùng một process.
+
+    Args:
+        created_at (datetime): Thời điểm tạo tài liệu, dùng khi chuyển id của dữ liệu cũ
+    """
+    raw = ObjectId().binary
+    if created_at is not None:
+        if created_at.tzinfo is None:
+            created_at = created_at.astimezone()
+        raw = struct.pack(">I", int(created_at.timestamp())) + raw[4:]
+    return _encode(raw)
+
+
+def is_new_id(value):
+    """
+    Kiểm tra ``value`` có phải id theo định dạng hiện tại không (id cũ là timestamp dạng số thực)
+    """
+    if not isinstance(value, str) or len(value) != ID_LENGTH:
+        return False
+    try:
+        base64.b32hexdecode(value.upper() + "====")
+    except ValueError:
+        return False
+    return True
+
+
+def id_created_at(value):
+    """
+    Thời điểm tạo (UTC) được mã hóa trong id
+    """
+    raw = base64.b32hexdecode(value.upper() + "====")
+    return datetime.fromtimestamp(struct.unpack(">I", raw[:4])[0], tz=timezone.utc)
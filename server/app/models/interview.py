@@ -3,8 +3,13 @@ from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 
+from .enums import CaseInsensitiveEnum
+from .ids import new_id
+from ..db.migrations import interviews as _migrations  # noqa: F401 - đăng ký migration
+from ..db.migrations.runner import latest_version
 
-class InterviewStatus(str, Enum):
+
+class InterviewStatus(CaseInsensitiveEnum):
     SCHEDULED = "scheduled"
     COMPLETED = "completed"
     CANCELLED = "cancelled"
@@ -59,14 +64,23 @@ class InterviewResult(BaseModel):
 
 
 class InterviewInDB(InterviewBase):
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     result: Optional[InterviewResult] = None
+    # Bản sao để hiển thị, xem app/db/snapshots.py
+    candidate_name: Optional[str] = None
+    job_title: Optional[str] = None
+    interviewer_name: Optional[str] = None
+    # Phiên bản schema của tài liệu: phiên bản của migration mới nhất trong app/db/migrations/interviews.py
+    schema_version: int = Field(default_factory=lambda: latest_version("interviews"))
 
 
 class Interview(InterviewBase):
     id: str
     created_at: datetime
     updated_at: datetime
-    result: Optional[InterviewResult] = None 
\ No newline at end of file
+    result: Optional[InterviewResult] = None
+    candidate_name: Optional[str] = None
+    job_title: Optional[str] = None
+    interviewer_name: Optional[str] = None 
\ No newline at end of file
@@ -3,6 +3,11 @@ from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 
+from .enums import CaseInsensitiveEnum
+from .ids import new_id
+from ..db.migrations import jobs as _migrations  # noqa: F401 - đăng ký migration
+from ..db.migrations.runner import latest_version
+
 
 class EvaluationCriterion(BaseModel):
     description: str
@@ -14,7 +19,7 @@ class EvaluationSection(BaseModel):
     criteria: List[EvaluationCriterion]
 
 
-class JobStatus(str, Enum):
+class JobStatus(CaseInsensitiveEnum):
     DRAFT = "draft"
     OPEN = "open"
     CLOSED = "closed"
@@ -73,13 +78,15 @@ class JobUpdate(BaseModel):
 
 
 class JobInDB(JobBase):
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     posted_date: Optional[datetime] = None
     closed_date: Optional[datetime] = None
     applicants: int = 0
     interviews: int = 0
+    # Phiên bản schema của tài liệu: phiên bản của migration mới nhất trong app/db/migrations/jobs.py
+    schema_version: int = Field(default_factory=lambda: latest_version("jobs"))
 
 
 class Job(JobBase):
@@ -0,0 +1,19 @@
+from typing import Dict, Generic, List, Optional, TypeVar, Union
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class FacetCount(BaseModel):
+    value: Optional[Union[str, int, float]] = None  # None: tài liệu không có trường này
+    count: int
+
+
+class FacetedPage(Page[T], Generic[T]):
+    facets: Dict[str, List[FacetCount]]
@@ -0,0 +1,15 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class SuggestField(str, Enum):
+    NAME = "name"
+    TITLE = "title"
+    SKILL = "skill"
+    DEPARTMENT = "department"
+
+
+class Suggestion(BaseModel):
+    value: str
+    count: int  # Số ứng viên/công việc có giá trị này
@@ -3,6 +3,8 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field, EmailStr
 
+from .ids import new_id
+
 class UserRole(str, Enum):
     ADMIN = "admin"
     HR = "hr"
@@ -33,7 +35,7 @@ class UserUpdate(BaseModel):
     phone: Optional[str] = None
 
 class UserInDB(UserBase):
-    id: str = Field(default_factory=lambda: str(datetime.now().timestamp()))
+    id: str = Field(default_factory=new_id)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     hashed_password: str
@@ -2,22 +2,28 @@ from fastapi import APIRouter, HTTPException, Query, status
 from typing import List, Optional
 
 from ..db.database import jobs_collection, candidates_collection
+from ..db.indexes import index, register_indexes
+from ..models.candidate import CandidateStatus
+from ..models.job import JobStatus
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
+# Ứng viên mới theo công việc (/data, /new_candidates)
+register_indexes("candidates", index("job_id", "status"))
+register_indexes("jobs", index("status"))
+
 @router.get("/data", response_model=list)
 async def get_data():
     pipeline = [
-        {"$match": {"status": "open"}},
+        {"$match": {"status": JobStatus.OPEN.value}},
         {"$lookup": {
             "from": "candidates",
               "let": {"jobId": "$id"},
             "pipeline": [
+                # status được chuẩn hóa chữ thường khi ghi nên so sánh bằng trực tiếp dùng được index
                 {"$match": {
-                    "$expr": {"$and": [
-                        {"$eq": ["$job_id", "$$jobId"]},
-                        {"$eq": [{ "$toLower": "$status" }, "new" ]}
-                    ]}
+                    "$expr": {"$eq": ["$job_id", "$$jobId"]},
+                    "status": CandidateStatus.NEW.value
                 }},
                 {"$project": {"_id": 0}}
             ],
@@ -57,36 +63,11 @@ async def get_data():
 
 @router.get("/new_candidates")
 async def get_new_candidates(job_id: str):
-    pipeline = [
-        {
-            "$match": {
-                "$expr": {
-                    "$and": [
-                        {"$eq": ["$job_id", job_id]},
-                        {"$eq": [{"$toLower": "$status"}, "new"]}
-                    ]
-                }
-            }
-        },
-        {
-            "$group": {
-                "_id": "$job_id",
-                "candidates": {"$push": "$$ROOT"}
-            }
-        }
-    ]
-
-    jobs_with_candidates = candidates_collection.aggregate(pipeline)
-    grouped_result = await jobs_with_candidates.to_list(length=1)
-
-    if not grouped_result:
-        return []
-
-    candidates = grouped_result[0]["candidates"]
-
-    # Loại bỏ ObjectId trong từng candidate
-    for c in candidates:
-        c.pop("_id", None)
+    candidates = candidates_collection.find(
+        {"job_id": job_id, "status": CandidateStatus.NEW.value},
+        {"_id": 0}
+    )
+    candidates = await candidates.to_list(length=None)
 
     return candidates
 
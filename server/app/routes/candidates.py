@@ -1,15 +1,43 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional, Union
 #from ..email.sendemail import GmailClient
-from ..email.email import send_interview_email, send_rejection_email, send_acceptance_email
-from ..db.database import candidates_collection, interviews_collection, jobs_collection
+from ..email.email import (
+    send_interview_email,
+    send_rejection_email,
+    send_acceptance_email,
+    cancel_pending_emails,
+    RESULT_KINDS,
+)
+from ..db.database import candidates_collection, interviews_collection, jobs_collection, transaction
+from ..db.indexes import index, register_indexes
+from ..db.repository import candidates_repository, interviews_repository, jobs_repository
+from ..db.snapshots import (
+    CANDIDATE_SNAPSHOT,
+    JOB_SNAPSHOT,
+    interviewer_snapshot,
+    propagate,
+    snapshot,
+    source_projection,
+)
+from ..models.page import FacetedPage, Page
+from .pagination import DEFAULT_SORT, PageParams, find_page, find_page_with_facets, find_ranked
+from .projection import ProjectionParams, mongo_projection, view_model
+from .responses import list_response
+from ..search.facets import CANDIDATE_FACETS, candidate_facet_cache, count_facets
+from ..search.ngram import candidate_ngrams
+from ..search.suggest import suggestions
+from ..search.query import CANDIDATE_TEXT_WEIGHTS, SearchMode, merge_filter, prefix_index, search_query, search_sort, text_index
+from ..search.skills import SKILLS_FIELD, skill_dictionary, skill_tokens, skills_query
+from ..search.terms import CANDIDATE_SEARCH_FIELDS, TERMS_FIELD, search_changes, search_terms, search_update
 from ..models.candidate import (
     Candidate, 
     CandidateCreate, 
     CandidateInDB, 
     CandidateSearchParams, 
     CandidateUpdate,
+    CandidateStatus,
 )
+import asyncio
 import json
 import urllib.parse
 from datetime import datetime
@@ -18,76 +46,82 @@ from ..models.interview import Interview, InterviewCreate, InterviewInDB
 
 router = APIRouter(prefix="/candidates", tags=["candidates"])
 
-def transform_candidate_data(candidate):
-    """
-    Transform MongoDB candidate document to match Pydantic model requirements
-    """
-    if not candidate:
-        return None
-        
-    # Create a copy to avoid modifying the original
-    candidate = dict(candidate)
-    
-    # Convert MongoDB _id to string id if not present
-    if "_id" in candidate and "id" not in candidate:
-        candidate["id"] = str(candidate["_id"])
-    
-    # Ensure status is lowercase to match enum
-    if "status" in candidate and candidate["status"] == "New":
-        candidate["status"] = "new"
-        
-    # Set default values for required fields if missing
-    if "phone" not in candidate:
-        candidate["phone"] = "Not provided"
-        
-    if "department" not in candidate:
-        candidate["department"] = "Not specified"
-        
-    if "experience" not in candidate:
-        candidate["experience"] = 0
-        
-    if "sex" not in candidate:
-        candidate["sex"] = None
-        
-    # Add timestamps if missing
-    now = datetime.now()
-    if "created_at" not in candidate:
-        candidate["created_at"] = now
-        
-    if "updated_at" not in candidate:
-        candidate["updated_at"] = now
-        
-    if "applied_date" not in candidate:
-        candidate["applied_date"] = now
-    
-    return candidate
+# Bộ lọc của danh sách ứng viên và phỏng vấn của một ứng viên
+# (trường lọc, id): lọc rồi đi theo thứ tự id của phân trang keyset trên cùng một index
+register_indexes("candidates", index("status", "id"), index("department", "id"), index("name"))
+register_indexes("candidates", prefix_index(), text_index(CANDIDATE_TEXT_WEIGHTS, "candidates_text"))
+register_indexes("candidates", index(SKILLS_FIELD))
+register_indexes("interviews", index("candidate_id", "id"))
+
+# Các cột của bảng ứng viên (view=summary)
+CANDIDATE_SUMMARY_FIELDS = (
+    "name", "email", "phone", "status", "job_id", "department", "position",
+    "experience", "source", "total_score", "applied_date", "assigned_recruiter",
+)
 
 
 # Thêm route xử lý gốc để tránh redirect
-@router.get("", response_model=List[Candidate])
+@router.get("", response_model=Union[List[Candidate], FacetedPage[Candidate], Page[Candidate]])
 async def get_candidates_no_slash(
-    status: Optional[str] = None,
+    status: Optional[CandidateStatus] = None,
     department: Optional[str] = None,
     search: Optional[str] = None,
+    search_mode: SearchMode = SearchMode.PREFIX,
+    skills_all: Optional[str] = Query(None, description="Comma-separated skills the candidate must all have"),
+    skills_any: Optional[str] = Query(None, description="Comma-separated skills, at least one required"),
+    skills_none: Optional[str] = Query(None, description="Comma-separated skills the candidate must not have"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    page: PageParams = Depends(),
+    facets: bool = False,
+    projection: ProjectionParams = Depends(),
 ):
     """
     Get all candidates with optional filtering (no trailing slash)
     """
-    return await get_candidates(status, department, search, skip, limit)
+    return await get_candidates(
+        status, department, search, search_mode, skills_all, skills_any, skills_none, skip, limit, page, facets,
+        projection,
+    )
 
 
-@router.get("/", response_model=List[Candidate])
+@router.get("/", response_model=Union[List[Candidate], FacetedPage[Candidate], Page[Candidate]])
 async def get_candidates(
-    status: Optional[str] = None,
+    status: Optional[CandidateStatus] = None,
     department: Optional[str] = None,
     search: Optional[str] = None,
+    search_mode: SearchMode = SearchMode.PREFIX,
+    skills_all: Optional[str] = Query(None, description="Comma-separated skills the candidate must all have"),
+    skills_any: Optional[str] = Query(None, description="Comma-separated skills, at least one required"),
+    skills_none: Optional[str] = Query(None, description="Comma-separated skills the candidate must not have"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    page: PageParams = Depends(),
+    facets: bool = False,
+    projection: ProjectionParams = Depends(),
 ):
     """
-    Get all candidates with optional filtering
+    Get all candidates with optional filtering.
+
+    Pass ``cursor`` (empty for the first page) to page with ``next_cursor``
+    instead of ``skip``; ``page_size`` overrides ``limit``.
+
+    ``search_mode`` selects how ``search`` matches: ``prefix`` (word prefixes of
+    name, email and position), ``text`` (weighted full-text search ordered by
+    relevance), ``fuzzy`` (accent-insensitive substring and typo-tolerant match
+    on name, email, phone and position, ordered by relevance) or ``regex``
+    (substring scan). ``text`` and ``fuzzy`` results are paged with ``skip``.
+
+    ``skills_all``, ``skills_any`` and ``skills_none`` take comma-separated
+    skills, matched case- and accent-insensitively with common synonyms
+    ("js" = "javascript").
+
+    ``facets=true`` returns ``{"items", "next_cursor", "facets"}`` with counts by
+    status, department, source, job_id and experience bucket over the whole
+    filtered set, computed in the same aggregation as the page.
+
+    ``fields`` (comma-separated) or ``view=summary`` return only those fields,
+    projected in MongoDB; ``id`` is always included.
     """
     # Build the filter query
     query = {}
@@ -98,65 +132,77 @@ async def get_candidates(
     if department:
         query["department"] = department
         
-    if search:
-        search_lower = search.lower()
-        query["$or"] = [
-            {"name": {"$regex": search_lower, "$options": "i"}},
-            {"email": {"$regex": search_lower, "$options": "i"}},
-            {"position": {"$regex": search_lower, "$options": "i"}},
-        ]
-    
-    # Fetch candidates
-    candidates = candidates_collection.find(query).skip(skip).limit(limit)
-    candidates = await candidates.to_list(length=limit)
+    # Kỹ năng được so khớp sau khi chuẩn hóa ("JS" = "javascript")
+    merge_filter(query, skills_query(skills_all, skills_any, skills_none))
+        
+    # Facet được cache theo bộ lọc (không phụ thuộc trang)
+    facet_key = {"query": dict(query), "search": search, "search_mode": search_mode}
+    facet_counts = candidate_facet_cache.get(facet_key) if facets else None
+    compute_facets = facets and facet_counts is None
     
-    # Transform data to match Pydantic model
-    transformed_candidates = [transform_candidate_data(candidate) for candidate in candidates]
+    fields = projection.resolve(Candidate, CANDIDATE_SUMMARY_FIELDS)
     
-    return transformed_candidates
+    # Fetch candidates
+    if search and search_mode == SearchMode.FUZZY and candidate_ngrams.ready:
+        ranked_ids = candidate_ngrams.search(search)
+        candidates, next_cursor = await find_ranked(
+            candidates_collection, query, ranked_ids, page, skip, limit, mongo_projection(fields)
+        )
+        if compute_facets:
+            facet_counts = await count_facets(candidates_collection, {**query, "id": {"$in": ranked_ids}})
+    else:
+        sort = DEFAULT_SORT
+        if search:
+            merge_filter(query, search_query(search, search_mode, CANDIDATE_SEARCH_FIELDS))
+            sort = search_sort(search_mode, sort)
+        if compute_facets:
+            candidates, next_cursor, facet_counts = await find_page_with_facets(
+                candidates_collection, query, page, CANDIDATE_FACETS, sort, skip, limit, mongo_projection(fields, sort)
+            )
+        else:
+            candidates, next_cursor = await find_page(
+                candidates_collection, query, page, sort, skip=skip, limit=limit, projection=mongo_projection(fields, sort)
+            )
+    
+    if compute_facets:
+        candidate_facet_cache.put(facet_key, facet_counts)
+    
+    extra = {"facets": facet_counts} if facets else None
+    return list_response(candidates, next_cursor, page, view_model(Candidate, fields), extra)
 
 @router.post("/interviews", response_model=Interview, status_code=status.HTTP_201_CREATED)
 async def create_interview(
     interview_data: InterviewCreate,
 ):
-    send_interview_email(interview_data.dict())
     """
     Schedule a new interview
     """
     print("interview_data", interview_data)   
     # Check if candidate exists
-    candidate = await candidates_collection.find_one({"id": interview_data.candidate_id})
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Candidate with ID {interview_data.candidate_id} not found",
-        )
-    
-    # Check if job exists
-    job = await jobs_collection.find_one({"id": interview_data.job_id})
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job with ID {interview_data.job_id} not found",
-        )
+    candidate, interviewer = await asyncio.gather(
+        candidates_repository.get(interview_data.candidate_id, source_projection(CANDIDATE_SNAPSHOT)),
+        interviewer_snapshot(interview_data.interviewer_id),
+    )
     
     # Create new interview
-    interview_in_db = InterviewInDB(**interview_data.dict())
+    interview_in_db = InterviewInDB(**interview_data.dict(), **interviewer)
     new_interview = interview_in_db.dict()
+    new_interview["candidate_name"] = candidate.get("name")
+    if not new_interview.get("candidate_email"):
+        new_interview["candidate_email"] = candidate.get("email")
+    
+    async with transaction() as session:
+        # Update job interviews count (404 if the job does not exist)
+        job = await jobs_repository.update(interview_data.job_id, {"$inc": {"interviews": 1}}, session=session)
+        new_interview.update(snapshot(JOB_SNAPSHOT, job))
+        
+        # Insert into database
+        await interviews_repository.insert(new_interview, session=session)
+        
+        # Queue the invitation email in the outbox
+        await send_interview_email(new_interview, session=session)
     
-    # Insert into database
-    result = await interviews_collection.insert_one(new_interview)
-    
-    # Get created interview
-    created_interview = await interviews_collection.find_one({"_id": result.inserted_id})
-    
-    # Update job interviews count
-    await jobs_collection.update_one(
-        {"id": interview_data.job_id},
-        {"$inc": {"interviews": 1}}
-    )
-    
-    return created_interview
+    return new_interview
 
 
 @router.post("/", response_model=Candidate, status_code=status.HTTP_201_CREATED)
@@ -166,20 +212,19 @@ async def create_candidate(
     """
     Create a new candidate
     """
-    # Check if candidate with email already exists
-    existing_candidate = await candidates_collection.find_one({"email": candidate_data.email})
-    if existing_candidate:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Candidate with email {candidate_data.email} already exists",
-        )
-    
     # Create new candidate
     candidate_in_db = CandidateInDB(**candidate_data.dict())
     new_candidate = candidate_in_db.dict()
+    new_candidate[TERMS_FIELD] = search_terms(new_candidate, CANDIDATE_SEARCH_FIELDS)
+    new_candidate[SKILLS_FIELD] = skill_tokens(new_candidate.get("skills"))
     
-    # Insert into database
-    result = await candidates_collection.insert_one(new_candidate)
+    # Insert into database (a duplicate email is rejected by the unique index)
+    await candidates_repository.insert(new_candidate)
+    candidate_facet_cache.invalidate()
+
+    candidate_ngrams.add(new_candidate)
+    skill_dictionary.add(new_candidate[SKILLS_FIELD])
+    suggestions.add("candidates", new_candidate)
 
     # Update job applicants count
     if hasattr(candidate_data, 'job_id') and candidate_data.job_id:
@@ -188,13 +233,7 @@ async def create_candidate(
             {"$inc": {"applicants": 1}}
         )
     
-    # Get created candidate
-    created_candidate = await candidates_collection.find_one({"_id": result.inserted_id})
-    
-    # Transform the candidate data
-    transformed_candidate = transform_candidate_data(created_candidate)
-    
-    return transformed_candidate
+    return new_candidate
 
 
 @router.get("/{candidate_id}", response_model=Candidate)
@@ -212,10 +251,7 @@ async def get_candidate(
             detail=f"Candidate with ID {candidate_id} not found",
         )
     
-    # Transform the candidate data
-    transformed_candidate = transform_candidate_data(candidate)
-    
-    return transformed_candidate
+    return candidate
 
 
 @router.put("/{candidate_id}", response_model=Candidate)
@@ -226,36 +262,39 @@ async def update_candidate(
     """
     Update a candidate
     """
-    # Check if candidate exists
-    candidate = await candidates_collection.find_one({"id": candidate_id})
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Candidate with ID {candidate_id} not found",
-        )
-    
     # Filter out None values from update data
     update_data = {k: v for k, v in candidate_data.dict().items() if v is not None}
     
     if not update_data:
-        return transform_candidate_data(candidate)
+        return await candidates_repository.get(candidate_id)
     
     # Add updated timestamp
     update_data["updated_at"] = datetime.now()
-    
-    # Update candidate
-    await candidates_collection.update_one(
-        {"id": candidate_id},
-        {"$set": update_data}
-    )
-    
-    # Get updated candidate
-    updated_candidate = await candidates_collection.find_one({"id": candidate_id})
-    
-    # Transform the candidate data
-    transformed_candidate = transform_candidate_data(updated_candidate)
-    
-    return transformed_candidate
+
+    terms = search_update(update_data, CANDIDATE_SEARCH_FIELDS)
+    if terms is not None:
+        update_data[TERMS_FIELD] = terms
+    if "skills" in update_data:
+        update_data[SKILLS_FIELD] = skill_tokens(update_data["skills"])
+    
+    # Update candidate (404 if it does not exist, 400 on a duplicate email)
+    candidate, updated_candidate = await candidates_repository.set(candidate_id, update_data)
+    candidate_facet_cache.invalidate()
+    
+    # Copy a new name or email to the snapshots on the candidate's interviews
+    await propagate("candidates", candidate, updated_candidate)
+    
+    # Only some search fields changed: search_terms needs the current values of the others
+    terms = search_changes(candidate, update_data, CANDIDATE_SEARCH_FIELDS)
+    if terms is not None and terms != updated_candidate.get(TERMS_FIELD):
+        await candidates_collection.update_one({"id": candidate_id}, {"$set": {TERMS_FIELD: terms}})
+        updated_candidate[TERMS_FIELD] = terms
+    
+    candidate_ngrams.add(updated_candidate)
+    suggestions.update("candidates", candidate, updated_candidate)
+    skill_dictionary.update(candidate.get(SKILLS_FIELD, []), updated_candidate.get(SKILLS_FIELD, []))
+    
+    return updated_candidate
 
 
 @router.delete("/{candidate_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -265,24 +304,21 @@ async def delete_candidate(
     """
     Delete a candidate
     """
-    # Check if candidate exists
-    candidate = await candidates_collection.find_one({"id": candidate_id})
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Candidate with ID {candidate_id} not found",
-        )
-    
-    # Get the job_id before deleting the candidate
-    job_id = candidate.get("job_id")
-    
     # Delete the candidate
-    await candidates_collection.delete_one({"id": candidate_id})
+    candidate = await candidates_repository.delete(candidate_id)
+    candidate_facet_cache.invalidate()
+    candidate_ngrams.remove(candidate_id)
+    suggestions.remove("candidates", candidate)
+    skill_dictionary.remove(candidate.get(SKILLS_FIELD, []))
     
     # Delete associated interviews
     await interviews_collection.delete_many({"candidate_id": candidate_id})
     
+    # Drop emails that have not been sent yet
+    await cancel_pending_emails(candidate_id)
+    
     # If the candidate was associated with a job, decrease its applications count
+    job_id = candidate.get("job_id")
     if job_id:
         await jobs_collection.update_one(
             {"id": job_id},
@@ -292,67 +328,62 @@ async def delete_candidate(
     return None
 
 
-@router.patch("/{candidate_id}/status", response_model=Candidate)
-async def update_candidate_status(
-    candidate_id: str,
-    status: str,
-):
+async def result_email_payload(candidate, session=None):
     """
-    Update a candidate's status
+    Email payload with job and candidate email
     """
-    # Check if candidate exists
-    candidate = await candidates_collection.find_one({"id": candidate_id})
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Candidate with ID {candidate_id} not found",
-        )
-    
-    # Update status
-    await candidates_collection.update_one(
-        {"id": candidate_id},
-        {"$set": {"status": status, "updated_at": datetime.now()}}
-    )
-    
-    # Get updated candidate
-    updated_candidate = await candidates_collection.find_one({"id": candidate_id})
-
-    # Get the candidate's email
-    candidate_email = updated_candidate.get("email", "Unknown")
-
-    # Get job information
-    job = await jobs_collection.find_one({"id": updated_candidate["job_id"]})
+    job = await jobs_collection.find_one({"id": candidate["job_id"]}, {"title": 1}, session=session)
     job_title = "Unknown"
     
     if job:
         job_title = job.get("title", "Unknown")
     else:
-        print(f"Job with ID {updated_candidate['job_id']} not found")
+        print(f"Job with ID {candidate['job_id']} not found")
 
-    # Print JSON output with job and candidate email
-    output = {
+    return {
         "job": {
+            "id": candidate["job_id"],
             "title": job_title
         },
         "candidate": {
-            "email": candidate_email
+            "email": candidate.get("email", "Unknown")
         }
     }
-    
-    if (status =='hired'):
-        send_acceptance_email(output)
-    if (status =='rejected'):
-        send_rejection_email(output)
-        
-    # Transform the candidate data
-    transformed_candidate = transform_candidate_data(updated_candidate)
 
-    return transformed_candidate
+
+@router.patch("/{candidate_id}/status", response_model=Candidate)
+async def update_candidate_status(
+    candidate_id: str,
+    new_status: CandidateStatus = Query(..., alias="status"),
+):
+    """
+    Update a candidate's status
+    """
+    async with transaction() as session:
+        # Update status
+        updated_candidate = await candidates_repository.update(
+            candidate_id,
+            {"$set": {"status": new_status, "updated_at": datetime.now()}},
+            session=session
+        )
+        
+        # Queue the result email in the outbox; any other status cancels a result
+        # email that has not been sent yet
+        if new_status == CandidateStatus.HIRED:
+            await send_acceptance_email(candidate_id, await result_email_payload(updated_candidate, session), session=session)
+        elif new_status == CandidateStatus.REJECTED:
+            await send_rejection_email(candidate_id, await result_email_payload(updated_candidate, session), session=session)
+        else:
+            await cancel_pending_emails(candidate_id, RESULT_KINDS, session=session)
+    candidate_facet_cache.invalidate()
+        
+    return updated_candidate
 
 
-@router.get("/{candidate_id}/interviews", response_model=List[Interview])
+@router.get("/{candidate_id}/interviews", response_model=Union[List[Interview], Page[Interview]])
 async def get_candidate_interviews(
     candidate_id: str,
+    page: PageParams = Depends(),
 ):
     """
     Get all interviews for a specific candidate
@@ -366,8 +397,7 @@ async def get_candidate_interviews(
         )
     
     # Get interviews
-    interviews = interviews_collection.find({"candidate_id": candidate_id})
-    interviews = await interviews.to_list(length=100)
+    interviews, next_cursor = await find_page(interviews_collection, {"candidate_id": candidate_id}, page)
     
     # Process interviews to ensure result field is properly structured
     for interview in interviews:
@@ -376,7 +406,7 @@ async def get_candidate_interviews(
             if isinstance(interview["result"], str) or not isinstance(interview["result"], dict):
                 interview["result"] = None
     
-    return interviews 
+    return list_response(interviews, next_cursor, page, Interview)
 
 async def get_candidate_email_by_id(candidate_id: str):
     """
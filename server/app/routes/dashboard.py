@@ -2,9 +2,15 @@ from fastapi import APIRouter, Query
 from datetime import datetime, timedelta
 
 from ..db.database import jobs_collection, candidates_collection, interviews_collection
+from ..db.indexes import index, register_indexes
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
+# $sort/$match theo created_at của thống kê, xu hướng và hoạt động gần đây
+register_indexes("jobs", index("created_at"), index("status", "created_at"))
+register_indexes("candidates", index("created_at"), index("status", "updated_at"))
+register_indexes("interviews", index("created_at"), index("scheduled_date", "status"))
+
 @router.get("", tags=["dashboard"])
 async def get_dashboard():
     """
@@ -36,7 +42,7 @@ async def get_stats(
                 "prevActiveJobs": [
                     {"$match": {
                         "created_at": {"$gte": previous_start, "$lt": previous_end},
-                        "status": "OPEN"
+                        "status": "open"
                     }},
                     {"$count": "count"}
                 ]
@@ -310,7 +316,7 @@ async def get_upcoming_interviews(
     now = datetime.now()
     end_date = now + timedelta(days=days)
     
-    # Aggregation pipeline để lấy phỏng vấn sắp tới và thông tin liên quan
+    # Aggregation pipeline để lấy phỏng vấn sắp tới
     pipeline = [
         # Lọc các phỏng vấn trong phạm vi ngày
         {"$match": {
@@ -321,53 +327,12 @@ async def get_upcoming_interviews(
         {"$sort": {"scheduled_date": 1}},
         # Giới hạn số lượng kết quả
         {"$limit": limit},
-        # Lookup thông tin ứng viên
-        {"$lookup": {
-            "from": "candidates",
-            "localField": "candidate_id",
-            "foreignField": "id",
-            "as": "candidate_info"
-        }},
-        # Lookup thông tin công việc
-        {"$lookup": {
-            "from": "jobs",
-            "localField": "job_id",
-            "foreignField": "id",
-            "as": "job_info"
-        }},
-        # Định dạng kết quả trả về
+        # Định dạng kết quả trả về (tên và tiêu đề là bản sao trên phỏng vấn, không cần $lookup)
         {"$project": {
             "_id": 0,
             "id": 1,
-            "candidateName": {
-                "$let": {
-                    "vars": {
-                        "candidate": {"$arrayElemAt": ["$candidate_info", 0]}
-                    },
-                    "in": {
-                        "$cond": {
-                            "if": {"$and": [
-                                {"$ifNull": ["$$candidate.first_name", ""]}, 
-                                {"$ifNull": ["$$candidate.last_name", ""]}
-                            ]},
-                            "then": {
-                                "$concat": [
-                                    {"$ifNull": ["$$candidate.first_name", ""]}, 
-                                    " ", 
-                                    {"$ifNull": ["$$candidate.last_name", ""]}
-                                ]
-                            },
-                            "else": {"$ifNull": ["$$candidate.name", "Unknown"]}
-                        }
-                    }
-                }
-            },
-            "jobTitle": {
-                "$ifNull": [
-                    {"$arrayElemAt": ["$job_info.title", 0]},
-                    "Unknown Position"
-                ]
-            },
+            "candidateName": {"$ifNull": ["$candidate_name", "Unknown"]},
+            "jobTitle": {"$ifNull": ["$job_title", "Unknown Position"]},
             "scheduledAt": {
                 "$cond": {
                     "if": "$scheduled_date",
@@ -445,33 +410,12 @@ async def get_recent_activity(
     interviews_pipeline = [
         {"$sort": {"created_at": -1}},
         {"$limit": limit},
-        {"$lookup": {
-            "from": "jobs",
-            "localField": "job_id",
-            "foreignField": "id",
-            "as": "job_info"
-        }},
-        {"$lookup": {
-            "from": "candidates",
-            "localField": "candidate_id",
-            "foreignField": "id",
-            "as": "candidate_info"
-        }},
+        # Tên ứng viên và tiêu đề công việc là bản sao trên phỏng vấn
         {"$project": {
             "type": {"$literal": "interview"},
-            "actor": {
-                "$ifNull": [
-                    {"$arrayElemAt": ["$candidate_info.name", 0]},
-                    "Unknown Candidate"
-                ]
-            },
+            "actor": {"$ifNull": ["$candidate_name", "Unknown Candidate"]},
             "action": {"$literal": "scheduled for"},
-            "target": {
-                "$ifNull": [
-                    {"$arrayElemAt": ["$job_info.title", 0]},
-                    "Unknown Position"
-                ]
-            },
+            "target": {"$ifNull": ["$job_title", "Unknown Position"]},
             "timestamp": {"$ifNull": ["$created_at", "$$NOW"]},
             "_id": 0,
             "id": {"$concat": ["interview_", {"$toString": "$id"}]}
@@ -1,41 +1,105 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import List, Optional
-from ..email.email import send_interview_email
-from ..db.database import interviews_collection, candidates_collection, jobs_collection
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional, Union
+from ..email.email import send_interview_email, cancel_pending_emails, INVITE_FIELDS
+from ..db.database import interviews_collection, candidates_collection, jobs_collection, transaction
+from ..db.indexes import index, register_indexes
+from ..db.loaders import Loaders
+from ..db.repository import candidates_repository, interviews_repository, jobs_repository
+from ..db.snapshots import (
+    CANDIDATE_SNAPSHOT,
+    JOB_SNAPSHOT,
+    interviewer_snapshot,
+    snapshot,
+    source_projection,
+)
+from ..models.page import Page
+from ..search.facets import candidate_facet_cache
+from .pagination import PageParams, page_stages, split_page
+from .projection import ProjectionParams, mongo_projection, partial_model
+from .responses import list_response
 from ..models.interview import (
     Interview, 
     InterviewCreate, 
     InterviewInDB, 
     InterviewUpdate,
-    InterviewResult
+    InterviewResult,
+    InterviewStatus,
 )
+import asyncio
 from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/interviews", tags=["interviews"])
 
+# Lịch phỏng vấn (today, upcoming, by-date) lọc theo khoảng ngày và trạng thái;
+# danh sách phỏng vấn lọc theo trạng thái / người phỏng vấn / công việc, phân trang theo id
+register_indexes(
+    "interviews",
+    index("scheduled_date", "status"),
+    index("status", "id"),
+    index("interviewer_id", "id"),
+    index("job_id"),
+    index("candidate_id"),
+)
+
+# Các cột của bảng lịch phỏng vấn (view=summary)
+INTERVIEW_SUMMARY_FIELDS = (
+    "candidate_id", "job_id", "interviewer_id", "scheduled_date", "duration_minutes", "status", "type",
+)
+
+# Kết quả cũ lưu dạng chuỗi được trả về là null
+RESULT_FIELD = {
+    "$cond": {
+        "if": {
+            "$or": [
+                {"$eq": [{"$type": "$result"}, "string"]},
+                {"$ne": [{"$type": "$result"}, "object"]}
+            ]
+        },
+        "then": None,
+        "else": "$result"
+    }
+}
+
+# Bản sao tên/tiêu đề (app/db/snapshots.py); phỏng vấn chưa được đối soát hiện nhãn mặc định
+DISPLAY_FIELDS = {
+    "candidate_name": {"$ifNull": ["$candidate_name", "Unknown Candidate"]},
+    "job_title": {"$ifNull": ["$job_title", "Unknown Position"]},
+    "interviewer_name": {"$ifNull": ["$interviewer_name", "Unknown Interviewer"]},
+}
+
 # Thêm route xử lý gốc để tránh redirect
-@router.get("", response_model=List[Interview])
+@router.get("", response_model=Union[List[Interview], Page[Interview]])
 async def get_interviews_no_slash(
-    status: Optional[str] = None,
+    status: Optional[InterviewStatus] = None,
     interviewer_id: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    page: PageParams = Depends(),
+    projection: ProjectionParams = Depends(),
 ):
     """
     Get all interviews with optional filtering (no trailing slash)
     """
-    return await get_interviews(status, interviewer_id, skip, limit)
+    return await get_interviews(status, interviewer_id, skip, limit, page, projection)
 
 
-@router.get("/", response_model=List[Interview])
+@router.get("/", response_model=Union[List[Interview], Page[Interview]])
 async def get_interviews(
-    status: Optional[str] = None,
+    status: Optional[InterviewStatus] = None,
     interviewer_id: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    page: PageParams = Depends(),
+    projection: ProjectionParams = Depends(),
 ):
     """
-    Get all interviews with optional filtering
+    Get all interviews with optional filtering.
+
+    Pass ``cursor`` (empty for the first page) to page with ``next_cursor``
+    instead of ``skip``; ``page_size`` overrides ``limit``.
+
+    ``fields`` (comma-separated) or ``view=summary`` return only those fields,
+    projected in MongoDB; ``id`` is always included.
     """
     # Build the filter query
     match_stage = {}
@@ -47,151 +111,98 @@ async def get_interviews(
     if interviewer_id:
         match_stage["interviewer_id"] = interviewer_id
     
-    # Create aggregation pipeline
-    pipeline = [
-        {"$match": match_stage},
-        {"$skip": skip},
-        {"$limit": limit},
-        # Join with candidates collection for candidate info
-        {
-            "$lookup": {
-                "from": "candidates",
-                "localField": "candidate_id",
-                "foreignField": "id",
-                "as": "candidate"
-            }
-        },
-        # Join with jobs collection for job info
-        {
-            "$lookup": {
-                "from": "jobs",
-                "localField": "job_id",
-                "foreignField": "id",
-                "as": "job"
-            }
-        },
-        # Join with candidates collection again for interviewer info
-        {
-            "$lookup": {
-                "from": "candidates",
-                "localField": "interviewer_id",
-                "foreignField": "id",
-                "as": "interviewer"
-            }
-        },
-        # Process and structure the results
-        {
-            "$addFields": {
-                "candidate_name": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$candidate"}, 0]},
-                        "then": {
-                            "$concat": [
-                                {"$ifNull": [{"$arrayElemAt": ["$candidate.first_name", 0]}, ""]}, 
-                                " ", 
-                                {"$ifNull": [{"$arrayElemAt": ["$candidate.last_name", 0]}, ""]}
-                            ]
-                        },
-                        "else": "Unknown Candidate"
-                    }
-                },
-                "job_title": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$job"}, 0]},
-                        "then": {"$ifNull": [{"$arrayElemAt": ["$job.title", 0]}, "Unknown Position"]},
-                        "else": "Unknown Position"
-                    }
-                },
-                "interviewer_name": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$interviewer"}, 0]},
-                        "then": {
-                            "$concat": [
-                                {"$ifNull": [{"$arrayElemAt": ["$interviewer.first_name", 0]}, ""]}, 
-                                " ", 
-                                {"$ifNull": [{"$arrayElemAt": ["$interviewer.last_name", 0]}, ""]}
-                            ]
-                        },
-                        "else": "Unknown Interviewer"
-                    }
-                },
-                "result": {
-                    "$cond": {
-                        "if": {
-                            "$or": [
-                                {"$eq": [{"$type": "$result"}, "string"]},
-                                {"$ne": [{"$type": "$result"}, "object"]}
-                            ]
-                        },
-                        "then": None,
-                        "else": "$result"
-                    }
-                }
-            }
-        },
-        # Remove the arrays from the final output
-        {
-            "$project": {
-                "candidate": 0,
-                "job": 0,
-                "interviewer": 0
-            }
-        }
-    ]
+    fields = projection.resolve(Interview, INTERVIEW_SUMMARY_FIELDS)
     
-    # Execute the aggregation pipeline
-    interviews = await interviews_collection.aggregate(pipeline).to_list(length=limit)
+    # Names and titles are snapshots on the interview, so no $lookup is needed
+    pipeline = page_stages(match_stage, page, skip=skip, limit=limit)
+    if fields:
+        pipeline.append({"$project": mongo_projection(fields)})
+    computed = {
+        field: expression for field, expression in {**DISPLAY_FIELDS, "result": RESULT_FIELD}.items()
+        if not fields or field in fields
+    }
+    if computed:
+        pipeline.append({"$addFields": computed})
     
-    return interviews
+    interviews = await interviews_collection.aggregate(pipeline).to_list(length=None)
+    interviews, next_cursor = split_page(interviews, page, limit=limit)
+    
+    return list_response(interviews, next_cursor, page, partial_model(Interview, fields) if fields else Interview)
+
+
+async def prefetch_related(interviews, loaders):
+    """
+    Load the candidates and jobs of ``interviews`` without name snapshots (not
+    reconciled yet) in one batch per collection
+    """
+    await asyncio.gather(
+        loaders.candidates.load_many([
+            interview.get("candidate_id") for interview in interviews if interview.get("candidate_name") is None
+        ]),
+        loaders.jobs.load_many([
+            interview.get("job_id") for interview in interviews if interview.get("job_title") is None
+        ]),
+    )
+
+
+async def display_names(interview, loaders):
+    """
+    Candidate name and job title of an interview, from its snapshots or from the
+    documents loaded by ``prefetch_related``
+    """
+    candidate_name = interview.get("candidate_name")
+    if candidate_name is None:
+        candidate = await loaders.candidates.load(interview.get("candidate_id"))
+        candidate_name = candidate.get("name", "Unknown") if candidate else "Unknown"
+    
+    job_title = interview.get("job_title")
+    if job_title is None:
+        job = await loaders.jobs.load(interview.get("job_id"))
+        job_title = job.get("title", "Unknown Position") if job else "Unknown Position"
+    
+    return candidate_name, job_title
 
 
 @router.post("", response_model=Interview, status_code=status.HTTP_201_CREATED)
 async def create_interview(
     interview_data: InterviewCreate,
 ):
-    send_interview_email(interview_data.dict())
     """
     Schedule a new interview
     """
-    # Check if candidate exists
-    candidate = await candidates_collection.find_one({"id": interview_data.candidate_id})
-    if not candidate:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Candidate with ID {interview_data.candidate_id} not found",
-        )
-    
-    # Check if job exists
-    job = await jobs_collection.find_one({"id": interview_data.job_id})
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job with ID {interview_data.job_id} not found",
-        )
+    # Check if candidate exists and read the names shown with the interview
+    candidate, interviewer = await asyncio.gather(
+        candidates_repository.get(interview_data.candidate_id, source_projection(CANDIDATE_SNAPSHOT)),
+        interviewer_snapshot(interview_data.interviewer_id),
+    )
     
     # Create new interview
-    interview_in_db = InterviewInDB(**interview_data.dict())
+    interview_in_db = InterviewInDB(**interview_data.dict(), **interviewer)
     new_interview = interview_in_db.dict()
+    new_interview["candidate_name"] = candidate.get("name")
+    if not new_interview.get("candidate_email"):
+        new_interview["candidate_email"] = candidate.get("email")
+    
+    async with transaction() as session:
+        # Update job interviews count (404 if the job does not exist)
+        job = await jobs_repository.update(interview_data.job_id, {"$inc": {"interviews": 1}}, session=session)
+        new_interview.update(snapshot(JOB_SNAPSHOT, job))
+        
+        # Insert into database
+        await interviews_repository.insert(new_interview, session=session)
+        
+        # Queue the invitation email in the outbox
+        await send_interview_email(new_interview, session=session)
     
-    # Insert into database
-    result = await interviews_collection.insert_one(new_interview)
-    
-    # Get created interview
-    created_interview = await interviews_collection.find_one({"_id": result.inserted_id})
-    
-    # Update job interviews count
-    await jobs_collection.update_one(
-        {"id": interview_data.job_id},
-        {"$inc": {"interviews": 1}}
-    )
-    
-    return created_interview
+    return new_interview
 
 
+# Static paths (/upcoming, /today) must be declared before /{interview_id}, which would match them
 @router.get("/upcoming", response_model=List[dict])
 async def get_upcoming_interviews(
     days: int = Query(7, description="Number of days to look ahead"),
-    limit: int = Query(5, description="Maximum number of interviews to return")
+    limit: int = Query(5, description="Maximum number of interviews to return"),
+    loaders: Loaders = Depends(),
 ):
     """
     Get upcoming interviews
@@ -208,20 +219,13 @@ async def get_upcoming_interviews(
     
     interviews = await interviews.to_list(length=limit)
     
+    # Read candidates and jobs of interviews without snapshots with one query each
+    await prefetch_related(interviews, loaders)
+    
     # Format and augment interview data
     upcoming = []
     for interview in interviews:
-        # Get candidate info
-        candidate = await candidates_collection.find_one({"id": interview.get("candidate_id")})
-        candidate_name = "Unknown"
-        if candidate:
-            candidate_name = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}"
-            if not candidate_name.strip():  # If name is empty
-                candidate_name = candidate.get("name", "Unknown")
-        
-        # Get job info
-        job = await jobs_collection.find_one({"id": interview.get("job_id")})
-        job_title = job.get("title", "Unknown Position") if job else "Unknown Position"
+        candidate_name, job_title = await display_names(interview, loaders)
         
         upcoming.append({
             "id": interview.get("id"),
@@ -234,6 +238,50 @@ async def get_upcoming_interviews(
     return upcoming
 
 
+@router.get("/today", response_model=List[dict])
+async def get_today_interviews(
+    loaders: Loaders = Depends(),
+):
+    """
+    Get all interviews scheduled for today
+    """
+    # Calculate today's date range
+    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start + timedelta(days=1)
+    
+    # Find today's interviews
+    interviews = interviews_collection.find({
+        "scheduled_date": {"$gte": today_start, "$lt": today_end},
+        "status": {"$nin": ["cancelled"]}
+    }).sort("scheduled_date", 1)
+    
+    interviews = await interviews.to_list(length=100)
+    
+    # Read candidates and jobs of interviews without snapshots with one query each
+    await prefetch_related(interviews, loaders)
+    
+    # Format and augment interview data
+    today_interviews = []
+    for interview in interviews:
+        candidate_name, job_title = await display_names(interview, loaders)
+        
+        # Format interview data
+        today_interviews.append({
+            "id": interview.get("id"),
+            "candidateId": interview.get("candidate_id"),
+            "candidateName": candidate_name,
+            "jobId": interview.get("job_id"),
+            "jobTitle": job_title,
+            "interviewType": interview.get("type", "Interview"),
+            "scheduledAt": interview.get("scheduled_date").isoformat() if interview.get("scheduled_date") else "",
+            "duration": interview.get("duration_minutes", 60),
+            "status": interview.get("status", "scheduled"),
+            "interviewer": interview.get("interviewer_name", "")
+        })
+    
+    return today_interviews
+
+
 @router.get("/{interview_id}", response_model=Interview)
 async def get_interview(
     interview_id: str,
@@ -241,94 +289,9 @@ async def get_interview(
     """
     Get a specific interview by ID
     """
-    # Create aggregation pipeline
     pipeline = [
         {"$match": {"id": interview_id}},
-        # Join with candidates collection for candidate info
-        {
-            "$lookup": {
-                "from": "candidates",
-                "localField": "candidate_id",
-                "foreignField": "id",
-                "as": "candidate"
-            }
-        },
-        # Join with jobs collection for job info
-        {
-            "$lookup": {
-                "from": "jobs",
-                "localField": "job_id",
-                "foreignField": "id",
-                "as": "job"
-            }
-        },
-        # Join with candidates collection again for interviewer info
-        {
-            "$lookup": {
-                "from": "candidates",
-                "localField": "interviewer_id",
-                "foreignField": "id",
-                "as": "interviewer"
-            }
-        },
-        # Process and structure the results
-        {
-            "$addFields": {
-                "candidate_name": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$candidate"}, 0]},
-                        "then": {
-                            "$concat": [
-                                {"$ifNull": [{"$arrayElemAt": ["$candidate.first_name", 0]}, ""]}, 
-                                " ", 
-                                {"$ifNull": [{"$arrayElemAt": ["$candidate.last_name", 0]}, ""]}
-                            ]
-                        },
-                        "else": "Unknown Candidate"
-                    }
-                },
-                "job_title": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$job"}, 0]},
-                        "then": {"$ifNull": [{"$arrayElemAt": ["$job.title", 0]}, "Unknown Position"]},
-                        "else": "Unknown Position"
-                    }
-                },
-                "interviewer_name": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$interviewer"}, 0]},
-                        "then": {
-                            "$concat": [
-                                {"$ifNull": [{"$arrayElemAt": ["$interviewer.first_name", 0]}, ""]}, 
-                                " ", 
-                                {"$ifNull": [{"$arrayElemAt": ["$interviewer.last_name", 0]}, ""]}
-                            ]
-                        },
-                        "else": "Unknown Interviewer"
-                    }
-                },
-                "result": {
-                    "$cond": {
-                        "if": {
-                            "$or": [
-                                {"$eq": [{"$type": "$result"}, "string"]},
-                                {"$ne": [{"$type": "$result"}, "object"]}
-                            ]
-                        },
-                        "then": None,
-                        "else": "$result"
-                    }
-                }
-            }
-        },
-        # Remove the arrays from the final output
-        {
-            "$project": {
-                "candidate": 0,
-                "job": 0,
-                "interviewer": 0
-            }
-        }
+        {"$addFields": {**DISPLAY_FIELDS, "result": RESULT_FIELD}},
     ]
     
     # Execute the aggregation pipeline
@@ -351,31 +314,28 @@ async def update_interview(
     """
     Update an interview
     """
-    # Check if interview exists
-    interview = await interviews_collection.find_one({"id": interview_id})
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Interview with ID {interview_id} not found",
-        )
-    
     # Filter out None values from update data
     update_data = {k: v for k, v in interview_data.dict().items() if v is not None}
     
     if not update_data:
-        return interview
+        return await interviews_repository.get(interview_id)
     
     # Add updated timestamp
     update_data["updated_at"] = datetime.now()
     
-    # Update interview
-    await interviews_collection.update_one(
-        {"id": interview_id},
-        {"$set": update_data}
-    )
+    # Keep the interviewer name snapshot in step with the interviewer
+    if "interviewer_id" in update_data:
+        update_data.update(await interviewer_snapshot(update_data["interviewer_id"]))
     
-    # Get updated interview
-    updated_interview = await interviews_collection.find_one({"id": interview_id})
+    async with transaction() as session:
+        # Update interview
+        updated_interview = await interviews_repository.update(interview_id, {"$set": update_data}, session=session)
+        
+        # A cancelled interview drops its pending invite, a rescheduled one replaces it
+        if updated_interview.get("status") == "cancelled":
+            await cancel_pending_emails(updated_interview["candidate_id"], ["interview"], interview_id, session=session)
+        elif any(field in update_data for field in INVITE_FIELDS) and updated_interview.get("candidate_email"):
+            await send_interview_email(updated_interview, session=session)
     
     return updated_interview
 
@@ -387,16 +347,11 @@ async def delete_interview(
     """
     Delete an interview
     """
-    # Check if interview exists
-    interview = await interviews_collection.find_one({"id": interview_id})
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Interview with ID {interview_id} not found",
-        )
-    
     # Delete the interview
-    await interviews_collection.delete_one({"id": interview_id})
+    interview = await interviews_repository.delete(interview_id)
+    
+    # Drop its invite if it has not been sent yet
+    await cancel_pending_emails(interview["candidate_id"], ["interview"], interview_id)
     
     # Update job interviews count
     await jobs_collection.update_one(
@@ -410,27 +365,20 @@ async def delete_interview(
 @router.patch("/{interview_id}/status", response_model=Interview)
 async def update_interview_status(
     interview_id: str,
-    status: str,
+    new_status: InterviewStatus = Query(..., alias="status"),
 ):
     """
     Update an interview's status
     """
-    # Check if interview exists
-    interview = await interviews_collection.find_one({"id": interview_id})
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Interview with ID {interview_id} not found",
-        )
-    
     # Update status
-    await interviews_collection.update_one(
-        {"id": interview_id},
-        {"$set": {"status": status, "updated_at": datetime.now()}}
+    updated_interview = await interviews_repository.update(
+        interview_id,
+        {"$set": {"status": new_status, "updated_at": datetime.now()}}
     )
     
-    # Get updated interview
-    updated_interview = await interviews_collection.find_one({"id": interview_id})
+    # Drop the invite of a cancelled interview if it has not been sent yet
+    if new_status == InterviewStatus.CANCELLED:
+        await cancel_pending_emails(updated_interview["candidate_id"], ["interview"], interview_id)
     
     return updated_interview
 
@@ -443,17 +391,9 @@ async def add_interview_result(
     """
     Add result to an interview
     """
-    # Check if interview exists
-    interview = await interviews_collection.find_one({"id": interview_id})
-    if not interview:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Interview with ID {interview_id} not found",
-        )
-    
     # Mark interview as completed
-    await interviews_collection.update_one(
-        {"id": interview_id},
+    updated_interview = await interviews_repository.update(
+        interview_id,
         {
             "$set": {
                 "status": "completed", 
@@ -463,15 +403,13 @@ async def add_interview_result(
         }
     )
     
-    # Get updated interview
-    updated_interview = await interviews_collection.find_one({"id": interview_id})
-    
     # Optionally update candidate status based on result
     if result_data.hiring_recommendation:
         await candidates_collection.update_one(
-            {"id": interview["candidate_id"]},
+            {"id": updated_interview["candidate_id"]},
             {"$set": {"status": "offer", "updated_at": datetime.now()}}
         )
+        candidate_facet_cache.invalidate()
     
     return updated_interview
 
@@ -484,85 +422,11 @@ async def get_job_interviews(
     Get all interviews for a specific job
     """
     # Check if job exists
-    job = await jobs_collection.find_one({"id": job_id})
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job with ID {job_id} not found",
-        )
+    await jobs_repository.get(job_id, {"_id": 1})
     
-    # Create aggregation pipeline
     pipeline = [
         {"$match": {"job_id": job_id}},
-        # Join with candidates collection for candidate info
-        {
-            "$lookup": {
-                "from": "candidates",
-                "localField": "candidate_id",
-                "foreignField": "id",
-                "as": "candidate"
-            }
-        },
-        # Join with candidates collection again for interviewer info
-        {
-            "$lookup": {
-                "from": "candidates",
-                "localField": "interviewer_id",
-                "foreignField": "id",
-                "as": "interviewer"
-            }
-        },
-        # Process and structure the results
-        {
-            "$addFields": {
-                "candidate_name": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$candidate"}, 0]},
-                        "then": {
-                            "$concat": [
-                                {"$ifNull": [{"$arrayElemAt": ["$candidate.first_name", 0]}, ""]}, 
-                                " ", 
-                                {"$ifNull": [{"$arrayElemAt": ["$candidate.last_name", 0]}, ""]}
-                            ]
-                        },
-                        "else": "Unknown Candidate"
-                    }
-                },
-                "job_title": job.get("title", "Unknown Position"),
-                "interviewer_name": {
-                    "$cond": {
-                        "if": {"$gt": [{"$size": "$interviewer"}, 0]},
-                        "then": {
-                            "$concat": [
-                                {"$ifNull": [{"$arrayElemAt": ["$interviewer.first_name", 0]}, ""]}, 
-                                " ", 
-                                {"$ifNull": [{"$arrayElemAt": ["$interviewer.last_name", 0]}, ""]}
-                            ]
-                        },
-                        "else": "Unknown Interviewer"
-                    }
-                },
-                "result": {
-                    "$cond": {
-                        "if": {
-                            "$or": [
-                                {"$eq": [{"$type": "$result"}, "string"]},
-                                {"$ne": [{"$type": "$result"}, "object"]}
-                            ]
-                        },
-                        "then": None,
-                        "else": "$result"
-                    }
-                }
-            }
-        },
-        # Remove the arrays from the final output
-        {
-            "$project": {
-                "candidate": 0,
-                "interviewer": 0
-            }
-        }
+        {"$addFields": {**DISPLAY_FIELDS, "result": RESULT_FIELD}},
     ]
     
     # Execute the aggregation pipeline
@@ -571,62 +435,10 @@ async def get_job_interviews(
     return interviews
 
 
-@router.get("/today", response_model=List[dict])
-async def get_today_interviews():
-    """
-    Get all interviews scheduled for today
-    """
-    # Calculate today's date range
-    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + timedelta(days=1)
-    
-    # Find today's interviews
-    interviews = interviews_collection.find({
-        "scheduled_date": {"$gte": today_start, "$lt": today_end},
-        "status": {"$nin": ["cancelled"]}
-    }).sort("scheduled_date", 1)
-    
-    interviews = await interviews.to_list(length=100)
-    
-    # Format and augment interview data
-    today_interviews = []
-    for interview in interviews:
-        # Get additional data for each interview
-        candidate_name = "Unknown"
-        job_title = "Unknown Position"
-        
-        # Fetch candidate info
-        candidate = await candidates_collection.find_one({"id": interview.get("candidate_id")})
-        if candidate:
-            candidate_name = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}"
-            if not candidate_name.strip():  # If name is empty
-                candidate_name = candidate.get("name", "Unknown")
-        
-        # Fetch job info
-        job = await jobs_collection.find_one({"id": interview.get("job_id")})
-        if job:
-            job_title = job.get("title", "Unknown Position")
-        
-        # Format interview data
-        today_interviews.append({
-            "id": interview.get("id"),
-            "candidateId": interview.get("candidate_id"),
-            "candidateName": candidate_name,
-            "jobId": interview.get("job_id"),
-            "jobTitle": job_title,
-            "interviewType": interview.get("type", "Interview"),
-            "scheduledAt": interview.get("scheduled_date").isoformat() if interview.get("scheduled_date") else "",
-            "duration": interview.get("duration_minutes", 60),
-            "status": interview.get("status", "scheduled"),
-            "interviewer": interview.get("interviewer_name", "")
-        })
-    
-    return today_interviews
-
-
 @router.get("/by-date/{date}", response_model=List[dict])
 async def get_interviews_by_date(
-    date: str  # Format: YYYY-MM-DD
+    date: str,  # Format: YYYY-MM-DD
+    loaders: Loaders = Depends(),
 ):
     """
     Get all interviews scheduled for a specific date
@@ -644,24 +456,13 @@ async def get_interviews_by_date(
         
         interviews = await interviews.to_list(length=100)
         
+        # Read candidates and jobs of interviews without snapshots with one query each
+        await prefetch_related(interviews, loaders)
+        
         # Format and augment interview data
         day_interviews = []
         for interview in interviews:
-            # Get additional data for each interview
-            candidate_name = "Unknown"
-            job_title = "Unknown Position"
-            
-            # Fetch candidate info
-            candidate = await candidates_collection.find_one({"id": interview.get("candidate_id")})
-            if candidate:
-                candidate_name = f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}"
-                if not candidate_name.strip():  # If name is empty
-                    candidate_name = candidate.get("name", "Unknown")
-            
-            # Fetch job info
-            job = await jobs_collection.find_one({"id": interview.get("job_id")})
-            if job:
-                job_title = job.get("title", "Unknown Position")
+            candidate_name, job_title = await display_names(interview, loaders)
             
             # Format interview data
             day_interviews.append({
@@ -701,29 +502,13 @@ async def get_interviews_by_date_range(
         parsed_end_date = datetime.strptime(end_date, "%Y-%m-%d")
         end_day = parsed_end_date.replace(hour=23, minute=59, second=59, microsecond=999)
         
-        # Use aggregation pipeline to join collections and get all data in one query
+        # Names and titles are snapshots on the interview, so one collection is read
         pipeline = [
             {
                 "$match": {
                     "scheduled_date": {"$gte": start_day, "$lte": end_day}
                 }
             },
-            {
-                "$lookup": {
-                    "from": "candidates",
-                    "localField": "candidate_id",
-                    "foreignField": "id",
-                    "as": "candidate"
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "jobs",
-                    "localField": "job_id",
-                    "foreignField": "id",
-                    "as": "job"
-                }
-            },
             {
                 "$sort": {"scheduled_date": 1}
             },
@@ -732,19 +517,9 @@ async def get_interviews_by_date_range(
                     "_id": 0,  # Exclude _id field
                     "id": 1,
                     "candidateId": "$candidate_id",
-                    "candidateName": {
-                        "$ifNull": [
-                            {"$arrayElemAt": ["$candidate.name", 0]},
-                            "Unknown"
-                        ]
-                    },
+                    "candidateName": {"$ifNull": ["$candidate_name", "Unknown"]},
                     "jobId": "$job_id",
-                    "jobTitle": {
-                        "$ifNull": [
-                            {"$arrayElemAt": ["$job.title", 0]},
-                            "Unknown Position"
-                        ]
-                    },
+                    "jobTitle": {"$ifNull": ["$job_title", "Unknown Position"]},
                     "interviewType": {"$ifNull": ["$type", "Interview"]},
                     "scheduledAt": {
                         "$ifNull": [
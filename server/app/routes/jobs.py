@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional, Union
 
 from ..db.database import jobs_collection, candidates_collection
+from ..db.indexes import index, register_indexes
+from ..db.repository import jobs_repository
+from ..db.snapshots import propagate
 from ..models.job import (
     Job, 
     JobCreate, 
@@ -10,35 +13,74 @@ from ..models.job import (
     JobStatus
 )
 from ..models.candidate import Candidate
+from ..models.page import Page
+from .pagination import DEFAULT_SORT, PageParams, find_page, find_ranked
+from .projection import ProjectionParams, mongo_projection, view_model
+from .responses import list_response
+from ..search.ngram import job_ngrams
+from ..search.suggest import suggestions
+from ..search.query import JOB_TEXT_WEIGHTS, SearchMode, merge_filter, prefix_index, search_query, search_sort, text_index
+from ..search.terms import JOB_SEARCH_FIELDS, TERMS_FIELD, search_changes, search_terms, search_update
 from datetime import datetime
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+# Bộ lọc của danh sách công việc, ứng viên theo vị trí và hồ sơ ứng tuyển theo công việc;
+# các danh sách phân trang theo id nên id đứng sau trường lọc
+register_indexes("jobs", index("status", "id"), index("department", "id"), index("title"))
+register_indexes("jobs", prefix_index(), text_index(JOB_TEXT_WEIGHTS, "jobs_text"))
+register_indexes("candidates", index("position", "id"), index("job_id", "status"), index("job_id", "id"))
+
+# Các cột của bảng công việc (view=summary)
+JOB_SUMMARY_FIELDS = (
+    "title", "department", "location", "status", "employment_type", "is_remote",
+    "applicants", "interviews", "posted_date",
+)
+
 # Thêm route xử lý gốc để tránh redirect
-@router.get("", response_model=List[Job])
+@router.get("", response_model=Union[List[Job], Page[Job]])
 async def get_jobs_no_slash(
-    status: Optional[str] = None,
+    status: Optional[JobStatus] = None,
     department: Optional[str] = None,
     search: Optional[str] = None,
+    search_mode: SearchMode = SearchMode.PREFIX,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    page: PageParams = Depends(),
+    projection: ProjectionParams = Depends(),
 ):
     """
     Get all jobs with optional filtering (no trailing slash)
     """
-    return await get_jobs(status, department, search, skip, limit)
+    return await get_jobs(status, department, search, search_mode, skip, limit, page, projection)
 
 
-@router.get("/", response_model=List[Job])
+@router.get("/", response_model=Union[List[Job], Page[Job]])
 async def get_jobs(
-    status: Optional[str] = None,
+    status: Optional[JobStatus] = None,
     department: Optional[str] = None,
     search: Optional[str] = None,
+    search_mode: SearchMode = SearchMode.PREFIX,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    page: PageParams = Depends(),
+    projection: ProjectionParams = Depends(),
 ):
     """
-    Get all jobs with optional filtering
+    Get all jobs with optional filtering.
+
+    Pass ``cursor`` (empty for the first page) to page with ``next_cursor``
+    instead of ``skip``; ``page_size`` overrides ``limit``.
+
+    ``search_mode`` selects how ``search`` matches: ``prefix`` (word prefixes of
+    title and department), ``text`` (weighted full-text search over title,
+    department and description, ordered by relevance), ``fuzzy``
+    (accent-insensitive substring and typo-tolerant match on title, ordered by
+    relevance) or ``regex`` (substring scan). ``text`` and ``fuzzy`` results are
+    paged with ``skip``.
+
+    ``fields`` (comma-separated) or ``view=summary`` return only those fields,
+    projected in MongoDB; ``id`` is always included.
     """
     # Build the filter query
     query = {}
@@ -48,19 +90,24 @@ async def get_jobs(
         
     if department:
         query["department"] = department
-        
-    if search:
-        search_lower = search.lower()
-        query["$or"] = [
-            {"title": {"$regex": search_lower, "$options": "i"}},
-            {"description": {"$regex": search_lower, "$options": "i"}},
-            {"department": {"$regex": search_lower, "$options": "i"}},
-        ]
     
+    fields = projection.resolve(Job, JOB_SUMMARY_FIELDS)
+        
     # Fetch jobs
-    jobs = jobs_collection.find(query).skip(skip).limit(limit)
-    jobs = await jobs.to_list(length=limit)
-    return jobs
+    if search and search_mode == SearchMode.FUZZY and job_ngrams.ready:
+        jobs, next_cursor = await find_ranked(
+            jobs_collection, query, job_ngrams.search(search), page, skip, limit, mongo_projection(fields)
+        )
+    else:
+        sort = DEFAULT_SORT
+        if search:
+            merge_filter(query, search_query(search, search_mode, ("title", "description", "department")))
+            sort = search_sort(search_mode, sort)
+        jobs, next_cursor = await find_page(
+            jobs_collection, query, page, sort, skip=skip, limit=limit, projection=mongo_projection(fields, sort)
+        )
+    
+    return list_response(jobs, next_cursor, page, view_model(Job, fields))
 
 
 @router.post("", response_model=Job, status_code=status.HTTP_201_CREATED)
@@ -74,14 +121,14 @@ async def create_job(
     # Create new job
     job_in_db = JobInDB(**job_data.dict())
     new_job = job_in_db.dict()
+    new_job[TERMS_FIELD] = search_terms(new_job, JOB_SEARCH_FIELDS)
     
     # Insert into database
-    result = await jobs_collection.insert_one(new_job)
-    
-    # Get created job
-    created_job = await jobs_collection.find_one({"_id": result.inserted_id})
+    await jobs_repository.insert(new_job)
+    job_ngrams.add(new_job)
+    suggestions.add("jobs", new_job)
     
-    return created_job
+    return new_job
 
 
 @router.get("/{job_id}", response_model=Job)
@@ -111,39 +158,34 @@ async def update_job(
     Update a job posting
     """
     try:
-        # Check if job exists
-        job = await jobs_collection.find_one({"id": job_id})
-        if not job:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Job with ID {job_id} not found",
-            )
-        
         # Convert job_data to dict and filter out None values
         update_data = job_data.dict(exclude_unset=True)
         
         # Add updated timestamp
         update_data["updated_at"] = datetime.now()
+
+        terms = search_update(update_data, JOB_SEARCH_FIELDS)
+        if terms is not None:
+            update_data[TERMS_FIELD] = terms
         
-        # Update job
-        result = await jobs_collection.update_one(
-            {"id": job_id},
-            {"$set": update_data}
-        )
+        # Update job (404 if it does not exist)
+        job, updated_job = await jobs_repository.set(job_id, update_data)
         
-        if result.modified_count == 0:
-            # No changes were made, return the original job
-            return job
+        # Copy a new title to the snapshots on the job's interviews
+        await propagate("jobs", job, updated_job)
         
-        # Get updated job
-        updated_job = await jobs_collection.find_one({"id": job_id})
-        if not updated_job:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve updated job",
-            )
+        # Only some search fields changed: search_terms needs the current values of the others
+        terms = search_changes(job, update_data, JOB_SEARCH_FIELDS)
+        if terms is not None and terms != updated_job.get(TERMS_FIELD):
+            await jobs_collection.update_one({"id": job_id}, {"$set": {TERMS_FIELD: terms}})
+            updated_job[TERMS_FIELD] = terms
+        
+        job_ngrams.add(updated_job)
+        suggestions.update("jobs", job, updated_job)
         
         return updated_job
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error updating job: {str(e)}")
         raise HTTPException(
@@ -159,16 +201,10 @@ async def delete_job(
     """
     Delete a job posting
     """
-    # Check if job exists
-    job = await jobs_collection.find_one({"id": job_id})
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job with ID {job_id} not found",
-        )
-    
     # Delete the job
-    await jobs_collection.delete_one({"id": job_id})
+    job = await jobs_repository.delete(job_id)
+    job_ngrams.remove(job_id)
+    suggestions.remove("jobs", job)
     
     return None
 
@@ -181,14 +217,6 @@ async def update_job_status(
     """
     Update a job's status
     """
-    # Check if job exists
-    job = await jobs_collection.find_one({"id": job_id})
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Job with ID {job_id} not found",
-        )
-    
     # Get status from request body
     if 'status' not in status_data:
         raise HTTPException(
@@ -208,31 +236,27 @@ async def update_job_status(
         )
     
     # Update status based on the new status
-    update_data = {"status": job_status, "updated_at": datetime.now()}
+    now = datetime.now()
+    update_data = {"status": job_status.value, "updated_at": now}
     
     # If status is OPEN, set posted_date if not already set
-    if job_status == JobStatus.OPEN and not job.get("posted_date"):
-        update_data["posted_date"] = datetime.now()
+    if job_status == JobStatus.OPEN:
+        update_data["posted_date"] = {"$ifNull": ["$posted_date", now]}
     
     # If status is CLOSED, set closed_date
     if job_status == JobStatus.CLOSED:
-        update_data["closed_date"] = datetime.now()
+        update_data["closed_date"] = now
     
-    # Update job
-    await jobs_collection.update_one(
-        {"id": job_id},
-        {"$set": update_data}
-    )
-    
-    # Get updated job
-    updated_job = await jobs_collection.find_one({"id": job_id})
+    # Update job with a pipeline so posted_date is checked in the same command
+    updated_job = await jobs_repository.update(job_id, [{"$set": update_data}])
     
     return updated_job
 
 
-@router.get("/{job_id}/candidates", response_model=List[Candidate])
+@router.get("/{job_id}/candidates", response_model=Union[List[Candidate], Page[Candidate]])
 async def get_job_candidates(
     job_id: str,
+    page: PageParams = Depends(),
 ):
     """
     Get all candidates who applied for a specific job
@@ -246,33 +270,33 @@ async def get_job_candidates(
         )
     
     # Get candidates with matching position
-    candidates = candidates_collection.find({"position": job["title"]})
-    candidates = await candidates.to_list(length=100)
+    candidates, next_cursor = await find_page(candidates_collection, {"position": job["title"]}, page)
     
-    return candidates
+    return list_response(candidates, next_cursor, page, Candidate)
 
 
-@router.get("/department/{department}", response_model=List[Job])
+@router.get("/department/{department}", response_model=Union[List[Job], Page[Job]])
 async def get_jobs_by_department(
     department: str,
+    page: PageParams = Depends(),
 ):
     """
     Get all jobs for a specific department
     """
-    jobs = jobs_collection.find({"department": department})
-    jobs = await jobs.to_list(length=100)
+    jobs, next_cursor = await find_page(jobs_collection, {"department": department}, page)
     
-    return jobs 
+    return list_response(jobs, next_cursor, page, Job)
 
-@router.get("/{job_id}/applications", response_model=List[Candidate])
+@router.get("/{job_id}/applications", response_model=Union[List[Candidate], Page[Candidate]])
 async def get_job_applications(
     job_id: str,
+    page: PageParams = Depends(),
 ):
     """
     Get all applications for a specific job
     """
     # Check if job exists
-    job = jobs_collection.find_one({"id": job_id})
+    job = await jobs_collection.find_one({"id": job_id})
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -280,60 +304,7 @@ async def get_job_applications(
         )
     
     # Get applications for the job
-    applications = candidates_collection.find({"job_id": job_id})
-    applications = await applications.to_list(length=100)
-    applications = [transform_candidate_data(application) for application in applications]
-
-    return applications
+    applications, next_cursor = await find_page(candidates_collection, {"job_id": job_id}, page)
 
+    return list_response(applications, next_cursor, page, Candidate)
 
-def transform_candidate_data(candidate):
-    """
-    Transform MongoDB candidate document to match Pydantic model requirements
-    """
-    if not candidate:
-        return None
-        
-    # Create a copy to avoid modifying the original
-    candidate = dict(candidate)
-    
-    # Convert MongoDB _id to string id if not present
-    if "_id" in candidate and "id" not in candidate:
-        candidate["id"] = str(candidate["_id"])
-    
-    # Ensure status is lowercase to match enum
-    if "status" in candidate and candidate["status"] == "New":
-        candidate["status"] = "new"
-        
-    # Set default values for required fields if missing
-    if "phone" not in candidate:
-        candidate["phone"] = "Not provided"
-        
-    if "department" not in candidate:
-        candidate["department"] = "Not specified"
-        
-    if "experience" not in candidate:
-        candidate["experience"] = 0
-        
-    if "sex" not in candidate:
-        candidate["sex"] = None
-        
-    # Add timestamps if missing
-    now = datetime.now()
-    if "created_at" not in candidate:
-        candidate["created_at"] = now
-        
-    if "updated_at" not in candidate:
-        candidate["updated_at"] = now
-        
-    if "applied_date" not in candidate:
-        candidate["applied_date"] = now
-    
-    # Preserve resume_drive_url and resume_download_url if they exist
-    if "resume_url" in candidate and candidate["resume_url"]:
-        if "resume_drive_url" not in candidate:
-            candidate["resume_drive_url"] = candidate["resume_url"]
-        if "resume_download_url" not in candidate:
-            candidate["resume_download_url"] = candidate["resume_url"]
-    
-    return candidate
\ No newline at end of file
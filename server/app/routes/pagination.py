@@ -0,0 +1,187 @@
+"""
+Phân trang theo keyset (cursor) dùng chung cho các route trả về danh sách.
+
+Cursor là giá trị các trường sắp xếp của tài liệu cuối trang (luôn kết thúc bằng ``id``
+để thứ tự ổn định), mã hóa base64 nên client chỉ cần gửi lại nguyên văn. Trang tiếp
+theo được lọc bằng điều kiện ``> cursor`` trên index thay vì ``skip`` nên độ trễ không
+tăng theo độ sâu của trang.
+"""
+
+import asyncio
+import base64
+import binascii
+from typing import Optional
+
+from bson import json_util
+from fastapi import HTTPException, Query, status
+
+from ..search.facets import count_facets
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Sắp xếp mặc định: id tăng dần theo thời gian tạo (app.models.ids.new_id)
+DEFAULT_SORT = [("id", 1)]
+
+# Header chứa cursor của trang kế tiếp khi route trả về danh sách (chế độ tương thích)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """
+    Tham số phân trang của một request
+
+    ``cursor`` có mặt (kể cả rỗng, nghĩa là trang đầu) thì route trả về
+    ``{"items": [...], "next_cursor": ...}``; không có thì trả về danh sách như trước,
+    kèm header ``X-Next-Cursor`` nếu còn trang sau.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Cursor của trang, rỗng để lấy trang đầu"),
+        page_size: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Số phần tử mỗi trang"),
+    ):
+        self.cursor = cursor
+        self.page_size = page_size
+
+    @property
+    def envelope(self):
+        return self.cursor is not None
+
+    def size(self, limit=DEFAULT_PAGE_SIZE):
+        return self.page_size or limit
+
+
+def is_keyset(sort):
+    """
+    Sắp xếp chỉ gồm các trường có sẵn trong tài liệu (không có ``$meta``) thì phân trang bằng cursor được
+    """
+    return all(direction in (1, -1) for _, direction in sort)
+
+
+def encode_cursor(document, sort=DEFAULT_SORT):
+    values = [document.get(field) for field, _ in sort]
+    raw = json_util.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, sort=DEFAULT_SORT):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json_util.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(sort, values):
+    """
+    Điều kiện lấy các tài liệu đứng sau ``values`` theo thứ tự ``sort``
+    """
+    clauses = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {previous: value for (previous, _), value in zip(sort[:position], values[:position])}
+        clause[field] = {"$gt" if direction == 1 else "$lt": values[position]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def page_query(query, page, sort=DEFAULT_SORT):
+    """
+    Thêm điều kiện cursor vào bộ lọc
+    """
+    if not page.cursor:
+        return query
+    after = keyset_filter(sort, decode_cursor(page.cursor, sort))
+    return {"$and": [query, after]} if query else after
+
+
+def page_stages(query, page, sort=DEFAULT_SORT, skip=0, limit=DEFAULT_PAGE_SIZE):
+    """
+    Các stage ``$match``/``$sort``/``$skip``/``$limit`` đầu pipeline cho một trang.
+    Lấy thừa một phần tử để biết còn trang sau hay không.
+    """
+    stages = [{"$match": page_query(query, page, sort)}, {"$sort": dict(sort)}]
+    if skip and not page.cursor:
+        stages.append({"$skip": skip})
+    stages.append({"$limit": page.size(limit) + 1})
+    return stages
+
+
+def _reject_cursor(page):
+    if page.cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not available for this ordering, use skip",
+        )
+
+
+async def find_page(collection, query, page, sort=DEFAULT_SORT, skip=0, limit=DEFAULT_PAGE_SIZE, projection=None):
+    """
+    Đọc một trang từ collection
+
+    Returns:
+        tuple: (danh sách tài liệu, cursor của trang sau hoặc None)
+    """
+    size = page.size(limit)
+    if not is_keyset(sort):
+        # Thứ tự tính lúc truy vấn (ví dụ độ liên quan của $text): chỉ phân trang bằng skip
+        _reject_cursor(page)
+        documents = await collection.find(query, projection).sort(sort).skip(skip).limit(size).to_list(length=size)
+        return documents, None
+
+    cursor = collection.find(page_query(query, page, sort), projection).sort(sort)
+    if skip and not page.cursor:
+        cursor = cursor.skip(skip)
+    documents = await cursor.limit(size + 1).to_list(length=size + 1)
+    return split_page(documents, page, sort, limit)
+
+
+async def find_ranked(collection, query, ids, page, skip=0, limit=DEFAULT_PAGE_SIZE, projection=None):
+    """
+    Đọc một trang theo thứ tự xếp hạng ``ids`` (ví dụ kết quả của index tìm kiếm) bằng
+    một truy vấn ``$in``; phân trang bằng skip như các thứ tự tính lúc truy vấn
+
+    Returns:
+        tuple: (danh sách tài liệu, None)
+    """
+    _reject_cursor(page)
+    size = page.size(limit)
+    if not query:
+        # Không có bộ lọc khác: chỉ cần lấy đúng các id của trang
+        ids = ids[skip:skip + size]
+        skip = 0
+    documents = await collection.find({**query, "id": {"$in": ids}}, projection).to_list(length=None)
+    rank = {doc_id: position for position, doc_id in enumerate(ids)}
+    documents.sort(key=lambda document: rank[document["id"]])
+    return documents[skip:skip + size], None
+
+
+async def find_page_with_facets(
+    collection, query, page, facets, sort=DEFAULT_SORT, skip=0, limit=DEFAULT_PAGE_SIZE, projection=None
+):
+    """
+    Đọc một trang cùng các nhánh đếm ``facets``: trang là truy vấn find như ``find_page``
+    (sort và limit chạy trên index), ``$facet`` chỉ dùng để đếm; hai lệnh chạy song song.
+
+    Không đặt trang vào một nhánh ``$facet``: các nhánh nhận toàn bộ tài liệu đã lọc nên
+    ``$sort``/``$limit`` của trang không dùng được index.
+
+    Returns:
+        tuple: (danh sách tài liệu, cursor của trang sau hoặc None, kết quả các facet)
+    """
+    (documents, next_cursor), counts = await asyncio.gather(
+        find_page(collection, query, page, sort, skip, limit, projection),
+        count_facets(collection, query, facets),
+    )
+    return documents, next_cursor, counts
+
+
+def split_page(documents, page, sort=DEFAULT_SORT, limit=DEFAULT_PAGE_SIZE):
+    size = page.size(limit)
+    if len(documents) <= size:
+        return documents, None
+    documents = documents[:size]
+    return documents, encode_cursor(documents[-1], sort) if is_keyset(sort) else None
@@ -0,0 +1,83 @@
+"""
+Chọn trường trả về (``fields=``) và view có tên (``view=summary|full``) cho các route
+danh sách.
+
+Danh sách trường được đẩy xuống MongoDB thành projection, và response được kiểm tra
+bằng một model chỉ gồm các trường đó (tạo một lần cho mỗi tập trường) thay vì model
+đầy đủ vốn sẽ từ chối tài liệu thiếu trường bắt buộc.
+"""
+
+from enum import Enum
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from pydantic import create_model
+
+from .pagination import DEFAULT_SORT, is_keyset
+
+
+class View(str, Enum):
+    SUMMARY = "summary"
+    FULL = "full"
+
+
+class ProjectionParams:
+    """
+    Tham số chọn trường của một request; không truyền gì thì trả về tài liệu đầy đủ như trước
+    """
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name,status"),
+        view: View = Query(View.FULL, description="Named field set: summary (list columns) or full"),
+    ):
+        self.fields = fields
+        self.view = view
+
+    def resolve(self, model, summary_fields):
+        """
+        Returns:
+            tuple | None: Các trường cần trả về (luôn có ``id``), None nếu trả về đầy đủ
+        """
+        if self.fields:
+            names = [name.strip() for name in self.fields.split(",") if name.strip()]
+            unknown = [name for name in names if name not in model.model_fields]
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields: {', '.join(unknown)}",
+                )
+        elif self.view == View.SUMMARY:
+            names = summary_fields
+        else:
+            return None
+        return tuple(dict.fromkeys(["id", *names]))
+
+
+def mongo_projection(fields, sort=DEFAULT_SORT):
+    """
+    Projection MongoDB cho các trường được chọn, kèm các trường sắp xếp cần để tạo cursor
+    """
+    if fields is None:
+        return None
+    projection = {"_id": 0, **{field: 1 for field in fields}}
+    if is_keyset(sort):
+        projection.update({field: 1 for field, _ in sort})
+    return projection
+
+
+@lru_cache(maxsize=256)
+def partial_model(model, fields):
+    """
+    Model chỉ gồm ``fields`` của ``model`` (giữ nguyên kiểu và giá trị mặc định)
+    """
+    definitions = {name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields}
+    return create_model(f"{model.__name__}View", **definitions)
+
+
+def view_model(model, fields):
+    """
+    Model dùng để trả về danh sách: ``model`` khi không chọn trường
+    """
+    return model if fields is None else partial_model(model, fields)
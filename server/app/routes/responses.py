@@ -0,0 +1,72 @@
+"""
+Tuần tự hóa response của các route danh sách.
+
+Route trả về thẳng ``Response`` đã mã hóa thay vì để FastAPI kiểm tra lại theo
+``response_model`` rồi mã hóa bằng ``json`` của thư viện chuẩn:
+
+- mặc định tài liệu được kiểm tra một lần bằng ``TypeAdapter`` (tạo một lần cho mỗi
+  model) và ghi thẳng ra JSON bởi pydantic-core;
+- với ``TRUSTED_OUTPUT=true``, tài liệu do chính ứng dụng ghi (đã chuẩn hóa bởi
+  migration) không được kiểm tra lại: chỉ giữ các trường của model, điền giá trị mặc
+  định cho trường thiếu và mã hóa bằng orjson (hỗ trợ sẵn datetime và enum).
+"""
+
+import os
+from functools import lru_cache
+from typing import List
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from .pagination import NEXT_CURSOR_HEADER
+
+TRUSTED_OUTPUT = os.getenv("TRUSTED_OUTPUT", "false").lower() == "true"
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=256)
+def list_adapter(model):
+    return TypeAdapter(List[model])
+
+
+def _trusted_items(items, model):
+    fields = model.model_fields
+    return [
+        {
+            name: item[name] if name in item else field.get_default(call_default_factory=True)
+            for name, field in fields.items()
+            if name in item or not field.is_required()
+        }
+        for item in items
+    ]
+
+
+def encode_items(items, model, trusted=None):
+    """
+    Mã hóa danh sách tài liệu thành JSON theo ``model``
+
+    Returns:
+        bytes: Mảng JSON
+    """
+    if TRUSTED_OUTPUT if trusted is None else trusted:
+        return orjson.dumps(_trusted_items(items, model))
+    adapter = list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(items))
+
+
+def list_response(items, next_cursor, page, model, extra=None, trusted=None):
+    """
+    Response của một trang danh sách: envelope ``{"items", "next_cursor", ...extra}``
+    khi client dùng cursor hoặc có ``extra``, ngược lại là mảng kèm header cursor
+    """
+    body = encode_items(items, model, trusted)
+    if page.envelope or extra:
+        parts = [b'{"items":', body, b',"next_cursor":', orjson.dumps(next_cursor)]
+        for name, value in (extra or {}).items():
+            parts += [b",", orjson.dumps(name), b":", orjson.dumps(value)]
+        parts.append(b"}")
+        return Response(b"".join(parts), media_type=JSON_MEDIA_TYPE)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import List
+
+from ..models.suggest import SuggestField, Suggestion
+from ..search.suggest import suggestions
+
+router = APIRouter(prefix="/suggest", tags=["search"])
+
+
+@router.get("", response_model=List[Suggestion])
+async def suggest(
+    field: SuggestField,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Typeahead completions for candidate names, job titles, skills and departments.
+
+    Any word of a value can match the typed prefix, accents and case are ignored,
+    and values are ordered by how many candidates/jobs use them.
+    """
+    if not suggestions.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Suggestion index is loading",
+        )
+    return [
+        {"value": value, "count": count}
+        for value, count in suggestions.complete(field.value, q, limit)
+    ]
@@ -0,0 +1,109 @@
+"""
+Số lượng theo nhóm (facet) của danh sách ứng viên, tính bằng một lệnh aggregate ``$facet``
+chạy song song với truy vấn lấy trang kết quả.
+
+Bộ lọc của route được đặt ở ``$match`` đầu pipeline nên dùng index như truy vấn danh
+sách; các nhánh ``$facet`` chỉ đếm trên tập tài liệu đã lọc. Kết quả đếm được cache theo
+bộ lọc trong ``FACET_CACHE_SECONDS`` giây và bị xóa khi worker ghi vào ứng viên.
+"""
+
+import os
+import time
+from collections import OrderedDict
+
+from bson import json_util
+
+FACET_CACHE_SECONDS = float(os.getenv("FACET_CACHE_SECONDS", "30"))
+
+# Số bộ lọc khác nhau được cache
+FACET_CACHE_SIZE = 256
+
+# Mốc số năm kinh nghiệm: [0, 1), [1, 3), [3, 5), [5, 10), 10+
+EXPERIENCE_BOUNDARIES = [0, 1, 3, 5, 10]
+
+
+def _count_by(field):
+    return [
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$project": {"_id": 0, "value": "$_id", "count": 1}},
+    ]
+
+
+CANDIDATE_FACETS = {
+    "status": _count_by("status"),
+    "department": _count_by("department"),
+    "source": _count_by("source"),
+    "job_id": _count_by("job_id"),
+    "experience": [
+        {"$bucket": {
+            "groupBy": {"$ifNull": ["$experience", 0]},
+            "boundaries": EXPERIENCE_BOUNDARIES,
+            "default": "10+",
+            "output": {"count": {"$sum": 1}},
+        }},
+        {"$project": {
+            "_id": 0,
+            "value": {"$switch": {
+                "branches": [
+                    {"case": {"$eq": ["$_id", lower]}, "then": f"{lower}-{upper}"}
+                    for lower, upper in zip(EXPERIENCE_BOUNDARIES, EXPERIENCE_BOUNDARIES[1:])
+                ],
+                "default": "$_id",
+            }},
+            "count": 1,
+        }},
+    ],
+}
+
+
+class FacetCache:
+    """
+    Cache kết quả facet theo chữ ký của bộ lọc, có thời hạn và giới hạn số phần tử
+    """
+
+    def __init__(self, ttl=FACET_CACHE_SECONDS, size=FACET_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def signature(query):
+        return json_util.dumps(query, sort_keys=True)
+
+    def get(self, query):
+        key = self.signature(query)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, query, facets):
+        key = self.signature(query)
+        self.entries[key] = (time.monotonic() + self.ttl, facets)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self):
+        self.entries.clear()
+
+    def metrics(self):
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses, "ttl_seconds": self.ttl}
+
+
+candidate_facet_cache = FacetCache()
+
+
+async def count_facets(collection, query, facets=CANDIDATE_FACETS):
+    """
+    Tính các facet trên tập tài liệu khớp ``query``
+    """
+    pipeline = [{"$match": query}, {"$facet": facets}]
+    results = await collection.aggregate(pipeline).to_list(length=1)
+    result = results[0] if results else {}
+    return {name: result.get(name, []) for name in facets}
@@ -0,0 +1,185 @@
+"""
+Index trigram trong bộ nhớ cho tìm kiếm chuỗi con và tìm gần đúng.
+
+Văn bản của mỗi tài liệu được bỏ dấu và viết thường (``fold``), tách thành trigram theo
+từng từ (có đệm như pg_trgm: "  n", " ng", "ngu", ...) và lưu trong index đảo
+trigram -> tập id. Truy vấn trả về danh sách id đã xếp hạng; route lấy tài liệu từ
+MongoDB bằng một truy vấn ``$in``.
+
+Index được nạp khi khởi động và cập nhật ngay trong các route ghi của worker hiện tại;
+thay đổi từ worker khác được thấy sau lần dựng lại định kỳ kế tiếp
+(``SEARCH_INDEX_REFRESH_SECONDS``, xem app.main).
+"""
+
+import heapq
+import math
+import time
+from collections import Counter
+
+from .terms import fold
+
+CANDIDATE_NGRAM_FIELDS = ("name", "email", "phone", "position")
+JOB_NGRAM_FIELDS = ("title",)
+
+# Tỷ lệ trigram của truy vấn phải có trong tài liệu để được coi là khớp gần đúng
+FUZZY_THRESHOLD = 0.5
+
+# Số kết quả tối đa một truy vấn trả về
+MAX_RESULTS = 1000
+
+
+def normalize(text):
+    return " ".join(fold(text).split())
+
+
+def trigrams(text):
+    """
+    Trigram của từng từ trong chuỗi đã chuẩn hóa, đệm hai khoảng trắng ở đầu và một ở cuối từ
+    """
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[position:position + 3] for position in range(len(padded) - 2))
+    return grams
+
+
+def _inner_trigrams(text):
+    # Trigram không đệm nằm trọn trong một từ
+    return {text[position:position + 3] for position in range(len(text) - 2) if " " not in text[position:position + 3]}
+
+
+_EMPTY = frozenset()
+
+
+class TrigramIndex:
+    """
+    Index trigram của một collection
+
+    Args:
+        fields: Các trường được đánh index
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.postings = {}
+        self.documents = {}
+        self.ready = False
+        self.load_seconds = None
+
+    def _text(self, document):
+        return "\n".join(normalize(document[field]) for field in self.fields if document.get(field))
+
+    @staticmethod
+    def _grams(text):
+        grams = set()
+        for line in text.split("\n"):
+            grams |= trigrams(line)
+        return grams
+
+    def add(self, document):
+        """
+        Thêm hoặc cập nhật một tài liệu (theo ``id``)
+        """
+        doc_id = document["id"]
+        self.remove(doc_id)
+        text = self._text(document)
+        self.documents[doc_id] = text
+        for gram in self._grams(text):
+            self.postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id):
+        text = self.documents.pop(doc_id, None)
+        if text is None:
+            return
+        for gram in self._grams(text):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def search(self, query, limit=MAX_RESULTS, threshold=FUZZY_THRESHOLD):
+        """
+        Tìm tài liệu khớp ``query``
+
+        Tài liệu chứa nguyên chuỗi (đã bỏ dấu) được xếp trước, ưu tiên khớp ở đầu từ;
+        nếu chưa đủ ``limit`` kết quả thì thêm các tài liệu khớp gần đúng theo tỷ lệ
+        trigram chung với truy vấn.
+
+        Returns:
+            list: id của tài liệu, theo thứ tự liên quan giảm dần
+        """
+        text = normalize(query)
+        if not text:
+            return []
+        query_grams = trigrams(text)
+
+        # Tài liệu chứa chuỗi con thì chứa mọi trigram không đệm của nó; chuỗi ngắn hơn
+        # 3 ký tự thì chỉ tìm được ở đầu từ (trigram đệm phía trước)
+        required = _inner_trigrams(text) or {gram for gram in query_grams if not gram.endswith(" ")}
+        postings = sorted((self.postings.get(gram, _EMPTY) for gram in required), key=len)
+        scored = []
+        for doc_id in postings[0].intersection(*postings[1:]):
+            document_text = self.documents[doc_id]
+            if text in document_text:
+                word_start = document_text.startswith(text) or f" {text}" in document_text or f"\n{text}" in document_text
+                scored.append((3 if word_start else 2, doc_id))
+        if len(scored) >= limit:
+            return [doc_id for _, doc_id in heapq.nlargest(limit, scored)]
+
+        # Khớp gần đúng: cần ít nhất ``minimum`` trigram chung với truy vấn, nên tài liệu
+        # phải nằm trong một trong (n - minimum + 1) danh sách ngắn nhất; chỉ đếm trên các
+        # danh sách đó rồi tra thêm các danh sách dài cho từng ứng viên
+        exact = {doc_id for _, doc_id in scored}
+        total = len(query_grams)
+        minimum = max(1, math.ceil(threshold * total))
+        postings = sorted((self.postings.get(gram, _EMPTY) for gram in query_grams), key=len)
+        short, long = postings[:total - minimum + 1], postings[total - minimum + 1:]
+        counts = Counter()
+        for ids in short:
+            counts.update(ids)
+        for doc_id, shared in counts.items():
+            if doc_id in exact:
+                continue
+            for ids in long:
+                if doc_id in ids:
+                    shared += 1
+            if shared >= minimum:
+                scored.append((shared / total, doc_id))
+        return [doc_id for _, doc_id in heapq.nlargest(limit, scored)]
+
+    async def load(self, collection):
+        """
+        Nạp lại toàn bộ index từ collection
+        """
+        started = time.perf_counter()
+        projection = {"_id": 0, "id": 1, **{field: 1 for field in self.fields}}
+        # Dựng index mới rồi thay một lần để các truy vấn đang chạy không thấy index dở dang
+        fresh = TrigramIndex(self.fields)
+        async for document in collection.find({}, projection):
+            if document.get("id"):
+                fresh.add(document)
+        self.postings, self.documents = fresh.postings, fresh.documents
+        self.ready = True
+        self.load_seconds = round(time.perf_counter() - started, 3)
+
+    def metrics(self):
+        return {
+            "ready": self.ready,
+            "documents": len(self.documents),
+            "trigrams": len(self.postings),
+            "load_seconds": self.load_seconds,
+        }
+
+
+candidate_ngrams = TrigramIndex(CANDIDATE_NGRAM_FIELDS)
+job_ngrams = TrigramIndex(JOB_NGRAM_FIELDS)
+
+
+async def load_ngram_indexes(db):
+    await candidate_ngrams.load(db.candidates)
+    await job_ngrams.load(db.jobs)
+
+
+def metrics():
+    return {"candidates": candidate_ngrams.metrics(), "jobs": job_ngrams.metrics()}
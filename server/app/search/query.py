@@ -0,0 +1,92 @@
+"""
+Điều kiện tìm kiếm cho tham số ``search`` của các route danh sách.
+
+- ``prefix`` (mặc định): mỗi từ nhập vào là tiền tố của một từ trong ``search_terms``,
+  dùng index multikey nên hợp với tìm kiếm theo từng phím gõ.
+- ``text``: dùng text index có trọng số, kết quả xếp theo độ liên quan.
+- ``fuzzy``: tìm chuỗi con không dấu và gần đúng bằng index trigram trong bộ nhớ
+  (app/search/ngram.py), kết quả xếp theo độ liên quan.
+- ``regex``: tìm chuỗi con không phân biệt hoa thường như trước đây, quét toàn bộ collection.
+"""
+
+import re
+from enum import Enum
+
+from ..db.indexes import index
+from .terms import TERMS_FIELD, tokenize
+
+
+class SearchMode(str, Enum):
+    PREFIX = "prefix"
+    TEXT = "text"
+    FUZZY = "fuzzy"
+    REGEX = "regex"
+
+
+# Trọng số của text index: khớp tên/tiêu đề quan trọng hơn khớp email hay mô tả
+CANDIDATE_TEXT_WEIGHTS = {"name": 10, "position": 5, "email": 3}
+JOB_TEXT_WEIGHTS = {"title": 10, "department": 5, "description": 1}
+
+# Xếp theo độ liên quan, id để thứ tự ổn định giữa các trang
+TEXT_SORT = [("score", {"$meta": "textScore"}), ("id", 1)]
+
+
+def text_index(weights, name):
+    """
+    Khai báo text index cho ``register_indexes``; ngôn ngữ "none" để không áp dụng
+    stemming tiếng Anh cho dữ liệu tiếng Việt
+    """
+    return index(
+        *[(field, "text") for field in weights],
+        weights=weights,
+        default_language="none",
+        name=name,
+    )
+
+
+def prefix_index():
+    return index(TERMS_FIELD)
+
+
+def search_query(search, mode, regex_fields):
+    """
+    Điều kiện tìm kiếm theo chế độ
+
+    Args:
+        search: Chuỗi người dùng nhập
+        mode: SearchMode
+        regex_fields: Các trường được so khớp ở chế độ regex
+
+    Returns:
+        dict: Điều kiện để gộp vào bộ lọc của route (rỗng nếu không có gì để tìm)
+    """
+    if mode == SearchMode.TEXT:
+        return {"$text": {"$search": search}}
+
+    if mode in (SearchMode.REGEX, SearchMode.FUZZY):
+        # fuzzy chỉ tới đây khi index trigram chưa nạp xong
+        pattern = re.escape(search.strip())
+        return {"$or": [{field: {"$regex": pattern, "$options": "i"}} for field in regex_fields]}
+
+    # Regex neo đầu chuỗi, phân biệt hoa thường trên dữ liệu đã chuẩn hóa: dùng được index
+    clauses = [{TERMS_FIELD: {"$regex": f"^{re.escape(token)}"}} for token in tokenize(search)]
+    if not clauses:
+        return {}
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def merge_filter(query, condition):
+    """
+    Gộp một điều kiện vào bộ lọc; khi trùng khóa (ví dụ cùng có ``$and``) thì thêm vào ``$and``
+    """
+    if not condition:
+        return query
+    if set(condition).isdisjoint(query):
+        query.update(condition)
+    else:
+        query["$and"] = query.get("$and", []) + [condition]
+    return query
+
+
+def search_sort(mode, default):
+    return TEXT_SORT if mode == SearchMode.TEXT else default
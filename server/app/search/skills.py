@@ -0,0 +1,139 @@
+"""
+Chuẩn hóa kỹ năng của ứng viên cho bộ lọc ``skills_all`` / ``skills_any`` / ``skills_none``.
+
+Mỗi ứng viên lưu ``skill_tokens``: kỹ năng đã bỏ dấu, viết thường và đổi về tên chuẩn
+theo ``SKILL_SYNONYMS`` ("JS", "javascript" -> "javascript"). Bộ lọc chạy trên index
+multikey của trường này. ``SkillDictionary`` giữ trong bộ nhớ số ứng viên của từng kỹ
+năng để đặt kỹ năng hiếm nhất lên đầu ``$all``: MongoDB dùng phần tử đầu để giới hạn
+khoảng quét index, nên truy vấn nhiều kỹ năng chỉ đọc các ứng viên có kỹ năng hiếm nhất
+(và trả về rỗng ngay nếu kỹ năng đó chưa từng xuất hiện).
+"""
+
+import time
+from functools import lru_cache
+
+from .terms import fold
+
+SKILLS_FIELD = "skill_tokens"
+
+# Tên gọi khác -> tên chuẩn (đã bỏ dấu, viết thường)
+SKILL_SYNONYMS = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "nodejs": "node",
+    "node.js": "node",
+    "postgres": "postgresql",
+    "mongo": "mongodb",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "aws cloud": "aws",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+}
+
+
+@lru_cache(maxsize=4096)
+def canonical_skill(skill):
+    token = " ".join(fold(skill).split())
+    return SKILL_SYNONYMS.get(token, token)
+
+
+def skill_tokens(skills):
+    """
+    Danh sách kỹ năng chuẩn hóa, không trùng, của một ứng viên
+    """
+    if not skills:
+        return []
+    return sorted({canonical_skill(skill) for skill in skills if isinstance(skill, str) and skill.strip()})
+
+
+def parse_skills(value):
+    """
+    Tách tham số dạng "python, JS,react" thành các kỹ năng chuẩn hóa
+    """
+    if not value:
+        return []
+    return skill_tokens(value.split(","))
+
+
+class SkillDictionary:
+    """
+    Số ứng viên của từng kỹ năng chuẩn hóa, nạp khi khởi động và cập nhật khi ghi ứng viên
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.ready = False
+        self.load_seconds = None
+
+    def add(self, tokens):
+        for token in tokens:
+            self.counts[token] = self.counts.get(token, 0) + 1
+
+    def remove(self, tokens):
+        for token in tokens:
+            count = self.counts.get(token, 0) - 1
+            if count > 0:
+                self.counts[token] = count
+            else:
+                self.counts.pop(token, None)
+
+    def update(self, old_tokens, new_tokens):
+        self.remove(old_tokens)
+        self.add(new_tokens)
+
+    def by_rarity(self, tokens):
+        # Kỹ năng chưa biết (số đếm 0) đứng đầu; số đếm chỉ dùng để sắp xếp nên dữ liệu
+        # do worker khác ghi mà chưa có trong từ điển vẫn được tìm thấy
+        return sorted(tokens, key=lambda token: self.counts.get(token, 0))
+
+    async def load(self, collection):
+        started = time.perf_counter()
+        pipeline = [
+            {"$unwind": f"${SKILLS_FIELD}"},
+            {"$group": {"_id": f"${SKILLS_FIELD}", "count": {"$sum": 1}}},
+        ]
+        self.counts = {row["_id"]: row["count"] async for row in collection.aggregate(pipeline)}
+        self.ready = True
+        self.load_seconds = round(time.perf_counter() - started, 3)
+
+    def metrics(self):
+        return {"ready": self.ready, "skills": len(self.counts), "load_seconds": self.load_seconds}
+
+
+skill_dictionary = SkillDictionary()
+
+
+def skills_query(skills_all=None, skills_any=None, skills_none=None, dictionary=skill_dictionary):
+    """
+    Điều kiện lọc theo kỹ năng
+
+    Returns:
+        dict: Điều kiện để gộp vào bộ lọc (rỗng nếu không lọc theo kỹ năng)
+    """
+    all_tokens = parse_skills(skills_all)
+    any_tokens = parse_skills(skills_any)
+    none_tokens = parse_skills(skills_none)
+
+    clauses = []
+    if all_tokens:
+        clauses.append({SKILLS_FIELD: {"$all": dictionary.by_rarity(all_tokens)}})
+    if any_tokens:
+        clauses.append({SKILLS_FIELD: {"$in": any_tokens}})
+    if none_tokens:
+        clauses.append({SKILLS_FIELD: {"$nin": none_tokens}})
+    if not clauses:
+        return {}
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
@@ -0,0 +1,261 @@
+"""
+Index tiền tố trong bộ nhớ cho gợi ý khi gõ (``/suggest``).
+
+Mỗi trường gợi ý giữ một mảng khóa đã sắp xếp; khóa là phần đuôi bắt đầu từ mỗi từ của
+giá trị (đã bỏ dấu, viết thường) nối với giá trị đầy đủ, nên "van" gợi ý được
+"Nguyễn Văn An". Truy vấn tìm khoảng khóa có tiền tố bằng tìm kiếm nhị phân và lấy
+top-k giá trị theo số tài liệu chứa giá trị đó; kết quả được cache tới lần ghi kế tiếp.
+
+Số khóa của mỗi trường bị giới hạn bởi ``SUGGEST_MAX_KEYS``: khi vượt quá, các giá trị
+ít gặp nhất bị loại.
+
+Như index trigram, route ghi chỉ cập nhật index của worker hiện tại; giá trị do worker khác
+ghi xuất hiện sau lần dựng lại định kỳ kế tiếp (``SEARCH_INDEX_REFRESH_SECONDS``).
+"""
+
+import heapq
+import os
+import sys
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from .terms import fold
+
+MAX_KEYS = int(os.getenv("SUGGEST_MAX_KEYS", "200000"))
+
+# Số truy vấn gần nhất được cache cho mỗi trường
+CACHE_SIZE = 1024
+
+# Khoảng khóa rộng hơn mức này (tiền tố ngắn, phổ biến) thì duyệt giá trị theo tần suất
+# giảm dần và dừng khi đủ kết quả, thay vì đọc hết khoảng khóa
+WIDE_RANGE = 1024
+
+# Khi vượt MAX_KEYS, giữ lại tỷ lệ này để không phải loại bỏ sau mỗi lần ghi
+PRUNE_RATIO = 0.9
+
+_SEPARATOR = "\x00"
+_END = "\uffff"
+
+# trường gợi ý -> các (collection, trường trong tài liệu)
+SUGGEST_SOURCES = {
+    "name": (("candidates", "name"),),
+    "title": (("jobs", "title"),),
+    "skill": (("candidates", "skills"),),
+    "department": (("candidates", "department"), ("jobs", "department")),
+}
+
+
+def normalize(text):
+    return " ".join(fold(text).split())
+
+
+def _values(document, field):
+    value = document.get(field)
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str) and item.strip()]
+    return [value] if isinstance(value, str) and value.strip() else []
+
+
+class PrefixIndex:
+    """
+    Mảng khóa đã sắp xếp kèm số lần xuất hiện của mỗi giá trị
+    """
+
+    def __init__(self, max_keys=MAX_KEYS):
+        self.max_keys = max_keys
+        self.keys = []
+        # giá trị đã chuẩn hóa -> [số tài liệu, giá trị hiển thị]
+        self.values = {}
+        self.cache = OrderedDict()
+        # Giá trị theo tần suất giảm dần, dựng lại khi cần sau mỗi lần ghi
+        self.by_count = None
+
+    def _changed(self):
+        self.cache.clear()
+        self.by_count = None
+
+    @staticmethod
+    def _keys_of(value):
+        words = value.split(" ")
+        return [f"{' '.join(words[position:])}{_SEPARATOR}{value}" for position in range(len(words))]
+
+    def add(self, label):
+        value = normalize(label)
+        if not value:
+            return
+        self._changed()
+        entry = self.values.get(value)
+        if entry is not None:
+            entry[0] += 1
+            return
+        self.values[value] = [1, label.strip()]
+        for key in self._keys_of(value):
+            insort(self.keys, key)
+        if len(self.keys) > self.max_keys:
+            self._prune()
+
+    def discard(self, label):
+        value = normalize(label)
+        entry = self.values.get(value)
+        if entry is None:
+            return
+        self._changed()
+        entry[0] -= 1
+        if entry[0] <= 0:
+            self._delete(value)
+
+    def _delete(self, value):
+        del self.values[value]
+        for key in self._keys_of(value):
+            position = bisect_left(self.keys, key)
+            if position < len(self.keys) and self.keys[position] == key:
+                del self.keys[position]
+
+    def _prune(self):
+        # Loại các giá trị ít gặp nhất tới khi số khóa còn PRUNE_RATIO * max_keys
+        excess = len(self.keys) - int(self.max_keys * PRUNE_RATIO)
+        removed = set()
+        for value in sorted(self.values, key=lambda value: self.values[value][0]):
+            if excess <= 0:
+                break
+            removed.add(value)
+            excess -= value.count(" ") + 1
+        for value in removed:
+            del self.values[value]
+        self.keys = [key for key in self.keys if key.rsplit(_SEPARATOR, 1)[1] not in removed]
+
+    @classmethod
+    def build(cls, values, max_keys=MAX_KEYS):
+        """
+        Dựng index từ bảng giá trị chuẩn hóa -> [số tài liệu, giá trị hiển thị], sắp xếp khóa một lần
+        """
+        index = cls(max_keys)
+        index.values = values
+        index.keys = sorted(key for value in values for key in cls._keys_of(value))
+        if len(index.keys) > max_keys:
+            index._prune()
+        index.by_count = sorted(index.values, key=lambda value: -index.values[value][0])
+        return index
+
+    def complete(self, prefix, limit=10):
+        """
+        Top ``limit`` giá trị có một từ bắt đầu bằng ``prefix``, xếp theo số tài liệu
+
+        Returns:
+            list: Các cặp (giá trị hiển thị, số tài liệu)
+        """
+        prefix = normalize(prefix)
+        cached = self.cache.get((prefix, limit))
+        if cached is not None:
+            self.cache.move_to_end((prefix, limit))
+            return cached
+
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + _END, start)
+        if end - start > WIDE_RANGE:
+            top = self._scan_by_count(prefix, limit)
+        else:
+            matches = {key.rsplit(_SEPARATOR, 1)[1] for key in self.keys[start:end]}
+            top = heapq.nlargest(limit, matches, key=lambda value: self.values[value][0])
+        result = sorted(((self.values[value][1], self.values[value][0]) for value in top), key=lambda item: -item[1])
+
+        self.cache[(prefix, limit)] = result
+        if len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return result
+
+    def _scan_by_count(self, prefix, limit):
+        if self.by_count is None:
+            self.by_count = sorted(self.values, key=lambda value: -self.values[value][0])
+        word_prefix = f" {prefix}"
+        top = []
+        for value in self.by_count:
+            if value.startswith(prefix) or word_prefix in value:
+                top.append(value)
+                if len(top) == limit:
+                    break
+        return top
+
+    def size_bytes(self):
+        """
+        Ước lượng bộ nhớ của index (mảng khóa, chuỗi và bảng giá trị)
+        """
+        total = sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+        total += sys.getsizeof(self.values) + sys.getsizeof(self.by_count or [])
+        for value, entry in self.values.items():
+            total += sys.getsizeof(value) + sys.getsizeof(entry) + sys.getsizeof(entry[1])
+        return total
+
+
+class Suggestions:
+    """
+    Các index gợi ý của ứng dụng, cập nhật theo tài liệu được ghi vào từng collection
+    """
+
+    def __init__(self, sources=SUGGEST_SOURCES, max_keys=MAX_KEYS):
+        self.sources = sources
+        self.max_keys = max_keys
+        self.indexes = {field: PrefixIndex(max_keys) for field in sources}
+        self.ready = False
+        self.load_seconds = None
+
+    def _fields(self, collection_name):
+        for field, sources in self.sources.items():
+            for source_collection, source_field in sources:
+                if source_collection == collection_name:
+                    yield field, source_field
+
+    def add(self, collection_name, document):
+        for field, source_field in self._fields(collection_name):
+            for label in _values(document, source_field):
+                self.indexes[field].add(label)
+
+    def remove(self, collection_name, document):
+        for field, source_field in self._fields(collection_name):
+            for label in _values(document, source_field):
+                self.indexes[field].discard(label)
+
+    def update(self, collection_name, old_document, new_document):
+        self.remove(collection_name, old_document)
+        self.add(collection_name, new_document)
+
+    def complete(self, field, prefix, limit=10):
+        return self.indexes[field].complete(prefix, limit)
+
+    async def load(self, db):
+        """
+        Dựng lại toàn bộ index từ database rồi thay một lần
+        """
+        started = time.perf_counter()
+        values = {field: {} for field in self.sources}
+        for collection_name in {source[0] for sources in self.sources.values() for source in sources}:
+            fields = list(self._fields(collection_name))
+            projection = {"_id": 0, **{source_field: 1 for _, source_field in fields}}
+            async for document in db[collection_name].find({}, projection):
+                for field, source_field in fields:
+                    for label in _values(document, source_field):
+                        value = normalize(label)
+                        if value:
+                            values[field].setdefault(value, [0, label.strip()])[0] += 1
+        self.indexes = {field: PrefixIndex.build(values[field], self.max_keys) for field in self.sources}
+        self.ready = True
+        self.load_seconds = round(time.perf_counter() - started, 3)
+
+    def metrics(self):
+        return {
+            "ready": self.ready,
+            "load_seconds": self.load_seconds,
+            "fields": {
+                field: {
+                    "keys": len(index.keys),
+                    "values": len(index.values),
+                    "max_keys": index.max_keys,
+                    "bytes": index.size_bytes(),
+                }
+                for field, index in self.indexes.items()
+            },
+        }
+
+
+suggestions = Suggestions()
@@ -0,0 +1,78 @@
+"""
+Tách từ khóa tìm kiếm cho chế độ tìm theo tiền tố.
+
+Mỗi tài liệu lưu sẵn mảng ``search_terms`` gồm các từ đã bỏ dấu và viết thường của
+các trường được tìm kiếm. Index multikey trên mảng này cho phép tìm bằng regex neo
+đầu chuỗi (``^ngu``) mà MongoDB chuyển được thành khoảng quét trên index.
+"""
+
+import re
+import unicodedata
+
+# Các trường được tìm theo tiền tố (mô tả công việc dài nên chỉ tìm bằng chế độ text)
+CANDIDATE_SEARCH_FIELDS = ("name", "email", "position")
+JOB_SEARCH_FIELDS = ("title", "department")
+
+TERMS_FIELD = "search_terms"
+
+_SPLIT = re.compile(r"[^\w@.+-]+")
+_SEPARATOR = re.compile(r"[@.+-]")
+
+
+def fold(text):
+    """
+    Bỏ dấu tiếng Việt và viết thường: "Nguyễn Đức" -> "nguyen duc"
+    """
+    text = unicodedata.normalize("NFKD", str(text)).replace("đ", "d").replace("Đ", "D")
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    """
+    Tách chuỗi thành các từ đã chuẩn hóa, giữ nguyên thứ tự và bỏ trùng
+    """
+    tokens = []
+    for token in _SPLIT.split(fold(text)):
+        token = token.strip(".-+")
+        if token and token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def search_terms(document, fields):
+    """
+    Danh sách từ khóa của một tài liệu cho trường ``search_terms``
+
+    Email và từ có dấu nối được giữ nguyên và tách thêm theo @ . + -, để
+    "nguyen.van.a@example.com" tìm được bằng "nguyen", "van" hay cả địa chỉ.
+    """
+    terms = set()
+    for field in fields:
+        value = document.get(field)
+        if not value:
+            continue
+        for token in tokenize(value):
+            terms.add(token)
+            if _SEPARATOR.search(token):
+                terms.update(part for part in _SEPARATOR.split(token) if part)
+    return sorted(terms)
+
+
+def search_changes(current, update_data, fields):
+    """
+    Giá trị ``search_terms`` mới khi cập nhật tài liệu, hoặc None nếu các trường
+    tìm kiếm không đổi
+    """
+    if not any(field in update_data for field in fields):
+        return None
+    return search_terms({**current, **update_data}, fields)
+
+
+def search_update(update_data, fields):
+    """
+    Giá trị ``search_terms`` tính riêng từ dữ liệu cập nhật khi nó có đủ các trường tìm
+    kiếm (để ghi cùng lệnh cập nhật), hoặc None nếu cần giá trị hiện tại của tài liệu
+    """
+    if all(field in update_data for field in fields):
+        return search_terms(update_data, fields)
+    return None
@@ -0,0 +1,92 @@
+"""
+Hàm dùng chung cho các benchmark trong thư mục này.
+
+Benchmark cần MongoDB tạo dữ liệu trong database riêng ``<DATABASE_NAME>_bench`` (xem
+``bench_database``), database này bị xóa khi chạy xong trừ khi truyền ``--keep``.
+Chạy từ thư mục server:
+
+    python -m benchmarks.<tên>
+"""
+
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from app.db.database import create_sync_database
+from app.models.ids import new_id
+
+WORDS = "kinh nghiệm phát triển hệ thống quản lý dự án khách hàng dữ liệu thiết kế kiểm thử triển khai".split()
+
+
+def add_keep_argument(parser):
+    parser.add_argument("--keep", action="store_true", help="Giữ lại database benchmark")
+
+
+@contextmanager
+def bench_database(keep=False):
+    """
+    Database ``<DATABASE_NAME>_bench`` rỗng, bị xóa khi ra khỏi khối nếu ``keep`` là False
+    """
+    app_db = create_sync_database()
+    db = app_db.client[f"{app_db.name}_bench"]
+    db.client.drop_database(db.name)
+    try:
+        yield db
+    finally:
+        if not keep:
+            db.client.drop_database(db.name)
+
+
+def fill(collection, make, size, batch_size=10000):
+    """
+    Thêm tài liệu ``make(index)`` cho tới khi collection có ``size`` tài liệu, nên gọi lần
+    lượt với các kích thước tăng dần chỉ tạo phần còn thiếu
+    """
+    count = collection.estimated_document_count()
+    for start in range(count, size, batch_size):
+        collection.insert_many([make(index) for index in range(start, min(start + batch_size, size))], ordered=False)
+
+
+def timed(run, repeat, clock=time.perf_counter):
+    """
+    Trung vị thời gian (ms) của ``repeat`` lần gọi ``run``; ``clock=time.process_time`` để đo thời gian CPU
+    """
+    timings = []
+    for _ in range(repeat):
+        started = clock()
+        run()
+        timings.append((clock() - started) * 1000)
+    return statistics.median(timings)
+
+
+def text(words):
+    return " ".join(random.choices(WORDS, k=words))
+
+
+def fake_candidate(index):
+    """
+    Ứng viên đầy đủ các trường như tài liệu thật (ghi chú, học vấn... dài)
+    """
+    return {
+        "id": new_id(),
+        "name": f"Candidate {index}",
+        "email": f"candidate{index}@example.com",
+        "phone": f"09{index:08d}",
+        "status": "new",
+        "job_id": new_id(),
+        "department": random.choice(["Engineering", "Sales", "HR", "Marketing"]),
+        "position": "Developer",
+        "address": text(8),
+        "career_goal": text(60),
+        "educations": [text(40) for _ in range(2)],
+        "experience": random.randint(0, 15),
+        "skills": random.sample(["Python", "Go", "React", "SQL", "Docker", "AWS", "Figma"], 4),
+        "notes": text(200),
+        "source": "website",
+        "total_score": round(random.uniform(0, 10), 1),
+        "applied_date": datetime(2024, 1, 1),
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+    }
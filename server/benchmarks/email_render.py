@@ -0,0 +1,72 @@
+"""
+Đo chi phí CPU để tạo một email (render template và mã hóa cho Gmail API) theo từng cách:
+
+- ``emailmessage``: cách cũ, dựng ``EmailMessage`` mới cho mỗi email rồi mã hóa base64
+- ``template``: ``TemplateRegistry.build``, chỉ thay biến vào skeleton MIME dựng sẵn
+- ``batch``: ``TemplateRegistry.build_batch`` cho cả lô
+
+Không cần MongoDB hay tài khoản Google.
+
+    python -m benchmarks.email_render --messages 5000
+"""
+
+import argparse
+import base64
+import time
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from app.email.templates import FIELD_EXTRACTORS, TemplateRegistry
+
+
+def fake_payload(kind, index):
+    if kind == "interview":
+        return {
+            "candidate_email": f"candidate{index}@example.com",
+            "scheduled_date": datetime(2026, 1, 5, 9) + timedelta(minutes=30 * index),
+            "duration_minutes": 45,
+            "location": "Tầng 3, 123 Nguyễn Huệ, TP. Hồ Chí Minh",
+            "type": "technical",
+            "description": "Phỏng vấn kỹ thuật với trưởng nhóm backend",
+        }
+    return {"candidate": {"email": f"candidate{index}@example.com"}, "job": {"title": "Kỹ sư phần mềm"}}
+
+
+def email_message_build(registry, kind, payload):
+    to, fields = FIELD_EXTRACTORS[kind](payload)
+    subject, body = registry.get(kind).render(fields)
+    message = EmailMessage()
+    message["To"] = to
+    message["From"] = registry.sender
+    message["Subject"] = subject
+    message.add_alternative(body, subtype="html")
+    return to, {"raw": base64.urlsafe_b64encode(message.as_bytes()).decode()}
+
+
+def cpu_seconds(build, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        build()
+        timings.append(time.process_time() - started)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark render email")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    registry = TemplateRegistry()
+    for kind in ("interview", "acceptance"):
+        payloads = [fake_payload(kind, index) for index in range(args.messages)]
+        builders = {
+            "emailmessage": lambda: [email_message_build(registry, kind, payload) for payload in payloads],
+            "template": lambda: [registry.build(kind, payload) for payload in payloads],
+            "batch": lambda: registry.build_batch(kind, payloads),
+        }
+        print(f"{kind}, {args.messages} email:")
+        for name, build in builders.items():
+            seconds = cpu_seconds(build, args.repeat)
+            print(f"  {name}: {seconds / args.messages * 1e6:.1f} µs/email, {args.messages / seconds:.0f} email/s")
@@ -0,0 +1,122 @@
+"""
+Đo thông lượng gửi email của ``GmailClient``: gửi từng email (một HTTP request mỗi email)
+so với Gmail batch request (tối đa 100 email mỗi request).
+
+Không gọi Google: service Gmail được thay bằng stub giả lập một lượt HTTP với độ trễ
+``--latency`` (ms) cho mỗi request, kể cả batch request. Template, chia batch và
+rate limiter là code thật.
+
+    python -m benchmarks.email_send --messages 200 --latency 80
+    python -m benchmarks.email_send --quota 250      # áp dụng quota Gmail (unit/giây)
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from types import SimpleNamespace
+
+from app.email.ratelimit import TokenBucket
+from app.email.sendemail import MAX_BATCH_SIZE, SEND_QUOTA_UNITS, GmailClient
+from app.email.token_cache import TokenCache
+
+# Không giới hạn tốc độ khi không truyền --quota
+UNLIMITED = 1e12
+
+
+class StubRequest:
+    def __init__(self, service, body):
+        self.service = service
+        self.body = body
+
+    def execute(self):
+        self.service.round_trip()
+        return {"id": f"stub-{self.service.requests}"}
+
+
+class StubBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        # Cả batch là một lượt HTTP
+        self.service.round_trip()
+        for request_id, request in self.requests:
+            self.callback(request_id, {"id": f"stub-{request_id}"}, None)
+
+
+class StubGmailService:
+    """
+    Giả lập ``users().messages().send()`` và ``new_batch_http_request()`` của Gmail API
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests = 0
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def send(self, userId, body):
+        return StubRequest(self, body)
+
+    def new_batch_http_request(self, callback):
+        return StubBatch(self, callback)
+
+    def round_trip(self):
+        self.requests += 1
+        time.sleep(self.latency)
+
+
+def stub_client(latency, quota):
+    client = GmailClient(
+        None, None, None, None, None,
+        token_cache=TokenCache(None),
+        rate_limiter=TokenBucket(quota, capacity=SEND_QUOTA_UNITS * MAX_BATCH_SIZE),
+    )
+    client._service = StubGmailService(latency)
+    client._credentials = SimpleNamespace(valid=True, expired=False)
+    return client
+
+
+def rejection(index):
+    return "rejection", {
+        "candidate": {"email": f"candidate{index}@example.com", "name": f"Ứng viên {index}"},
+        "job": {"title": "Backend Developer"},
+    }
+
+
+def measure(client, send, messages):
+    started = time.perf_counter()
+    # GmailClient in một dòng cho mỗi email đã gửi
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = send(client, messages)
+    seconds = time.perf_counter() - started
+    return sum(results), client._service.requests, seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark gửi email qua Gmail batch request")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=80, help="Độ trễ mỗi HTTP request (ms)")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--quota", type=float, default=UNLIMITED, help="Quota Gmail (unit/giây)")
+    args = parser.parse_args()
+
+    messages = [rejection(index) for index in range(args.messages)]
+    senders = {
+        "từng email": lambda client, messages: [client.send(kind, payload) for kind, payload in messages],
+        f"batch {args.batch_size}": lambda client, messages: client.send_bulk(messages, batch_size=args.batch_size),
+    }
+    print(f"{args.messages} email, {args.latency:g} ms mỗi HTTP request:")
+    for name, send in senders.items():
+        sent, requests, seconds = measure(stub_client(args.latency / 1000, args.quota), send, messages)
+        print(f"  {name}: {sent} email, {requests} HTTP request, {seconds:.2f}s, {sent / seconds:.0f} email/s")
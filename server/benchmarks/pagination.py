@@ -0,0 +1,41 @@
+"""
+So sánh độ trễ đọc trang sâu bằng ``skip`` với phân trang theo cursor (keyset)
+ở các kích thước collection khác nhau.
+
+    python -m benchmarks.pagination --sizes 10000 100000 1000000
+"""
+
+import argparse
+
+from app.models.ids import new_id
+from app.routes.pagination import keyset_filter, DEFAULT_SORT
+
+from .common import add_keep_argument, bench_database, fill, timed
+
+
+def short_candidate(index):
+    return {"id": new_id(), "name": f"Candidate {index}", "status": "new"}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark phân trang skip và cursor")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_keep_argument(parser)
+    args = parser.parse_args()
+
+    with bench_database(args.keep) as db:
+        collection = db.candidates
+        collection.create_index("id", unique=True)
+        for size in sorted(args.sizes):
+            fill(collection, short_candidate, size)
+            # Trang gần cuối collection
+            offset = size - args.page_size
+            last_before = collection.find({}, {"id": 1}).sort(DEFAULT_SORT).skip(offset - 1).limit(1).next()
+
+            skip_ms = timed(lambda: list(collection.find().sort(DEFAULT_SORT).skip(offset).limit(args.page_size)), args.repeat)
+            cursor_ms = timed(lambda: list(
+                collection.find(keyset_filter(DEFAULT_SORT, [last_before["id"]])).sort(DEFAULT_SORT).limit(args.page_size)
+            ), args.repeat)
+            print(f"{size:>9} tài liệu, trang ở vị trí {offset}: skip {skip_ms:.1f} ms, cursor {cursor_ms:.1f} ms")
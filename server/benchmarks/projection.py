@@ -0,0 +1,49 @@
+"""
+Đo kích thước và độ trễ của một trang danh sách 100 dòng khi trả về tài liệu đầy đủ
+so với chỉ các trường của ``view=summary`` (đọc từ MongoDB, kiểm tra bằng model và
+chuyển thành JSON như route).
+
+    python -m benchmarks.projection --size 10000
+"""
+
+import argparse
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models.candidate import Candidate
+from app.routes.candidates import CANDIDATE_SUMMARY_FIELDS
+from app.routes.pagination import DEFAULT_SORT
+from app.routes.projection import mongo_projection, partial_model
+
+from .common import add_keep_argument, bench_database, fake_candidate, fill, timed
+
+PAGE_SIZE = 100
+
+
+def read_page(collection, adapter, projection):
+    documents = list(collection.find({}, projection).sort(DEFAULT_SORT).limit(PAGE_SIZE))
+    return adapter.dump_json(adapter.validate_python(documents))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark trang danh sách đầy đủ và view=summary")
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    add_keep_argument(parser)
+    args = parser.parse_args()
+
+    with bench_database(args.keep) as db:
+        collection = db.candidates
+        collection.create_index("id")
+        fill(collection, fake_candidate, args.size)
+        fields = tuple(dict.fromkeys(["id", *CANDIDATE_SUMMARY_FIELDS]))
+        variants = {
+            "full": (TypeAdapter(List[Candidate]), None),
+            "summary": (TypeAdapter(List[partial_model(Candidate, fields)]), mongo_projection(fields)),
+        }
+        print(f"{args.size} ứng viên, trang {PAGE_SIZE} dòng:")
+        for name, (adapter, projection) in variants.items():
+            size = len(read_page(collection, adapter, projection))
+            latency = timed(lambda: read_page(collection, adapter, projection), args.repeat)
+            print(f"  {name}: {size / 1024:.1f} KiB, {latency:.1f} ms")
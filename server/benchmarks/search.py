@@ -0,0 +1,125 @@
+"""
+So sánh độ trễ tìm kiếm ứng viên và công việc ở các chế độ ``search_mode``
+(regex cũ, prefix, text, fuzzy) ở các kích thước collection khác nhau.
+
+    python -m benchmarks.search --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from app.models.ids import new_id
+from app.routes.pagination import DEFAULT_SORT
+from app.search.ngram import CANDIDATE_NGRAM_FIELDS, JOB_NGRAM_FIELDS, TrigramIndex
+from app.search.query import (
+    CANDIDATE_TEXT_WEIGHTS,
+    JOB_TEXT_WEIGHTS,
+    SearchMode,
+    prefix_index,
+    search_query,
+    search_sort,
+    text_index,
+)
+from app.search.terms import CANDIDATE_SEARCH_FIELDS, JOB_SEARCH_FIELDS, TERMS_FIELD, search_terms
+
+from .common import add_keep_argument, bench_database, fill, timed
+
+LAST_NAMES = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ", "Võ", "Đặng", "Bùi", "Đỗ"]
+MIDDLE_NAMES = ["Văn", "Thị", "Minh", "Đức", "Thanh", "Ngọc", "Quốc", "Hải", "Gia", "Bảo"]
+FIRST_NAMES = ["An", "Bình", "Châu", "Dũng", "Giang", "Hà", "Khoa", "Linh", "Nam", "Phúc", "Quân", "Trang", "Tú", "Vy"]
+POSITIONS = ["Backend Developer", "Frontend Developer", "Data Engineer", "QA Engineer", "DevOps Engineer",
+             "Product Manager", "Business Analyst", "UI/UX Designer", "Mobile Developer", "HR Specialist"]
+DEPARTMENTS = ["Engineering", "Product", "Design", "Data", "Human Resources", "Marketing", "Sales"]
+WORDS = ("we are looking for an experienced engineer to build scalable services with python mongodb "
+         "kubernetes react and cloud infrastructure you will collaborate with product design and data "
+         "teams mentor junior members and own features end to end").split()
+
+# (collection, chuỗi tìm kiếm như người dùng gõ)
+QUERIES = [
+    ("candidates", "nguy"),
+    ("candidates", "nguyen van"),
+    ("candidates", "backend"),
+    ("jobs", "engin"),
+    ("jobs", "data engineer"),
+]
+
+REGEX_FIELDS = {
+    "candidates": CANDIDATE_SEARCH_FIELDS,
+    "jobs": ("title", "description", "department"),
+}
+
+
+def named_candidate(index):
+    name = f"{random.choice(LAST_NAMES)} {random.choice(MIDDLE_NAMES)} {random.choice(FIRST_NAMES)}"
+    candidate = {
+        "id": new_id(),
+        "name": name,
+        "email": f"candidate{index}@example.com",
+        "position": random.choice(POSITIONS),
+        "status": "new",
+    }
+    candidate[TERMS_FIELD] = search_terms(candidate, CANDIDATE_SEARCH_FIELDS)
+    return candidate
+
+
+def fake_job(index):
+    job = {
+        "id": new_id(),
+        "title": f"{random.choice(['Junior', 'Senior', 'Lead'])} {random.choice(POSITIONS)}",
+        "department": random.choice(DEPARTMENTS),
+        "description": " ".join(random.choices(WORDS, k=120)),
+        "status": "open",
+    }
+    job[TERMS_FIELD] = search_terms(job, JOB_SEARCH_FIELDS)
+    return job
+
+
+def create_indexes(db):
+    for collection_name, weights in (("candidates", CANDIDATE_TEXT_WEIGHTS), ("jobs", JOB_TEXT_WEIGHTS)):
+        db[collection_name].create_index("id", unique=True)
+        for keys, options in (prefix_index(), text_index(weights, f"{collection_name}_text")):
+            db[collection_name].create_index(keys, **options)
+
+
+def build_ngrams(db):
+    ngrams = {}
+    for collection_name, fields in (("candidates", CANDIDATE_NGRAM_FIELDS), ("jobs", JOB_NGRAM_FIELDS)):
+        ngrams[collection_name] = TrigramIndex(fields)
+        for document in db[collection_name].find({}, {"_id": 0, "id": 1, **{field: 1 for field in fields}}):
+            ngrams[collection_name].add(document)
+    return ngrams
+
+
+def search(collection, text, mode, limit, ngrams):
+    if mode == SearchMode.FUZZY:
+        # Xếp hạng trong bộ nhớ rồi lấy tài liệu bằng một truy vấn $in
+        ids = ngrams[collection.name].search(text)[:limit]
+        return list(collection.find({"id": {"$in": ids}}))
+    query = search_query(text, mode, REGEX_FIELDS[collection.name])
+    return list(collection.find(query).sort(search_sort(mode, DEFAULT_SORT)).limit(limit))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark các chế độ tìm kiếm")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Số ứng viên; số công việc bằng 1/10")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_keep_argument(parser)
+    args = parser.parse_args()
+
+    with bench_database(args.keep) as db:
+        create_indexes(db)
+        for size in sorted(args.sizes):
+            fill(db.candidates, named_candidate, size)
+            fill(db.jobs, fake_job, size // 10)
+            started = time.perf_counter()
+            ngrams = build_ngrams(db)
+            print(f"{size} ứng viên, {size // 10} công việc (nạp index trigram {time.perf_counter() - started:.1f} s):")
+            for collection_name, text in QUERIES:
+                timings = ", ".join(
+                    f"{mode.value} {timed(lambda: search(db[collection_name], text, mode, args.limit, ngrams), args.repeat):.1f} ms"
+                    for mode in SearchMode
+                )
+                print(f"  {collection_name} '{text}': {timings}")
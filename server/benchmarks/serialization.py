@@ -0,0 +1,63 @@
+"""
+Đo thời gian CPU để tuần tự hóa một trang 100 ứng viên theo từng cách:
+
+- ``fastapi``: cách cũ của FastAPI (kiểm tra theo ``response_model``, chuyển thành kiểu
+  JSON rồi mã hóa bằng ``json`` của thư viện chuẩn)
+- ``validated``: kiểm tra một lần bằng TypeAdapter dùng lại và ghi thẳng ra JSON
+- ``trusted``: ``TRUSTED_OUTPUT=true``, không kiểm tra lại, mã hóa bằng orjson
+
+Không cần MongoDB: tài liệu được tạo giống tài liệu đọc từ collection (có ``_id`` và
+các trường tìm kiếm nội bộ).
+
+    python -m benchmarks.serialization --rows 100
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+from bson import ObjectId
+from pydantic import TypeAdapter
+
+from app.db.migrations.runner import latest_version
+from app.models.candidate import Candidate
+from app.routes.responses import encode_items
+from app.search.skills import SKILLS_FIELD, skill_tokens
+from app.search.terms import CANDIDATE_SEARCH_FIELDS, TERMS_FIELD, search_terms
+
+from .common import fake_candidate, timed
+
+
+def stored_candidate(index):
+    candidate = fake_candidate(index)
+    candidate["_id"] = ObjectId()
+    candidate[TERMS_FIELD] = search_terms(candidate, CANDIDATE_SEARCH_FIELDS)
+    candidate[SKILLS_FIELD] = skill_tokens(candidate["skills"])
+    candidate["schema_version"] = latest_version("candidates")
+    return candidate
+
+
+def fastapi_encode(items, adapter=TypeAdapter(List[Candidate])):
+    return json.dumps(adapter.dump_python(adapter.validate_python(items), mode="json")).encode()
+
+
+def cpu_ms(encode, items, repeat):
+    return timed(lambda: encode(items), repeat, clock=time.process_time)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark tuần tự hóa danh sách ứng viên")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    items = [stored_candidate(index) for index in range(args.rows)]
+    encoders = {
+        "fastapi": fastapi_encode,
+        "validated": lambda items: encode_items(items, Candidate, trusted=False),
+        "trusted": lambda items: encode_items(items, Candidate, trusted=True),
+    }
+    print(f"{args.rows} ứng viên mỗi request:")
+    for name, encode in encoders.items():
+        print(f"  {name}: {cpu_ms(encode, items, args.repeat):.2f} ms CPU, {len(encode(items)) / 1024:.1f} KiB")
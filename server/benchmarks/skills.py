@@ -0,0 +1,84 @@
+"""
+Đo độ trễ lọc ứng viên theo kỹ năng: so khớp regex không phân biệt hoa thường trên
+``skills`` (quét toàn bộ) so với ``skill_tokens`` chuẩn hóa có index multikey.
+
+    python -m benchmarks.skills --sizes 10000 100000
+"""
+
+import argparse
+import random
+import re
+
+from app.models.ids import new_id
+from app.search.skills import SKILLS_FIELD, SkillDictionary, skill_tokens, skills_query
+
+from .common import add_keep_argument, bench_database, fill, timed
+
+# Kỹ năng phổ biến xuất hiện nhiều hơn (cách viết khác nhau như dữ liệu thật)
+SKILLS = ["Python", "python3", "JavaScript", "JS", "TypeScript", "React", "ReactJS", "Node.js", "Java", "Go",
+          "Golang", "Docker", "Kubernetes", "K8s", "AWS", "SQL", "PostgreSQL", "MongoDB", "Redis", "Kafka",
+          "Machine Learning", "ML", "Figma", "Excel", "Tiếng Anh", "Scrum", "Git", "Linux", "C#", "Rust"]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(SKILLS))]
+
+QUERIES = [
+    {"skills_all": "python,docker,aws,sql,git"},
+    {"skills_all": "js,react,typescript,node,git"},
+    {"skills_any": "rust,go,kafka", "skills_none": "java"},
+    {"skills_all": "python,ml", "skills_none": "excel"},
+]
+
+
+def skilled_candidate(index):
+    skills = list({random.choices(SKILLS, WEIGHTS)[0] for _ in range(random.randint(3, 10))})
+    return {
+        "id": new_id(),
+        "name": f"Candidate {index}",
+        "skills": skills,
+        SKILLS_FIELD: skill_tokens(skills),
+    }
+
+
+def regex_query(params):
+    """
+    Cách lọc không có trường chuẩn hóa: regex không phân biệt hoa thường trên từng kỹ năng
+    """
+    def match(skill):
+        return {"skills": {"$regex": f"^{re.escape(skill.strip())}$", "$options": "i"}}
+
+    clauses = [match(skill) for skill in params.get("skills_all", "").split(",") if skill]
+    if params.get("skills_any"):
+        clauses.append({"$or": [match(skill) for skill in params["skills_any"].split(",")]})
+    if params.get("skills_none"):
+        clauses.append({"$nor": [match(skill) for skill in params["skills_none"].split(",")]})
+    return {"$and": clauses}
+
+
+def docs_examined(collection, query):
+    explanation = collection.find(query).explain()
+    return explanation["executionStats"]["totalDocsExamined"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bộ lọc kỹ năng")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    add_keep_argument(parser)
+    args = parser.parse_args()
+
+    with bench_database(args.keep) as db:
+        collection = db.candidates
+        collection.create_index(SKILLS_FIELD)
+        for size in sorted(args.sizes):
+            fill(collection, skilled_candidate, size)
+            dictionary = SkillDictionary()
+            dictionary.add(token for document in collection.find({}, {SKILLS_FIELD: 1}) for token in document[SKILLS_FIELD])
+            print(f"{size} ứng viên:")
+            for params in QUERIES:
+                old = regex_query(params)
+                new = skills_query(dictionary=dictionary, **params)
+                old_ms = timed(lambda: list(collection.find(old)), args.repeat)
+                new_ms = timed(lambda: list(collection.find(new)), args.repeat)
+                print(
+                    f"  {params}: regex {old_ms:.1f} ms ({docs_examined(collection, old)} tài liệu đọc), "
+                    f"skill_tokens {new_ms:.1f} ms ({docs_examined(collection, new)} tài liệu đọc)"
+                )
@@ -0,0 +1,122 @@
+"""
+So sánh pipeline phân tích cũ ($toLower trong $expr) với truy vấn mới (so sánh bằng
+trên status đã chuẩn hóa) trên một tập ứng viên giả lập.
+
+    python -m benchmarks.status --candidates 1000000 --jobs 200
+"""
+
+import argparse
+import random
+
+from app.models.candidate import CandidateStatus
+from app.models.ids import new_id
+
+from .common import add_keep_argument, bench_database, fill, timed
+
+STATUSES = [status.value for status in CandidateStatus]
+
+
+def old_new_candidates(job_id):
+    return [
+        {"$match": {"$expr": {"$and": [
+            {"$eq": ["$job_id", job_id]},
+            {"$eq": [{"$toLower": "$status"}, "new"]},
+        ]}}},
+        {"$group": {"_id": "$job_id", "candidates": {"$push": "$$ROOT"}}},
+    ]
+
+
+def new_new_candidates(job_id):
+    return [{"$match": {"job_id": job_id, "status": "new"}}, {"$project": {"_id": 0}}]
+
+
+def old_data():
+    return [
+        {"$match": {"status": "open"}},
+        {"$lookup": {
+            "from": "candidates",
+            "let": {"jobId": "$id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$and": [
+                    {"$eq": ["$job_id", "$$jobId"]},
+                    {"$eq": [{"$toLower": "$status"}, "new"]},
+                ]}}},
+                {"$project": {"_id": 0}},
+            ],
+            "as": "candidates",
+        }},
+    ]
+
+
+def new_data():
+    return [
+        {"$match": {"status": "open"}},
+        {"$lookup": {
+            "from": "candidates",
+            "let": {"jobId": "$id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$job_id", "$$jobId"]}, "status": "new"}},
+                {"$project": {"_id": 0}},
+            ],
+            "as": "candidates",
+        }},
+    ]
+
+
+def generate(db, candidates, jobs):
+    job_ids = [new_id() for _ in range(jobs)]
+    db.jobs.insert_many([
+        {"id": job_id, "title": f"Job {index}", "status": "open" if index % 4 else "closed"}
+        for index, job_id in enumerate(job_ids)
+    ])
+    fill(db.candidates, lambda index: {
+        "id": new_id(),
+        "name": f"Candidate {index}",
+        "email": f"candidate{index}@example.com",
+        "job_id": random.choice(job_ids),
+        "status": random.choice(STATUSES),
+    }, candidates)
+    db.candidates.create_index("id", unique=True)
+    db.candidates.create_index([("job_id", 1), ("status", 1)])
+    db.jobs.create_index("id", unique=True)
+    db.jobs.create_index("status")
+    return job_ids
+
+
+def measure(collection, pipeline, repeat):
+    return timed(lambda: list(collection.aggregate(pipeline, allowDiskUse=True)), repeat)
+
+
+def docs_examined(db, pipeline):
+    explanation = db.command(
+        "explain",
+        {"aggregate": "candidates", "pipeline": pipeline, "cursor": {}},
+        verbosity="executionStats",
+    )
+    stats = explanation.get("executionStats") or explanation["stages"][0]["$cursor"]["executionStats"]
+    return stats["totalDocsExamined"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark truy vấn status của /analysis")
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    add_keep_argument(parser)
+    args = parser.parse_args()
+
+    with bench_database(args.keep) as db:
+        print(f"Tạo {args.candidates} ứng viên cho {args.jobs} công việc...")
+        job_ids = generate(db, args.candidates, args.jobs)
+        job_id = job_ids[1]
+
+        old_ms = measure(db.candidates, old_new_candidates(job_id), args.repeat)
+        new_ms = measure(db.candidates, new_new_candidates(job_id), args.repeat)
+        print(
+            f"/analysis/new_candidates: cũ {old_ms:.1f} ms ({docs_examined(db, old_new_candidates(job_id))} tài liệu đọc), "
+            f"mới {new_ms:.1f} ms ({docs_examined(db, new_new_candidates(job_id))} tài liệu đọc), x{old_ms / new_ms:.1f}"
+        )
+
+        old_ms = measure(db.jobs, old_data(), args.repeat)
+        new_ms = measure(db.jobs, new_data(), args.repeat)
+        print(f"/analysis/data: cũ {old_ms:.1f} ms, mới {new_ms:.1f} ms, x{old_ms / new_ms:.1f}")
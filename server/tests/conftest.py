@@ -0,0 +1,155 @@
+import asyncio
+import os
+import sys
+from urllib.parse import urlencode
+
+import orjson
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# Add server directory to path so tests can import the app package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# database.py đọc cấu hình khi import; client Motor chỉ kết nối khi có lệnh đầu tiên
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DATABASE_NAME", "recruitment_test")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def mongo():
+    """
+    Database mongomock cho test không cần MongoDB thật
+    """
+    return AsyncMongoMockClient()["recruitment_test"]
+
+
+@pytest.fixture
+async def app_db(monkeypatch, mongo):
+    """
+    Trỏ mọi collection mà các module của app đã import (kể cả collection giữ trong
+    repository, dispatcher, ...) sang database mongomock, kèm các unique index
+    """
+    from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+    import app.main  # noqa: F401 (nạp mọi route và index đã khai báo)
+    from app.db.indexes import INDEXES
+
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "app" or name.startswith("app.")):
+            continue
+        for attribute, value in list(vars(module).items()):
+            if isinstance(value, AsyncIOMotorCollection):
+                monkeypatch.setattr(module, attribute, mongo[value.name])
+            elif isinstance(value, AsyncIOMotorDatabase):
+                monkeypatch.setattr(module, attribute, mongo)
+            elif isinstance(getattr(value, "collection", None), AsyncIOMotorCollection):
+                monkeypatch.setattr(value, "collection", mongo[value.collection.name])
+
+    for collection_name, specs in INDEXES.items():
+        for keys, options in specs:
+            if options.get("unique"):
+                await mongo[collection_name].create_index(keys, unique=True)
+    return mongo
+
+
+class AsgiClient:
+    """
+    Gọi thẳng ứng dụng ASGI (routing, dependency, middleware) mà không mở cổng mạng
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method, path, params=None, json=None):
+        body = orjson.dumps(json) if json is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": urlencode(params or {}).encode(),
+            "headers": [(b"host", b"testserver"), (b"content-type", b"application/json")],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+        requests = [{"type": "http.request", "body": body, "more_body": False}]
+        response = {"status": None, "body": b""}
+
+        async def receive():
+            if requests:
+                return requests.pop(0)
+            # Client không ngắt kết nối: chờ tới khi ứng dụng trả response xong
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+
+        await self.app(scope, receive, send)
+        return response["status"], orjson.loads(response["body"]) if response["body"] else None
+
+    async def get(self, path, **params):
+        return await self.request("GET", path, params)
+
+
+@pytest.fixture
+def client(app_db):
+    from app.main import app
+
+    return AsgiClient(app)
+
+
+# Các phương thức của collection mà mỗi lần gọi là một lệnh gửi tới MongoDB
+COMMAND_METHODS = (
+    "aggregate", "bulk_write", "count_documents", "delete_many", "delete_one", "distinct", "find",
+    "find_one", "find_one_and_delete", "find_one_and_replace", "find_one_and_update",
+    "insert_many", "insert_one", "replace_one", "update_many", "update_one",
+)
+
+
+class CommandLog:
+    """
+    Các lệnh MongoDB đã gửi, dạng ``(collection, lệnh)``
+
+    mongomock không phát sự kiện command nên ``command_stats`` của driver luôn bằng 0;
+    fixture ``commands`` đếm ở tầng collection thay thế.
+    """
+
+    def __init__(self):
+        self.commands = []
+
+    def clear(self):
+        self.commands.clear()
+
+    def __len__(self):
+        return len(self.commands)
+
+    def on(self, collection_name):
+        return [command for collection, command in self.commands if collection == collection_name]
+
+
+@pytest.fixture
+def commands(monkeypatch, mongo):
+    log = CommandLog()
+    collection_class = type(mongo.candidates)
+
+    def counting(method_name, method):
+        def wrapper(self, *args, **kwargs):
+            log.commands.append((self.name, method_name))
+            return method(self, *args, **kwargs)
+        return wrapper
+
+    for method_name in COMMAND_METHODS:
+        monkeypatch.setattr(collection_class, method_name, counting(method_name, getattr(collection_class, method_name)))
+    return log
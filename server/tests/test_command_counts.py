@@ -0,0 +1,146 @@
+"""
+Số lệnh MongoDB mỗi route gửi đi, gọi qua ứng dụng ASGI.
+
+Mỗi thao tác ghi chỉ tốn một lệnh trên collection của route; các lệnh còn lại được liệt
+kê kèm lý do (outbox email, bộ đếm của công việc, bản sao trên phỏng vấn).
+Các route lịch phỏng vấn đọc ứng viên/công việc theo lô nên số lệnh không tăng theo số
+phỏng vấn.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+JOB = {
+    "title": "Backend Developer", "description": "APIs", "department": "Engineering", "location": "Hà Nội",
+    "requirements": "Python", "employment_type": "full-time", "created_by": "admin",
+}
+
+# Hủy thư chưa gửi và ghi thư mới vào outbox
+OUTBOX = [("email_outbox", "update_many"), ("email_outbox", "find_one_and_update")]
+
+
+async def sent(client, commands, method, path, params=None, json=None):
+    commands.clear()
+    code, body = await client.request(method, path, params, json)
+    return code, body, list(commands.commands)
+
+
+async def test_write_routes_use_one_command_per_document(client, commands):
+    code, job, issued = await sent(client, commands, "POST", "/api/v1/jobs", json=JOB)
+    assert code == 201 and issued == [("jobs", "insert_one")]
+    job_path = f"/api/v1/jobs/{job['id']}"
+
+    _, _, issued = await sent(client, commands, "PUT", job_path, json={"location": "Đà Nẵng"})
+    assert issued == [("jobs", "find_one_and_update")]
+
+    # Đổi tiêu đề: cập nhật bản sao job_title trên phỏng vấn; chỉ một phần trường tìm kiếm
+    # được gửi nên search_terms được ghi lại từ giá trị hiện tại của các trường còn lại
+    _, _, issued = await sent(client, commands, "PUT", job_path, json={"title": "Senior Backend Developer"})
+    assert issued == [("jobs", "find_one_and_update"), ("interviews", "update_many"), ("jobs", "update_one")]
+
+    _, _, issued = await sent(client, commands, "PATCH", f"{job_path}/status", json={"status": "open"})
+    assert issued == [("jobs", "find_one_and_update")]
+
+    # Tạo ứng viên: tăng bộ đếm applicants của công việc
+    candidate_body = {"name": "Nguyễn Văn An", "email": "an@example.com", "job_id": job["id"], "skills": ["Python"]}
+    code, candidate, issued = await sent(client, commands, "POST", "/api/v1/candidates/", json=candidate_body)
+    assert code == 201 and issued == [("candidates", "insert_one"), ("jobs", "update_one")]
+    candidate_path = f"/api/v1/candidates/{candidate['id']}"
+
+    # Email trùng: unique index từ chối ngay lệnh insert, không kiểm tra trước
+    code, _, issued = await sent(client, commands, "POST", "/api/v1/candidates/", json={**candidate_body, "name": "Trần An"})
+    assert code == 400 and issued == [("candidates", "insert_one")]
+
+    _, _, issued = await sent(client, commands, "PUT", candidate_path, json={"phone": "0900000000"})
+    assert issued == [("candidates", "find_one_and_update")]
+
+    # Đổi tên: cập nhật bản sao candidate_name trên phỏng vấn
+    _, _, issued = await sent(client, commands, "PUT", candidate_path, json={"name": "Nguyễn Văn Ân"})
+    assert issued == [("candidates", "find_one_and_update"), ("interviews", "update_many")]
+
+    _, _, issued = await sent(client, commands, "PATCH", f"{candidate_path}/status", {"status": "screening"})
+    assert issued == [("candidates", "find_one_and_update"), ("email_outbox", "update_many")]
+
+    # Trúng tuyển: đọc tiêu đề công việc cho thư báo kết quả
+    _, _, issued = await sent(client, commands, "PATCH", f"{candidate_path}/status", {"status": "hired"})
+    assert issued == [("candidates", "find_one_and_update"), ("jobs", "find_one"), *OUTBOX]
+
+    code, _, issued = await sent(client, commands, "PATCH", "/api/v1/candidates/missing/status", {"status": "screening"})
+    assert code == 404 and issued == [("candidates", "find_one_and_update")]
+
+    # Tạo phỏng vấn: đọc ứng viên và người phỏng vấn cho bản sao, tăng bộ đếm interviews
+    # của công việc (trả về tiêu đề cho bản sao)
+    interview_body = {
+        "candidate_id": candidate["id"], "job_id": job["id"], "interviewer_id": "hr",
+        "scheduled_date": "2030-01-01T10:00:00", "duration_minutes": 45, "type": "video",
+    }
+    code, interview, issued = await sent(client, commands, "POST", "/api/v1/interviews", json=interview_body)
+    assert code == 201 and issued == [
+        ("candidates", "find_one"), ("users", "find_one"), ("jobs", "find_one_and_update"), ("interviews", "insert_one"), *OUTBOX,
+    ]
+    interview_path = f"/api/v1/interviews/{interview['id']}"
+
+    _, _, issued = await sent(client, commands, "PUT", interview_path, json={"duration_minutes": 60})
+    assert issued == [("interviews", "find_one_and_update"), *OUTBOX]
+
+    _, _, issued = await sent(client, commands, "PATCH", f"{interview_path}/status", {"status": "rescheduled"})
+    assert issued == [("interviews", "find_one_and_update")]
+
+    result = {"interview_id": interview["id"], "rating": 4, "feedback": "Tốt", "hiring_recommendation": False}
+    _, _, issued = await sent(client, commands, "POST", f"{interview_path}/result", json=result)
+    assert issued == [("interviews", "find_one_and_update")]
+
+    # Xóa: hủy thư chưa gửi và giảm bộ đếm của công việc
+    code, _, issued = await sent(client, commands, "DELETE", interview_path)
+    assert code == 204 and issued == [("interviews", "find_one_and_delete"), ("email_outbox", "update_many"), ("jobs", "update_one")]
+
+    code, _, issued = await sent(client, commands, "DELETE", candidate_path)
+    assert code == 204 and issued == [
+        ("candidates", "find_one_and_delete"), ("interviews", "delete_many"), ("email_outbox", "update_many"), ("jobs", "update_one"),
+    ]
+
+    code, _, issued = await sent(client, commands, "DELETE", job_path)
+    assert code == 204 and issued == [("jobs", "find_one_and_delete")]
+
+
+async def schedule_legacy_interviews(db, size, day):
+    """
+    ``size`` phỏng vấn trong ngày ``day``, mỗi phỏng vấn một ứng viên khác nhau, chưa có
+    bản sao tên/tiêu đề nên route phải đọc ứng viên và công việc
+    """
+    await db.interviews.delete_many({})
+    await db.candidates.delete_many({})
+    await db.jobs.delete_many({})
+    await db.jobs.insert_many([{"id": f"j{index}", "title": f"Job {index}"} for index in range(5)])
+    await db.candidates.insert_many([
+        {"id": f"c{index}", "name": f"Candidate {index}", "email": f"candidate{index}@example.com"}
+        for index in range(size)
+    ])
+    await db.interviews.insert_many([
+        {"id": f"i{index}", "candidate_id": f"c{index}", "job_id": f"j{index % 5}",
+         "scheduled_date": day, "status": "scheduled", "type": "video"}
+        for index in range(size)
+    ])
+
+
+# /today cũng kiểm tra thứ tự route: khai báo sau /{interview_id} thì request trả về 404
+@pytest.mark.parametrize("path", ["/api/v1/interviews/today", "/api/v1/interviews/by-date/{date}", "/api/v1/interviews/upcoming"])
+async def test_schedule_routes_read_related_documents_in_batches(client, commands, app_db, path):
+    # Sắp diễn ra trong hôm nay: khớp cả /today, /by-date của hôm nay và /upcoming
+    now = datetime.now()
+    day = min(now + timedelta(seconds=5), now.replace(hour=23, minute=59, second=59, microsecond=999000))
+    path = path.format(date=day.strftime("%Y-%m-%d"))
+
+    issued = {}
+    for size in (10, 100):
+        await schedule_legacy_interviews(app_db, size, day)
+        commands.clear()
+        code, body = await client.get(path, limit=size)
+        assert code == 200 and len(body) == size
+        assert body[-1]["candidateName"] == f"Candidate {size - 1}"
+        issued[size] = list(commands.commands)
+
+    assert issued[10] == issued[100] == [("interviews", "find"), ("candidates", "find"), ("jobs", "find")]
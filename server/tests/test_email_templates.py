@@ -0,0 +1,39 @@
+import email
+import email.policy
+
+import pytest
+
+from app.email.templates import TemplateRegistry
+
+
+def parse(message):
+    return email.message_from_bytes(message, policy=email.policy.default)
+
+
+def result_payload(title, to="candidate@example.com", locale=None):
+    return {"candidate": {"email": to}, "job": {"title": title}, "locale": locale}
+
+
+@pytest.mark.parametrize("locale", ["en", "vi"])
+def test_crlf_in_job_title_does_not_inject_headers(locale):
+    to, message = TemplateRegistry().render("rejection", result_payload("Dev\r\nBcc: x@y", locale=locale))
+
+    parsed = parse(message)
+    assert parsed["Bcc"] is None
+    assert parsed["To"] == to
+    assert "Dev Bcc: x@y" in parsed["Subject"]
+    assert "\n" not in parsed["Subject"]
+
+
+def test_crlf_in_recipient_is_rejected():
+    with pytest.raises(ValueError):
+        TemplateRegistry().render("acceptance", result_payload("Dev", to="a@example.com\r\nBcc: x@y"))
+
+
+def test_render_builds_parseable_message():
+    to, message = TemplateRegistry().render("acceptance", result_payload("Kỹ sư dữ liệu", locale="vi"))
+
+    parsed = parse(message)
+    assert parsed["To"] == "candidate@example.com"
+    assert "Kỹ sư dữ liệu" in parsed["Subject"]
+    assert "Kỹ sư dữ liệu" in parsed.get_content()
@@ -0,0 +1,46 @@
+"""
+Import ``app.main`` phải nhanh và không chạm tới Gmail: mỗi worker uvicorn import ứng dụng
+trước khi nhận request, client Gmail chỉ được tạo khi gửi email đầu tiên.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Giới hạn thời gian import (giây), chỉnh được cho máy chậm
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "3"))
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "modules": [name for name in sys.modules if name.split(".")[0] in ("googleapiclient", "google_auth_oauthlib")],
+}))
+"""
+
+
+def import_app_main():
+    # Process mới để đo cả các module đã được test khác import
+    completed = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=SERVER_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_gmail_client():
+    assert import_app_main()["modules"] == []
+
+
+def test_import_within_budget():
+    # Lần đầu có thể còn phải biên dịch bytecode nên lấy lần nhanh nhất
+    seconds = min(import_app_main()["seconds"] for _ in range(2))
+    assert seconds < IMPORT_BUDGET_SECONDS, f"import app.main mất {seconds:.2f}s (giới hạn {IMPORT_BUDGET_SECONDS}s)"
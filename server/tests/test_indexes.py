@@ -0,0 +1,137 @@
+"""
+Mọi dạng truy vấn của route phải dùng được một index đã khai báo.
+
+``test_query_shapes_have_usable_index`` kiểm tra trên registry (không cần MongoDB);
+``test_query_shapes_avoid_collscan`` chạy ``explain()`` trên MongoDB thật khi có
+``MONGODB_TEST_URI`` (database tạm được xóa sau khi chạy).
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+import app.main  # noqa: F401 (nạp mọi route để registry có đủ index)
+from app.db.indexes import INDEXES
+from app.models.ids import new_id
+
+# (collection, bộ lọc[, sắp xếp]) của các truy vấn route; $lookup theo foreignField "id"
+# được thực thi như một truy vấn {"id": ...} trên collection ngoài
+QUERY_SHAPES = [
+    # Đọc một tài liệu theo id (get/update/delete) và $lookup theo id
+    ("users", {"id": "shape"}),
+    ("candidates", {"id": "shape"}),
+    ("jobs", {"id": "shape"}),
+    ("interviews", {"id": "shape"}),
+    # Khóa ngoại
+    ("interviews", {"candidate_id": "shape"}),
+    ("interviews", {"job_id": "shape"}),
+    ("interviews", {"interviewer_id": "shape"}),
+    # Tra cứu theo trường duy nhất
+    ("candidates", {"email": "shape"}),
+    ("users", {"username": "shape"}),
+    # Outbox email
+    ("email_outbox", {"dedupe_key": "shape"}),
+    ("email_outbox", {"candidate_id": "shape", "status": "pending"}),
+    # Danh sách phân trang keyset: lọc rồi sắp xếp theo id
+    ("candidates", {"status": "new"}, [("id", 1)]),
+    ("candidates", {"department": "shape"}, [("id", 1)]),
+    ("jobs", {"status": "open"}, [("id", 1)]),
+    ("jobs", {"department": "shape"}, [("id", 1)]),
+    # Ứng viên theo công việc / vị trí
+    ("candidates", {"job_id": "shape", "status": "new"}),
+    ("candidates", {"position": "shape"}),
+    # Lọc theo kỹ năng (skills_all / skills_any)
+    ("candidates", {"skill_tokens": {"$all": ["shape", "python"]}}),
+    ("candidates", {"skill_tokens": {"$in": ["shape", "python"]}}),
+    # Lịch phỏng vấn
+    ("interviews", {"scheduled_date": {"$gte": datetime(2000, 1, 1), "$lt": datetime(2000, 1, 2)}, "status": {"$nin": ["cancelled"]}}, [("scheduled_date", 1)]),
+    # Dashboard
+    ("candidates", {"created_at": {"$gte": datetime(2000, 1, 1)}}),
+    ("candidates", {"status": "hired", "updated_at": {"$gte": datetime(2000, 1, 1)}}),
+    ("jobs", {"status": "open", "created_at": {"$gte": datetime(2000, 1, 1)}}),
+    ("candidates", {}, [("created_at", -1)]),
+    ("interviews", {}, [("created_at", -1)]),
+    ("jobs", {}, [("created_at", -1)]),
+]
+
+
+def shape_id(shape):
+    collection_name, query, *sort = shape
+    return f"{collection_name}-{'-'.join(query) or 'all'}{'-sorted' if sort else ''}"
+
+
+def _equality(value):
+    return not (isinstance(value, dict) and any(key.startswith("$") for key in value))
+
+
+def usable(keys, query, sort):
+    """
+    Không sắp xếp: MongoDB chỉ chọn được index khi trường đầu tiên của index có trong bộ lọc.
+    Có sắp xếp: index phải vừa thu hẹp bộ lọc (trường đầu có trong bộ lọc, trừ khi không
+    lọc) vừa cho sẵn thứ tự: sau các trường lọc bằng (equality) ở đầu index là đúng các
+    trường sắp xếp, cùng chiều hoặc ngược chiều hoàn toàn. Index chỉ theo thứ tự sắp xếp
+    (ví dụ ``id``) thì phải quét cả collection; index chỉ theo bộ lọc thì phải sắp xếp trong
+    bộ nhớ
+    """
+    if not sort or (query and keys[0][0] not in query):
+        return keys[0][0] in query
+    position = 0
+    while position < len(keys) and keys[position][0] in query and _equality(query[keys[position][0]]):
+        position += 1
+    following = keys[position:position + len(sort)]
+    if [field for field, _ in following] != [field for field, _ in sort]:
+        return False
+    signs = {direction * sort_direction > 0 for (_, direction), (_, sort_direction) in zip(following, sort)}
+    return len(signs) == 1
+
+
+@pytest.mark.parametrize("shape", QUERY_SHAPES, ids=shape_id)
+def test_query_shapes_have_usable_index(shape):
+    collection_name, query, *sort = shape
+    sort = sort[0] if sort else []
+    indexes = [keys for keys, options in INDEXES.get(collection_name, [])]
+    assert any(usable(keys, query, sort) for keys in indexes), f"{collection_name}: không có index cho {query} {sort}"
+
+
+def plan_stages(plan):
+    """
+    Liệt kê tên các stage trong một kế hoạch explain (kể cả các stage lồng nhau)
+    """
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(plan_stages(value))
+    return stages
+
+
+@pytest.fixture(scope="module")
+def indexed_db():
+    uri = os.getenv("MONGODB_TEST_URI")
+    if not uri:
+        pytest.skip("MONGODB_TEST_URI chưa được đặt")
+    from pymongo import MongoClient
+
+    client = MongoClient(uri, serverSelectionTimeoutMS=5000)
+    db = client[f"explain_{new_id()}"]
+    for collection_name, specs in INDEXES.items():
+        for keys, options in specs:
+            db[collection_name].create_index(keys, **options)
+    yield db
+    client.drop_database(db.name)
+    client.close()
+
+
+@pytest.mark.parametrize("shape", QUERY_SHAPES, ids=shape_id)
+def test_query_shapes_avoid_collscan(indexed_db, shape):
+    collection_name, query, *sort = shape
+    cursor = indexed_db[collection_name].find(query)
+    if sort:
+        cursor = cursor.sort(sort[0])
+    stages = plan_stages(cursor.explain().get("queryPlanner", {}).get("winningPlan", {}))
+    assert "COLLSCAN" not in stages, f"{collection_name}.find({query}) -> {' > '.join(stages)}"
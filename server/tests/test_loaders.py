@@ -0,0 +1,35 @@
+import asyncio
+import gc
+
+import pytest
+
+from app.db.loaders import Loader
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_loads_share_one_query(mongo, commands):
+    await mongo.candidates.insert_many([{"id": f"c{index}", "name": f"Candidate {index}"} for index in range(3)])
+    loader = Loader(mongo.candidates)
+    commands.clear()
+
+    documents = await asyncio.gather(loader.load("c0"), loader.load("c2"), loader.load("missing"), loader.load("c0"))
+
+    assert [document and document["name"] for document in documents] == ["Candidate 0", "Candidate 2", None, "Candidate 0"]
+    assert loader.queries == 1 and commands.on("candidates") == ["find"]
+    assert await loader.load("c2") is documents[1] and loader.queries == 1
+
+
+async def test_dispatch_task_is_kept_until_done(mongo):
+    await mongo.candidates.insert_one({"id": "c0"})
+    loader = Loader(mongo.candidates)
+
+    future = loader.load("c0")
+    await asyncio.sleep(0)
+    # Event loop chỉ giữ tham chiếu yếu tới task đang chạy
+    assert len(loader.tasks) == 1
+    gc.collect()
+
+    assert (await future)["id"] == "c0"
+    await asyncio.sleep(0)
+    assert not loader.tasks
@@ -0,0 +1,77 @@
+import mongomock
+
+from app.db.migrate_ids import run
+from app.email.outbox import PENDING, dedupe_key
+from app.models.ids import is_new_id
+
+CANDIDATE = "1712345678.123456"
+JOB = "1712345600.000001"
+INTERVIEW = "1712345700.500000"
+USER = "1712345500.250000"
+
+
+def legacy_db():
+    db = mongomock.MongoClient()["recruitment_test"]
+    db.users.insert_one({"id": USER})
+    db.jobs.insert_one({"id": JOB, "created_by": USER})
+    db.candidates.insert_one({"id": CANDIDATE, "job_id": JOB})
+    db.interviews.insert_one({"id": INTERVIEW, "candidate_id": CANDIDATE, "job_id": JOB, "interviewer_id": USER})
+    db.email_outbox.insert_many([
+        {
+            "dedupe_key": dedupe_key(CANDIDATE, f"interview:{INTERVIEW}:abc123"),
+            "candidate_id": CANDIDATE,
+            "kind": "interview",
+            "status": PENDING,
+            "payload": {"id": INTERVIEW, "candidate_id": CANDIDATE, "job_id": JOB, "interviewer_id": USER},
+        },
+        {
+            "dedupe_key": dedupe_key(CANDIDATE, f"hired:{JOB}"),
+            "candidate_id": CANDIDATE,
+            "kind": "acceptance",
+            "status": PENDING,
+            "payload": {"job": {"id": JOB, "title": "Backend"}, "candidate": {"email": "a@example.com"}},
+        },
+    ])
+    return db
+
+
+def new_ids(db):
+    return {name: db[name].find_one({}, {"id": 1})["id"] for name in ("users", "jobs", "candidates", "interviews")}
+
+
+def test_outbox_ids_and_dedupe_keys_follow_the_migration():
+    db = legacy_db()
+    run(db)
+    ids = new_ids(db)
+    assert all(is_new_id(value) for value in ids.values())
+
+    interview = db.email_outbox.find_one({"kind": "interview"})
+    assert interview["candidate_id"] == ids["candidates"]
+    assert interview["dedupe_key"] == dedupe_key(ids["candidates"], f"interview:{ids['interviews']}:abc123")
+    assert interview["payload"] == {
+        "id": ids["interviews"], "candidate_id": ids["candidates"], "job_id": ids["jobs"], "interviewer_id": ids["users"],
+    }
+
+    acceptance = db.email_outbox.find_one({"kind": "acceptance"})
+    assert acceptance["dedupe_key"] == dedupe_key(ids["candidates"], f"hired:{ids['jobs']}")
+    assert acceptance["payload"]["job"] == {"id": ids["jobs"], "title": "Backend"}
+
+    # cancel_pending_emails tìm thư mời theo id phỏng vấn mới
+    assert db.email_outbox.count_documents({"payload.id": ids["interviews"], "status": PENDING}) == 1
+
+
+def test_rerun_and_dry_run_leave_outbox_unchanged():
+    db = legacy_db()
+    run(db)
+    migrated = list(db.email_outbox.find({}, {"_id": 0}))
+    run(db)
+    run(db, dry_run=True)
+    assert list(db.email_outbox.find({}, {"_id": 0})) == migrated
+
+
+def test_dry_run_writes_nothing():
+    db = legacy_db()
+    before = list(db.email_outbox.find({}, {"_id": 0}))
+    run(db, dry_run=True)
+    assert list(db.email_outbox.find({}, {"_id": 0})) == before
+    assert db.candidates.find_one()["id"] == CANDIDATE
@@ -0,0 +1,45 @@
+import mongomock
+import pytest
+from bson import ObjectId
+
+from app.db import seed
+from app.db.migrations import candidates, interviews, jobs  # noqa: F401 - đăng ký migration
+from app.db.migrations.runner import MIGRATIONS, latest_version, run_migrations
+from app.models.ids import id_created_at, is_new_id
+
+
+def test_candidate_without_id_gets_a_new_format_id():
+    db = mongomock.MongoClient()["recruitment_test"]
+    _id = ObjectId()
+    db.candidates.insert_one({"_id": _id, "name": "Legacy", "email": "legacy@example.com", "status": "New"})
+
+    run_migrations(db, ["candidates"])
+
+    candidate = db.candidates.find_one({"_id": _id})
+    assert is_new_id(candidate["id"])
+    assert id_created_at(candidate["id"]) == _id.generation_time
+    assert candidate["schema_version"] == latest_version("candidates")
+
+
+@pytest.mark.anyio
+async def test_seeded_documents_are_at_the_latest_schema_version(monkeypatch):
+    db = mongomock.MongoClient()["recruitment_test"]
+    for name in ("users", "jobs", "candidates", "interviews"):
+        monkeypatch.setattr(seed, f"{name}_collection", db[name])
+
+    await seed.seed_database()
+
+    for collection_name in MIGRATIONS:
+        assert db[collection_name].count_documents(
+            {"schema_version": {"$ne": latest_version(collection_name)}}
+        ) == 0
+
+
+def test_new_documents_are_stamped_with_the_registry_version(monkeypatch):
+    from app.models.candidate import CandidateInDB
+
+    assert CandidateInDB(name="An", email="an@example.com", job_id="j1").schema_version == latest_version("candidates")
+
+    # Thêm migration mà không sửa model: tài liệu mới vẫn mang phiên bản mới nhất
+    monkeypatch.setitem(MIGRATIONS, "candidates", [*MIGRATIONS["candidates"], (99, "test", lambda document: ({}, []))])
+    assert CandidateInDB(name="An", email="an@example.com", job_id="j1").schema_version == 99
@@ -0,0 +1,116 @@
+import bson
+import pytest
+
+from app.email.outbox import DEAD, PENDING, SENT, SUPERSEDED, OutboxDispatcher, add_to_outbox
+from app.models.candidate import CandidateInDB
+
+pytestmark = pytest.mark.anyio
+
+
+class MemoryTransport:
+    """
+    Transport giả lập cho dispatcher: lưu lại các email đã "gửi" và thất bại
+    ``fail_times`` lần đầu tiên cho mỗi email
+    """
+
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.sent = []
+        self.calls = {}
+
+    async def __call__(self, kind, payload):
+        key = (kind, repr(payload))
+        self.calls[key] = self.calls.get(key, 0) + 1
+        if self.calls[key] <= self.fail_times:
+            raise RuntimeError("Simulated transport failure")
+        self.sent.append((kind, payload))
+        return True
+
+
+@pytest.fixture
+async def outbox(mongo):
+    collection = mongo.email_outbox
+    await collection.create_index("dedupe_key", unique=True)
+    return collection
+
+
+async def statuses(collection):
+    return [document["status"] async for document in collection.find({}, {"status": 1})]
+
+
+async def test_dispatcher_retries_until_sent(outbox):
+    transport = MemoryTransport(fail_times=2)
+    dispatcher = OutboxDispatcher(outbox, transport, base_delay=0)
+    await add_to_outbox(outbox, "rejection", "c1", "rejected", {"id": "c1"})
+
+    for _ in range(3):
+        await dispatcher.run_once()
+
+    assert transport.sent == [("rejection", {"id": "c1"})]
+    assert await statuses(outbox) == [SENT]
+    assert dispatcher.metrics()["retried"] == 2
+
+
+async def test_dispatcher_gives_up_after_max_attempts(outbox):
+    dispatcher = OutboxDispatcher(outbox, MemoryTransport(fail_times=10), base_delay=0, max_attempts=2)
+    await add_to_outbox(outbox, "rejection", "c1", "rejected", {"id": "c1"})
+
+    for _ in range(3):
+        await dispatcher.run_once()
+
+    assert await statuses(outbox) == [DEAD]
+    assert dispatcher.metrics()["dead"] == 1
+
+
+async def test_duplicate_event_is_not_enqueued_twice(outbox):
+    assert await add_to_outbox(outbox, "acceptance", "c1", "hired", {"id": "c1"})
+    assert not await add_to_outbox(outbox, "acceptance", "c1", "hired", {"id": "c1"})
+    assert await statuses(outbox) == [PENDING]
+
+
+async def test_hired_rejected_hired_revives_the_acceptance(client, app_db):
+    await app_db.jobs.insert_one({"id": "j1", "title": "Dev"})
+    await app_db.candidates.insert_one(CandidateInDB(id="c1", name="An", email="an@example.com", job_id="j1").model_dump())
+
+    for status in ("hired", "rejected", "hired", "hired"):
+        code, candidate = await client.request("PATCH", "/api/v1/candidates/c1/status", {"status": status})
+        assert code == 200
+        assert candidate["status"] == status
+
+    emails = {
+        document["dedupe_key"]: document["status"]
+        async for document in app_db.email_outbox.find({}, {"dedupe_key": 1, "status": 1})
+    }
+    assert emails == {"c1:hired:j1": PENDING, "c1:rejected:j1": SUPERSEDED}
+
+
+async def test_unchanged_interview_save_does_not_resend_the_invite(client, app_db, monkeypatch):
+    # MongoDB thật trả enum dưới dạng chuỗi và cắt thời gian tới mili giây; mongomock giữ
+    # nguyên đối tượng nên kết quả ghi được cho đi qua BSON như khi đọc từ database
+    collection_class = type(app_db.interviews)
+    find_one_and_update = collection_class.find_one_and_update
+
+    async def round_trip(self, *args, **kwargs):
+        document = await find_one_and_update(self, *args, **kwargs)
+        return bson.decode(bson.encode(document)) if document is not None else None
+
+    monkeypatch.setattr(collection_class, "find_one_and_update", round_trip)
+
+    await app_db.jobs.insert_one({"id": "j1", "title": "Dev"})
+    await app_db.candidates.insert_one(CandidateInDB(id="c1", name="An", email="an@example.com", job_id="j1").model_dump())
+    form = {
+        "candidate_id": "c1", "job_id": "j1", "interviewer_id": "hr", "scheduled_date": "2030-01-01T10:00:00.123456",
+        "duration_minutes": 45, "type": "video", "location": "Phòng 1",
+    }
+    code, interview = await client.request("POST", "/api/v1/interviews", json=form)
+    assert code == 201
+    await app_db.email_outbox.update_many({}, {"$set": {"status": SENT}})
+
+    # Client luôn gửi lại toàn bộ form khi lưu
+    code, _ = await client.request("PUT", f"/api/v1/interviews/{interview['id']}", json=form)
+    assert code == 200
+    assert await statuses(app_db.email_outbox) == [SENT]
+
+    code, _ = await client.request("PUT", f"/api/v1/interviews/{interview['id']}", json={**form, "location": "Phòng 2"})
+    assert code == 200
+    assert sorted(await statuses(app_db.email_outbox)) == sorted([SENT, PENDING])
@@ -0,0 +1,57 @@
+import pytest
+
+from app.routes.pagination import PageParams, find_page, find_page_with_facets
+from app.search.facets import CANDIDATE_FACETS
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingCollection:
+    """
+    Bọc collection mongomock, ghi lại các lệnh find và pipeline aggregate được gửi
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.finds = []
+        self.pipelines = []
+
+    def find(self, *args, **kwargs):
+        self.finds.append(args)
+        return self.collection.find(*args, **kwargs)
+
+    def aggregate(self, pipeline, *args, **kwargs):
+        self.pipelines.append(pipeline)
+        return self.collection.aggregate(pipeline, *args, **kwargs)
+
+
+@pytest.fixture
+async def candidates(mongo):
+    await mongo.candidates.insert_many([
+        {"id": f"c{index:02}", "status": "new" if index % 3 else "hired", "department": "IT", "experience": index}
+        for index in range(12)
+    ])
+    return RecordingCollection(mongo.candidates)
+
+
+async def test_page_is_a_find_and_facet_only_counts(candidates):
+    page = PageParams(cursor="", page_size=5)
+    query = {"status": "new"}
+
+    documents, next_cursor, facets = await find_page_with_facets(candidates, query, page, CANDIDATE_FACETS)
+
+    assert len(candidates.finds) == 1
+    [pipeline] = candidates.pipelines
+    assert pipeline == [{"$match": query}, {"$facet": CANDIDATE_FACETS}]
+
+    expected, expected_cursor = await find_page(candidates.collection, query, page)
+    assert documents == expected and next_cursor == expected_cursor
+    assert facets["status"] == [{"value": "new", "count": 8}]
+
+
+async def test_facets_cover_the_whole_filtered_set_on_later_pages(candidates):
+    first, cursor, _ = await find_page_with_facets(candidates, {}, PageParams(cursor="", page_size=5), CANDIDATE_FACETS)
+    second, _, facets = await find_page_with_facets(candidates, {}, PageParams(cursor=cursor, page_size=5), CANDIDATE_FACETS)
+
+    assert [document["id"] for document in first + second] == [f"c{index:02}" for index in range(10)]
+    assert {row["value"]: row["count"] for row in facets["status"]} == {"new": 8, "hired": 4}
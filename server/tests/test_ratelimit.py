@@ -0,0 +1,36 @@
+import multiprocessing
+import time
+
+import pytest
+
+from app.email.ratelimit import SharedTokenBucket
+
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="needs fork")
+
+
+def spend(path, tokens, rate, capacity):
+    SharedTokenBucket(rate, capacity, path).acquire(tokens)
+
+
+def test_bucket_state_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "quota.json")
+    first = SharedTokenBucket(10, capacity=10, path=path)
+    second = SharedTokenBucket(10, capacity=10, path=path)
+
+    assert first.acquire(10) == 0
+    # Bucket của "worker" khác đã cạn: phải chờ nạp lại thay vì có burst riêng
+    assert second.acquire(5) == pytest.approx(0.5, abs=0.1)
+
+
+def test_workers_share_one_rate(tmp_path):
+    path = str(tmp_path / "quota.json")
+    started = time.monotonic()
+    workers = [multiprocessing.Process(target=spend, args=(path, 10, 50, 10)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    # 40 token, burst 10, nạp 50 token/giây: tổng cộng phải mất khoảng 0,6 giây
+    assert time.monotonic() - started >= 0.5
+    assert all(worker.exitcode == 0 for worker in workers)
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from app import main
+from app.search import ngram
+from app.search.ngram import CANDIDATE_NGRAM_FIELDS, JOB_NGRAM_FIELDS, TrigramIndex
+from app.search.skills import SKILLS_FIELD, SkillDictionary
+from app.search.suggest import Suggestions
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def fresh_indexes(monkeypatch, app_db):
+    monkeypatch.setattr(ngram, "candidate_ngrams", TrigramIndex(CANDIDATE_NGRAM_FIELDS))
+    monkeypatch.setattr(ngram, "job_ngrams", TrigramIndex(JOB_NGRAM_FIELDS))
+    monkeypatch.setattr(main, "suggestions", Suggestions())
+    monkeypatch.setattr(main, "skill_dictionary", SkillDictionary())
+    ready = asyncio.get_running_loop().create_future()
+    ready.set_result(None)
+    monkeypatch.setattr(main, "db_init_task", ready)
+    monkeypatch.setattr(main, "SEARCH_INDEX_REFRESH_SECONDS", 0.01)
+    return app_db
+
+
+async def wait_for(condition, timeout=2):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+async def test_indexes_pick_up_writes_from_other_workers(fresh_indexes):
+    await fresh_indexes.candidates.insert_one({"id": "c1", "name": "Nguyễn Văn An", "email": "an@example.com", SKILLS_FIELD: ["python"]})
+    task = asyncio.create_task(main.load_search_indexes())
+    try:
+        await wait_for(lambda: ngram.candidate_ngrams.ready)
+        assert ngram.candidate_ngrams.search("thanh") == []
+
+        # Ghi thẳng vào database như một worker khác, không qua route của worker này
+        await fresh_indexes.candidates.insert_one({"id": "c2", "name": "Trần Thị Thanh", "email": "thanh@example.com", SKILLS_FIELD: ["golang"]})
+
+        await wait_for(lambda: ngram.candidate_ngrams.search("thanh") == ["c2"])
+        await wait_for(lambda: [value for value, _ in main.suggestions.complete("name", "tran")] == ["Trần Thị Thanh"])
+        await wait_for(lambda: main.skill_dictionary.counts.get("golang") == 1)
+    finally:
+        task.cancel()
+
+
+async def test_refresh_can_be_disabled(fresh_indexes, monkeypatch):
+    monkeypatch.setattr(main, "SEARCH_INDEX_REFRESH_SECONDS", 0)
+    await asyncio.wait_for(main.load_search_indexes(), timeout=2)
+    assert ngram.candidate_ngrams.ready and main.suggestions.ready
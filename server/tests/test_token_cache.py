@@ -0,0 +1,65 @@
+import os
+import stat
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.email import token_cache
+from app.email.token_cache import TokenCache
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX file permissions")
+
+
+def refreshed(token):
+    def refresh(credentials):
+        credentials.token = token
+        credentials.expiry = datetime.utcnow() + timedelta(hours=1)
+    return refresh
+
+
+def credentials():
+    return SimpleNamespace(token=None, expiry=None)
+
+
+def test_token_file_is_private(tmp_path):
+    cache = TokenCache(str(tmp_path / "token.json"))
+    cache.ensure_fresh(credentials(), refreshed("secret"))
+
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(cache.path + ".lock").st_mode) == 0o600
+    assert sorted(os.listdir(tmp_path)) == ["token.json", "token.json.lock"]
+
+
+def test_default_cache_directory_is_owner_only(tmp_path, monkeypatch):
+    directory = tmp_path / "recruitment"
+    monkeypatch.setattr(token_cache, "DEFAULT_TOKEN_DIR", str(directory))
+    monkeypatch.setattr(token_cache, "DEFAULT_TOKEN_CACHE", str(directory / "gmail-token.json"))
+
+    TokenCache().ensure_fresh(credentials(), refreshed("secret"))
+
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+
+def test_symlinked_cache_file_is_neither_read_nor_written_through(tmp_path):
+    target = tmp_path / "target.json"
+    target.write_text('{"token": "planted", "expiry": "2999-01-01T00:00:00"}')
+    os.symlink(target, tmp_path / "token.json")
+    cache = TokenCache(str(tmp_path / "token.json"))
+
+    current = credentials()
+    cache.ensure_fresh(current, refreshed("secret"))
+
+    assert current.token == "secret"
+    assert "planted" in target.read_text()
+    assert not os.path.islink(cache.path)
+
+
+def test_symlinked_lock_file_is_refused(tmp_path):
+    target = tmp_path / "elsewhere"
+    os.symlink(target, tmp_path / "token.json.lock")
+    cache = TokenCache(str(tmp_path / "token.json"))
+
+    with pytest.raises(OSError):
+        cache.ensure_fresh(credentials(), refreshed("secret"))
+    assert not target.exists()
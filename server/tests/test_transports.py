@@ -0,0 +1,69 @@
+import smtplib
+
+import pytest
+
+from app.email import transports
+from app.email.transports import EmailTransport, SmtpTransport
+
+PAYLOAD = {"candidate": {"email": "candidate@example.com"}, "job": {"title": "Dev"}}
+
+
+class FakeSMTP:
+    """
+    Kết nối SMTP giả lập; ``failures`` là các lỗi lần lượt được ném ra khi gửi
+    """
+
+    failures = []
+    opened = []
+
+    def __init__(self, host, port, timeout=None):
+        self.closed = False
+        self.sent = []
+        FakeSMTP.opened.append(self)
+
+    def sendmail(self, sender, recipients, message):
+        if FakeSMTP.failures:
+            raise FakeSMTP.failures.pop(0)
+        self.sent.append(recipients)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.failures, FakeSMTP.opened = [], []
+    monkeypatch.setattr(transports.smtplib, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+def test_email_transport_is_abstract():
+    with pytest.raises(TypeError):
+        EmailTransport()
+
+
+def test_smtp_reconnects_when_pooled_connection_was_dropped(fake_smtp):
+    transport = SmtpTransport("localhost")
+    assert transport.send("acceptance", PAYLOAD)
+    fake_smtp.failures = [smtplib.SMTPServerDisconnected()]
+
+    assert transport.send("acceptance", PAYLOAD)
+
+    first, second = fake_smtp.opened
+    assert first.closed and not second.closed
+    assert second.sent == [["candidate@example.com"]]
+
+
+def test_smtp_closes_new_connection_when_resend_fails(fake_smtp):
+    transport = SmtpTransport("localhost")
+    assert transport.send("acceptance", PAYLOAD)
+    fake_smtp.failures = [smtplib.SMTPServerDisconnected(), smtplib.SMTPDataError(554, b"rejected")]
+
+    assert not transport.send("acceptance", PAYLOAD)
+
+    assert len(fake_smtp.opened) == 2
+    assert all(connection.closed for connection in fake_smtp.opened)
+    assert transport._pool.empty()